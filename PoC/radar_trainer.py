@@ -1,183 +1,438 @@
-"""sudo apt-get install libxcb-xinerama0"""
-
-
-import numpy as np
-import pyqtgraph as pg
-import sys
-import serial
-import time
-
-from pyqtgraph.Qt import QtGui, QtCore, QtWidgets
-from time import sleep
-from os import system
-
-import serial.tools.list_ports
-
-
-ports = serial.tools.list_ports.comports()
-for port, desc, hwid in sorted(ports):
-    portc = port
-    print("{}\n".format(portc))
-    print("{}\n".format(desc))
-    print("{}\n".format(hwid))
-    #
-    # raw = serial.Serial(port=portc, baudrate=20000000, timeout=1)
-
-raw = serial.Serial(port="/dev/ttyACM0", baudrate=20000000, timeout=1)
-# raw = serial.Serial(port="COM5", baudrate=20000000, timeout=1)
-# raw = serial.Serial(port="/dev/ttyS0", baudrate=9600, timeout=1)
-
-
-# data
-nSample = 1024
-nAscan = 250
-nBinMax = nSample / 2
-
-
-class Plot2D:
-    def __init__(self):
-        # self.app = QtGui.QApplication([])
-        self.app = QtWidgets.QApplication([])
-        self.win = pg.GraphicsLayoutWidget()
-        self.raw_data = self.win.addPlot(row=0, col=0, title="Raw Data Plot")
-        # self.raw_data.setRange(yRange=[-20,20], xRange=[0,nSample])
-        self.raw_data.setRange(xRange=[0, nSample])
-        self.raw_data.showGrid(y=True)
-        self.raw_data_plot = self.raw_data.plot(pen="y")
-        self.raw_data_spectrum = self.win.addPlot(
-            row=0, col=1, title="Raw Data Spectrum Plot"
-        )
-        self.raw_data_spectrum.setRange(xRange=[1, 100])
-        self.raw_data_spectrum.showGrid(y=True)
-
-        self.raw_data_spectrum_plot = self.raw_data_spectrum.plot(pen="y")
-        self.Bscan_plot = self.win.addViewBox(row=1, col=0, colspan=3)
-
-        # self.Bscan_array = np.zeros([nAscan, nBinMax / 2])
-        self.Bscan_array = np.zeros([nAscan, int(nBinMax / 2)])
-
-        self.Bscan_img = pg.ImageItem(self.Bscan_array)
-
-        self.histogram = pg.HistogramLUTItem()
-        self.histogram.gradient.loadPreset("bipolar")
-        self.histogram.setImageItem(self.Bscan_img)
-
-        self.Bscan_img.setLevels([0, 70])
-        self.Bscan_plot.addItem(self.Bscan_img)
-
-        self.raw_data.setMouseEnabled(x=False, y=False)  # Disable panning
-        # self.raw_data.setAspectLocked(lock=True)  # Fix aspect ratio
-        self.raw_data_spectrum.setMouseEnabled(x=False, y=False)  # Disable panning
-        # self.raw_data_spectrum.setAspectLocked(lock=True)  # Fix aspect ratio
-        self.Bscan_plot.setMouseEnabled(x=False, y=False)  # Disable panning
-        # self.Bscan_plot.setAspectLocked(lock=True)  # Fix aspect ratio
-
-        self.winhamm = np.hamming(nSample)
-        self.win.showFullScreen()
-
-    def setup_Ascan(self, N):
-        self.raw_data.setRange(xRange=[N * 0.05, N * 0.95])
-        self.raw_data.showGrid(y=True)
-
-    def trace_raw_data(self, dataset_y):
-        self.raw_data_plot.setData(dataset_y)
-
-    def trace_raw_data_spectrum(self, dataset_y):
-        self.raw_data_spectrum_plot.setData(dataset_y)
-
-    def Ascan2Bscan(self, aScan_data):
-        self.Bscan_array = np.roll(self.Bscan_array, -1, 0)
-        self.Bscan_array[-1:] = aScan_data
-
-    def trace_BscanDariAdraw(self):
-        self.Bscan_img.setImage(self.Bscan_array, autoLevels=False)
-
-    def start(self):
-        # QtGui.QApplication.instance().exec_()
-        QtWidgets.QApplication.instance().exec_()
-
-    def onKey(self, e):
-        print("SSSS")
-        if e.key() == 71:  # "q" quit
-            sys.exit()
-
-
-if __name__ == "__main__":
-    i = 0
-    i_er = 0
-    p = Plot2D()
-    nShift = 0
-    nSampleT = 5
-
-    def update():
-        global p, i, i_er, nShift, nSampleT, count
-
-        dat1 = raw.read(nSample * 2)
-        # print(dat1)
-
-        dat2 = np.frombuffer(dat1, dtype="int16", offset=0)
-        # print(dat2)
-
-        if len(dat2) == nSample:
-            # print("%d  %d" % (i,len(dat2)))
-            s = np.array(dat2[0:nSample])
-            cekF0F = s[nSample - 1]
-            nSampleX = s[nSample - 2]
-            sr = s[nSample - 3]
-            prf = s[nSample - 4]
-            cekIns = s[nSample - 5]
-        else:
-            cekF0F = 0
-
-        if cekF0F == 3855:
-            if nSampleX != nSampleT:
-                p.setup_Ascan(nSampleX)
-                nSampleT = nSampleX
-            s[nSampleX:nSample] = 0
-            s = s - (np.sum(s)) / nSampleX
-            s[nSampleX:nSample] = 0
-            ss = s
-            s = s * p.winhamm
-            # S = 20*np.log10(abs(np.fft.rfft(s))/np.sqrt(nSampleX)+.001)
-            S = 20 * np.log10(abs(np.fft.rfft(s)) / (nSampleX) + 0.001)
-            S = S * S / 15
-            # S = 2*(S-30)
-
-            p.trace_raw_data(ss)
-            p.Ascan2Bscan(S[nShift : int(nShift + nBinMax / 2)])
-            p.trace_BscanDariAdraw()
-            # p.trace_raw_data_spectrum(S[nShift : int(nShift + nBinMax * 2)])
-            p.trace_raw_data_spectrum(S[50 : int(nShift + nBinMax * 2)])
-            s[nSample - 4 : nSample - 1] = 10
-        else:
-            i_er += 1
-            raw.flushInput()
-            raw.flushOutput()
-            raw.close()
-            raw.open()
-        i += 1
-        if i >= 100:
-            print(
-                "%d/%d  prf`=%d  sr=%dk  M=%d  %d"
-                % (i, i_er, prf, sr, nSampleX, cekIns)
-            )
-            i = 0
-            i_er = 0
-
-    try:
-        raw.open()
-    except:
-        pass
-
-    if raw.isOpen():
-        time.sleep(0.2)
-        try:
-            dat1 = raw.read(nSample * 2)
-            raw.flushInput()
-            raw.flushOutput()
-            timer = QtCore.QTimer()
-            timer.timeout.connect(update)
-            timer.start(5)
-            p.start()
-        except None:
-            pass
+"""sudo apt-get install libxcb-xinerama0"""
+
+
+import math
+import numpy as np
+import pyqtgraph as pg
+import sys
+import serial
+import struct
+import threading
+import time
+
+from collections import deque
+from pyqtgraph.Qt import QtGui, QtCore, QtWidgets
+from time import sleep
+from os import system
+from pathlib import Path
+
+import serial.tools.list_ports
+
+try:
+    import pyfftw
+except ImportError:
+    pyfftw = None
+
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+try:
+    import numexpr
+except ImportError:
+    numexpr = None
+
+# Render through OpenGL and let pyqtgraph use its numba kernels (image LUT
+# mapping) when numba is installed.
+pg.setConfigOptions(useOpenGL=True, antialias=False, useNumba=njit is not None)
+
+
+ports = serial.tools.list_ports.comports()
+for port, desc, hwid in sorted(ports):
+    portc = port
+    print("{}\n".format(portc))
+    print("{}\n".format(desc))
+    print("{}\n".format(hwid))
+    #
+    # raw = serial.Serial(port=portc, baudrate=20000000, timeout=1)
+
+raw = serial.Serial(port="/dev/ttyACM0", baudrate=20000000, timeout=1)
+# raw = serial.Serial(port="COM5", baudrate=20000000, timeout=1)
+# raw = serial.Serial(port="/dev/ttyS0", baudrate=9600, timeout=1)
+
+
+# data
+nSample = 1024
+nAscan = 250
+nBinMax = nSample / 2
+# Per-frame slice bounds, hoisted out of update().
+HALF_BINS = int(nBinMax) // 2
+SPECTRUM_BINS = int(nBinMax * 2)
+# Frames are processed on every 5 ms tick, but redrawn at most at 60 Hz.
+DRAW_INTERVAL = 1 / 60
+
+# rfft plan: nSample is fixed, so the plan and its aligned buffers are built
+# once here and reused every frame instead of re-planning inside update().
+FFTW_WISDOM = Path(__file__).with_name(".fftw_wisdom")
+# Wisdom file: the (double, single, long double) wisdom strings, each
+# prefixed by its byte length; plain bytes, so loading it runs no code.
+WISDOM_LENGTH = struct.Struct("<I")
+
+
+def load_fftw_wisdom():
+    try:
+        raw = FFTW_WISDOM.read_bytes()
+    except OSError:
+        return False
+    wisdom = []
+    pos = 0
+    while pos + WISDOM_LENGTH.size <= len(raw):
+        (n,) = WISDOM_LENGTH.unpack_from(raw, pos)
+        pos += WISDOM_LENGTH.size
+        wisdom.append(raw[pos : pos + n])
+        pos += n
+    if pos != len(raw) or len(wisdom) != 3:
+        return False
+    return all(pyfftw.import_wisdom(tuple(wisdom)))
+
+
+def save_fftw_wisdom():
+    FFTW_WISDOM.write_bytes(
+        b"".join(WISDOM_LENGTH.pack(len(w)) + w for w in pyfftw.export_wisdom())
+    )
+
+
+if pyfftw is not None:
+    has_wisdom = load_fftw_wisdom()
+    fft_in = pyfftw.empty_aligned(nSample, dtype="float32")
+    fft_out = pyfftw.empty_aligned(nSample // 2 + 1, dtype="complex64")
+    winhamm = pyfftw.empty_aligned(nSample, dtype="float32")
+    # The input buffer must survive the transform: its zero tail is only
+    # rewritten when the record length changes (see Plot2D.setup_Ascan).
+    fft_plan = pyfftw.FFTW(
+        fft_in, fft_out, flags=("FFTW_MEASURE", "FFTW_PRESERVE_INPUT")
+    )
+    if not has_wisdom:
+        save_fftw_wisdom()
+else:
+    fft_in = np.zeros(nSample, dtype=np.float32)
+    fft_out = np.zeros(nSample // 2 + 1, dtype=np.complex64)
+    winhamm = np.empty(nSample, dtype=np.float32)
+
+    def fft_plan():
+        # Real-input transform written straight into the half-length complex
+        # buffer; pocketfft packs the real signal into an N/2 complex FFT
+        # internally, so no full-length complex spectrum is ever built.
+        return np.fft.rfft(fft_in, out=fft_out)
+
+
+# process_frame writes (s - mean) * winhamm straight into fft_in, so the
+# window lives next to the plan input with the same alignment and dtype.
+winhamm[:] = np.hamming(nSample)
+# FFTW_MEASURE scribbles over the input while planning.
+fft_in[:] = 0
+
+
+# Per-frame DSP around the FFT. With numba each side is a single fused loop
+# over preallocated buffers; without it the log spectrum is one numexpr sweep
+# when available, and otherwise numpy array expressions.
+if njit is not None:
+
+    @njit(cache=True, fastmath=True, boundscheck=False)
+    def process_frame(frame, nSampleX, winhamm, ss, fft_in):
+        # Reads the raw int16 frame directly: the running sum is taken in the
+        # same pass that would otherwise convert it to float, and the second
+        # pass de-means, windows and writes both output buffers. Only the
+        # first nSampleX entries are written; the zero tail is persistent.
+        n = min(nSampleX, frame.shape[0])
+        acc = 0.0
+        for k in range(n):
+            acc += frame[k]
+        mean = acc / n
+        for k in range(n):
+            v = frame[k] - mean
+            ss[k] = v
+            fft_in[k] = v * winhamm[k]
+
+    @njit(cache=True, fastmath=True, boundscheck=False)
+    def log_spectrum(X, nSampleX, S):
+        # 10*log10(|X|^2/n^2) == 20*log10(|X|/n), so work on the squared
+        # magnitude and skip the sqrt inside abs().
+        inv_n2 = 1.0 / (nSampleX * nSampleX)
+        for k in range(X.shape[0]):
+            re = X[k].real
+            im = X[k].imag
+            v = 10.0 * math.log10((re * re + im * im) * inv_n2 + 1e-6)
+            S[k] = v * v * (1.0 / 15.0)
+
+else:
+
+    def process_frame(frame, nSampleX, winhamm, ss, fft_in):
+        ss[:nSampleX] = frame[:nSampleX]
+        ss[:nSampleX] -= np.sum(ss[:nSampleX]) / nSampleX
+        np.multiply(ss[:nSampleX], winhamm[:nSampleX], out=fft_in[:nSampleX])
+
+    if numexpr is not None:
+
+        def log_spectrum(X, nSampleX, S):
+            numexpr.evaluate(
+                "(10 * log10((re * re + im * im) * inv_n2 + 1e-6)) ** 2 / 15",
+                local_dict={
+                    "re": X.real,
+                    "im": X.imag,
+                    "inv_n2": 1.0 / (nSampleX * nSampleX),
+                },
+                out=S,
+                casting="same_kind",
+            )
+
+    else:
+        mag_tmp = np.empty(nSample // 2 + 1, dtype=np.float32)
+
+        def log_spectrum(X, nSampleX, S):
+            # Every step writes into S or mag_tmp: no per-frame temporaries.
+            np.multiply(X.real, X.real, out=S)
+            np.multiply(X.imag, X.imag, out=mag_tmp)
+            S += mag_tmp
+            S *= 1.0 / (nSampleX * nSampleX)
+            S += 1e-6
+            np.log10(S, out=S)
+            S *= 10
+            S *= S
+            S /= 15
+
+
+# Every frame ends with the int16 0xF0F (3855) sync word, little-endian.
+FRAME_MARKER = b"\x0f\x0f"
+# Frame trailer: cekIns, prf, sr, nSampleX, 0xF0F as little-endian int16.
+FRAME_TRAILER = struct.Struct("<5h")
+# Consecutive bad frames tolerated before the port is actually reopened.
+MAX_RESYNC = 10
+
+
+class SerialReader(threading.Thread):
+    """Reads fixed-size frames from the serial port off the Qt thread.
+
+    Completed reads are queued in ``frames`` for the timer callback to pop,
+    so the GUI never blocks on USB latency. Resync and reopen requests from
+    the consumer are also carried out here rather than on the GUI thread.
+    """
+
+    def __init__(self, port, frame_bytes):
+        super().__init__(daemon=True)
+        self.port = port
+        self.frame_bytes = frame_bytes
+        self.frames = deque(maxlen=64)
+        self.resync_requested = threading.Event()
+        self.reopen_requested = threading.Event()
+
+    def run(self):
+        while True:
+            if self.reopen_requested.is_set():
+                self.reopen_requested.clear()
+                self.resync_requested.clear()
+                self.frames.clear()
+                self.port.flushInput()
+                self.port.flushOutput()
+                self.port.close()
+                self.port.open()
+            elif self.resync_requested.is_set():
+                # Drop bytes up to the next sync word so the following read
+                # starts on a frame boundary.
+                self.resync_requested.clear()
+                self.frames.clear()
+                self.port.read_until(FRAME_MARKER, 2 * self.frame_bytes)
+            # Take every complete frame already buffered by the OS in one
+            # read, then split it; at least one frame is waited for.
+            n_frames = max(1, self.port.in_waiting // self.frame_bytes)
+            dat = self.port.read(n_frames * self.frame_bytes)
+            for k in range(0, len(dat), self.frame_bytes):
+                self.frames.append(dat[k : k + self.frame_bytes])
+
+
+class Plot2D:
+    def __init__(self):
+        # self.app = QtGui.QApplication([])
+        self.app = QtWidgets.QApplication([])
+        self.win = pg.GraphicsLayoutWidget()
+        self.raw_data = self.win.addPlot(row=0, col=0, title="Raw Data Plot")
+        # self.raw_data.setRange(yRange=[-20,20], xRange=[0,nSample])
+        self.raw_data.setRange(xRange=[0, nSample])
+        self.raw_data.showGrid(y=True)
+        self.raw_data_plot = self.raw_data.plot(pen="y")
+        self.raw_data_plot.setDownsampling(auto=True, method="peak")
+        self.raw_data_plot.setClipToView(True)
+        self.raw_data_spectrum = self.win.addPlot(
+            row=0, col=1, title="Raw Data Spectrum Plot"
+        )
+        self.raw_data_spectrum.setRange(xRange=[1, 100])
+        self.raw_data_spectrum.showGrid(y=True)
+
+        self.raw_data_spectrum_plot = self.raw_data_spectrum.plot(pen="y")
+        self.raw_data_spectrum_plot.setDownsampling(auto=True, method="peak")
+        self.raw_data_spectrum_plot.setClipToView(True)
+        self.Bscan_plot = self.win.addViewBox(row=1, col=0, colspan=3)
+
+        # self.Bscan_array = np.zeros([nAscan, nBinMax / 2])
+        # Stored as (bins, time) so the C-contiguous buffer can be handed to
+        # a row-major ImageItem as-is, with the same orientation as before.
+        self.Bscan_array = np.zeros([HALF_BINS, nAscan], dtype=np.float32)
+        # Bscan_array is a ring buffer: Bscan_write_idx is the oldest column
+        # and the next one to be overwritten. Bscan_disp holds the columns in
+        # time order for the image item.
+        self.Bscan_write_idx = 0
+        self.Bscan_dirty = False
+        self.Bscan_disp = np.zeros_like(self.Bscan_array)
+
+        self.Bscan_img = pg.ImageItem(
+            self.Bscan_disp, axisOrder="row-major", autoDownsample=True
+        )
+
+        self.histogram = pg.HistogramLUTItem()
+        self.histogram.gradient.loadPreset("bipolar")
+        self.histogram.setImageItem(self.Bscan_img)
+
+        self.Bscan_img.setLevels([0, 70])
+        self.Bscan_plot.addItem(self.Bscan_img)
+
+        self.raw_data.setMouseEnabled(x=False, y=False)  # Disable panning
+        # self.raw_data.setAspectLocked(lock=True)  # Fix aspect ratio
+        self.raw_data_spectrum.setMouseEnabled(x=False, y=False)  # Disable panning
+        # self.raw_data_spectrum.setAspectLocked(lock=True)  # Fix aspect ratio
+        self.Bscan_plot.setMouseEnabled(x=False, y=False)  # Disable panning
+        # self.Bscan_plot.setAspectLocked(lock=True)  # Fix aspect ratio
+
+        self.ss = np.zeros(nSample, dtype=np.float32)
+        # Shared x axis for both traces; setData with y alone would build a
+        # fresh np.arange on every redraw.
+        self.x_axis = np.arange(nSample, dtype=np.float32)
+        self.S = np.zeros(nSample // 2 + 1, dtype=np.float32)
+        self.win.showFullScreen()
+
+    def setup_Ascan(self, N):
+        self.raw_data.setRange(xRange=[N * 0.05, N * 0.95])
+        self.raw_data.showGrid(y=True)
+        # process_frame only writes the first N samples of each frame.
+        self.ss[N:] = 0
+        fft_in[N:] = 0
+
+    def trace_raw_data(self, dataset_y):
+        self.raw_data_plot.setData(self.x_axis[: len(dataset_y)], dataset_y)
+
+    def trace_raw_data_spectrum(self, dataset_y):
+        self.raw_data_spectrum_plot.setData(self.x_axis[: len(dataset_y)], dataset_y)
+
+    def Ascan2Bscan(self, aScan_data):
+        self.Bscan_array[:, self.Bscan_write_idx] = aScan_data
+        self.Bscan_write_idx = (self.Bscan_write_idx + 1) % nAscan
+        self.Bscan_dirty = True
+
+    def trace_BscanDariAdraw(self):
+        if not self.Bscan_dirty:
+            return
+        self.Bscan_dirty = False
+        n = nAscan - self.Bscan_write_idx
+        self.Bscan_disp[:, :n] = self.Bscan_array[:, self.Bscan_write_idx :]
+        self.Bscan_disp[:, n:] = self.Bscan_array[:, : self.Bscan_write_idx]
+        self.Bscan_img.setImage(self.Bscan_disp, autoLevels=False, levels=(0, 70))
+
+    def start(self):
+        # QtGui.QApplication.instance().exec_()
+        QtWidgets.QApplication.instance().exec_()
+
+    def onKey(self, e):
+        print("SSSS")
+        if e.key() == 71:  # "q" quit
+            sys.exit()
+
+
+if __name__ == "__main__":
+    i = 0
+    i_er = 0
+    n_bad = 0
+    last_draw = 0.0
+    redraw_pending = False
+    p = Plot2D()
+    nShift = 0
+    nSampleT = 5
+    # Last decoded trailer, printed by the periodic status line even when
+    # no good frame has arrived yet in the current tick
+    cekIns = prf = sr = nSampleX = 0
+
+    def update():
+        global p, i, i_er, n_bad, nShift, nSampleT, count
+        global last_draw, redraw_pending
+        global cekIns, prf, sr, nSampleX
+
+        # Drain every frame queued since the last tick. Each good frame is
+        # pushed into the B-scan; the plots are redrawn at most once per
+        # DRAW_INTERVAL so paint events never queue up behind the DSP.
+        ss, S = p.ss, p.S
+        n_good = 0
+        resync = False
+        while reader.frames and not resync:
+            dat1 = reader.frames.popleft()
+            # print(dat1)
+
+            # Reject short or unsynced frames on the raw bytes before any
+            # numpy view or trailer field is touched.
+            if len(dat1) == nSample * 2 and dat1[-2:] == FRAME_MARKER:
+                dat2 = np.frombuffer(dat1, dtype="<i2", count=nSample)
+                # print(dat2)
+                cekIns, prf, sr, nSampleX, _ = FRAME_TRAILER.unpack_from(
+                    dat1, len(dat1) - FRAME_TRAILER.size
+                )
+                n_bad = 0
+                if nSampleX != nSampleT:
+                    p.setup_Ascan(nSampleX)
+                    nSampleT = nSampleX
+                process_frame(dat2, nSampleX, winhamm, ss, fft_in)
+                fft_plan()
+                # S = 20*np.log10(abs(fft_out)/np.sqrt(nSampleX)+.001)
+                log_spectrum(fft_out, float(nSampleX), S)
+                # S = 2*(S-30)
+
+                p.Ascan2Bscan(S[nShift : nShift + HALF_BINS])
+                n_good += 1
+            else:
+                i_er += 1
+                n_bad += 1
+                if n_bad >= MAX_RESYNC:
+                    reader.reopen_requested.set()
+                    n_bad = 0
+                else:
+                    reader.resync_requested.set()
+                # Frames still queued were read before the resync and are
+                # dropped by the reader; counting them as further misses
+                # would escalate a single slip into a port reopen.
+                resync = True
+            i += 1
+            if i >= 100:
+                print(
+                    "%d/%d  prf`=%d  sr=%dk  M=%d  %d"
+                    % (i, i_er, prf, sr, nSampleX, cekIns)
+                )
+                i = 0
+                i_er = 0
+
+        redraw_pending = redraw_pending or n_good > 0
+        now = time.perf_counter()
+        if redraw_pending and now - last_draw >= DRAW_INTERVAL:
+            last_draw = now
+            redraw_pending = False
+            p.trace_raw_data(ss)
+            p.trace_BscanDariAdraw()
+            # p.trace_raw_data_spectrum(S[nShift : nShift + SPECTRUM_BINS])
+            p.trace_raw_data_spectrum(S[50 : nShift + SPECTRUM_BINS])
+
+    try:
+        raw.open()
+    except:
+        pass
+
+    if raw.isOpen():
+        time.sleep(0.2)
+        try:
+            dat1 = raw.read(nSample * 2)
+            raw.flushInput()
+            raw.flushOutput()
+            reader = SerialReader(raw, nSample * 2)
+            reader.start()
+            timer = QtCore.QTimer()
+            timer.setTimerType(QtCore.Qt.TimerType.PreciseTimer)
+            timer.timeout.connect(update)
+            timer.start(5)
+            p.start()
+        except None:
+            pass
@@ -14,50 +14,272 @@ Data Format:
 """
 
 import datetime
+import functools
+import multiprocessing
 import os
+import threading
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from pathlib import Path
-from typing import Dict, Tuple, Any, Optional
+from typing import Dict, List, Tuple, Any, Optional
 
 import holoviews as hv
-import matplotlib.pyplot as plt
 import numpy as np
-import pandas as pd
 import panel as pn
 import param
 from holoviews import opts
 from scipy import signal
-from scipy.fft import fft, fftfreq, rfft, rfftfreq
+from scipy.fft import irfft, next_fast_len, rfft, rfftfreq
 from sklearn.cluster import DBSCAN
 
+try:
+    import pyfftw
+except ImportError:  # pyFFTW opsional, fallback ke scipy.fft (pocketfft)
+    pyfftw = None
+
+try:
+    import cupy
+    import cupyx.scipy.fft as cupy_fft
+except ImportError:  # CuPy opsional, hanya dipakai jika RADAR_LPDP_GPU di-set
+    cupy = None
+
 from functions.data_processing import (
-    load_and_process_data,
-    compute_fft,
+    condition_db,
+    get_fft_window,
     find_peak_metrics,
 )
+from functions.analysis_worker import advanced_analysis_worker
+from functions.kernels import (
+    band_power_db,
+    detect_abs_peaks,
+    level_crossing_bounds,
+    magnitude_db,
+    minmax_decimate,
+    power_spectrum,
+    single_pass_stats,
+)
 
 # Enable Panel extensions
 pn.extension('tabulator')
 hv.extension('bokeh')
 
-# Set matplotlib style for better-looking plots
-plt.style.use('seaborn-v0_8-darkgrid')
-plt.rcParams.update({
-    'font.size': 10,
-    'axes.titlesize': 12,
-    'axes.labelsize': 10,
-    'xtick.labelsize': 9,
-    'ytick.labelsize': 9,
-    'legend.fontsize': 9,
-    'figure.titlesize': 14,
-    'lines.linewidth': 1.2,
-    'grid.alpha': 0.3
-})
-
 # === KONFIGURASI SISTEM ===
 SAMPLE_RATE = 20_000_000  # 20 MHz
 BUFFER_SAMPLES = 8192
 CHANNELS = ['CH1', 'CH3']
 LIVE_FILE = 'live/live_acquisition_ui.bin'
+FRAME_QUEUE_DEPTH = 4  # capture terbaru yang disimpan reader thread
+ANALYSIS_PROCESSES = 2  # worker process advanced analysis (0 = inline)
+VOLTS_PER_LSB = np.float32(20.0 / 65536)  # PCI-9846H: ±10V, 16-bit
+FFT_WORKERS = -1  # pocketfft multithread: pakai semua core
+FFT_THREADS = os.cpu_count() or 1  # thread FFTW (pyFFTW)
+FFT_PLANNER_EFFORT = 'FFTW_MEASURE'
+# rFFT di GPU (CuPy) bila RADAR_LPDP_GPU di-set dan device CUDA tersedia
+GPU_FFT = bool(os.environ.get('RADAR_LPDP_GPU')) and cupy is not None and cupy.cuda.is_available()
+SPECTROGRAM_NPERSEG = 256  # panjang frame spectrogram (hop = 50%)
+WELCH_SEGMENTS = 8  # Welch: buffer dibagi ~8 segmen (overlap 50%)
+PLOT_BUCKETS = 1400  # ~lebar plot (pixel) untuk decimation min/max
+FREQ_RANGE_DEBOUNCE_MS = 100  # jeda idle sebelum perubahan freq range diterapkan
+
+# === PLOT STYLE ===
+TIME_DIM = hv.Dimension('time_us', label='Time', unit='μs')
+AMPLITUDE_DIM = hv.Dimension('amplitude', label='Amplitude', unit='V')
+FREQ_DIM = hv.Dimension('freq_mhz', label='Frequency', unit='MHz')
+MAGNITUDE_DIM = hv.Dimension('magnitude_db', label='Magnitude', unit='dB')
+LAG_DIM = hv.Dimension('lag_us', label='Lag Time', unit='μs')
+CORRELATION_DIM = hv.Dimension('correlation', label='Correlation Coefficient')
+PHASE_DIM = hv.Dimension('phase_deg', label='Phase Difference', unit='°')
+POWER_DIM = hv.Dimension('power_db', label='Power Level', unit='dB')
+PLOT_OPTS = dict(
+    responsive=True,
+    height=420,
+    show_grid=True,
+    bgcolor='#fafafa',
+    legend_position='top_right',
+    # Garis dirasterisasi GPU di browser; data tetap dikirim via Pipe/ColumnDataSource
+    backend_opts={'plot.output_backend': 'webgl'},
+)
+
+
+def _empty_aligned(shape: Tuple[int, ...], dtype=np.float32) -> np.ndarray:
+    """Allocate a C-contiguous array, SIMD-aligned when pyFFTW is available."""
+    if pyfftw is not None:
+        return pyfftw.empty_aligned(shape, dtype=dtype)
+    return np.empty(shape, dtype=dtype)
+
+
+@functools.lru_cache(maxsize=16)
+def _rfft_freqs(n_fft: int) -> np.ndarray:
+    """Return the read-only float32 rfft frequency axis (Hz) for an FFT length."""
+    freqs = rfftfreq(n_fft, d=1.0 / SAMPLE_RATE).astype(np.float32)
+    freqs.setflags(write=False)
+    return freqs
+
+
+@functools.lru_cache(maxsize=4)
+def _time_axis(n_samples: int) -> np.ndarray:
+    """Return the read-only sample time axis (s) for a buffer length."""
+    time_axis = np.arange(n_samples) / SAMPLE_RATE
+    time_axis.setflags(write=False)
+    return time_axis
+
+
+# === HTML TEMPLATES ===
+def _compact_html(html: str) -> str:
+    """Collapse the source indentation of a template so less markup is sent per update."""
+    return ' '.join(html.split())
+
+
+_METRICS_HEADER_HTML = """
+<div style="background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); 
+            border-radius: 15px; padding: 25px; margin: 10px; 
+            box-shadow: 0 8px 32px rgba(0,0,0,0.1);">
+    <h2 style="color: white; text-align: center; font-family: 'Arial', sans-serif; 
+               margin-bottom: 20px; text-shadow: 2px 2px 4px rgba(0,0,0,0.3);">
+        📊 Signal Analysis Metrics
+    </h2>
+    <div style="background: rgba(255,255,255,0.95); border-radius: 10px; padding: 20px;">
+        <table style="width: 100%; border-collapse: collapse; font-family: 'Arial', sans-serif;">
+            <thead>
+                <tr style="background: linear-gradient(90deg, #4287f5, #ff6b6b); color: white;">
+                    <th style="padding: 12px; text-align: left; border-radius: 8px 0 0 0;">Metric</th>
+                    <th style="padding: 12px; text-align: center; color: #4287f5; background: #f0f8ff;">🔵 CH1</th>
+                    <th style="padding: 12px; text-align: center; color: #ff6b6b; background: #fff5f5; border-radius: 0 8px 0 0;">🔴 CH3</th>
+                </tr>
+            </thead>
+            <tbody>
+"""
+
+_METRICS_ROW_TMPL = """
+<tr style="background: {bg};">
+    <td style="padding: 10px; font-weight: bold; border-bottom: 1px solid #dee2e6;">{metric}</td>
+    <td style="padding: 10px; text-align: center; border-bottom: 1px solid #dee2e6; color: #4287f5; font-weight: bold;">{ch1}</td>
+    <td style="padding: 10px; text-align: center; border-bottom: 1px solid #dee2e6; color: #ff6b6b; font-weight: bold;">{ch3}</td>
+</tr>
+"""
+
+_METRICS_FOOTER_HTML = """
+            </tbody>
+        </table>
+    </div>
+</div>
+"""
+
+_STATUS_TMPL = """
+<div style="background: linear-gradient(135deg, #11998e 0%, #38ef7d 100%); 
+            border-radius: 15px; padding: 25px; margin: 10px; 
+            box-shadow: 0 8px 32px rgba(0,0,0,0.1);">
+    <h2 style="color: white; text-align: center; font-family: 'Arial', sans-serif; 
+               margin-bottom: 20px; text-shadow: 2px 2px 4px rgba(0,0,0,0.3);">
+        📡 System Status & Information
+    </h2>
+    <div style="background: rgba(255,255,255,0.95); border-radius: 10px; padding: 20px;">
+        <div style="display: grid; grid-template-columns: 1fr 1fr; gap: 20px; font-family: 'Arial', sans-serif;">
+            <div style="background: #f0f8ff; padding: 15px; border-radius: 8px; border-left: 4px solid #4287f5;">
+                <h3 style="color: #4287f5; margin: 0 0 10px 0;">⏰ Timing Information</h3>
+                <p><strong>Last Update:</strong> {last_update:%Y-%m-%d %H:%M:%S}</p>
+                <p><strong>Sample Rate:</strong> {sample_rate:,} Hz</p>
+                <p><strong>Duration:</strong> {duration_ms:.2f} ms</p>
+            </div>
+            <div style="background: #fff5f5; padding: 15px; border-radius: 8px; border-left: 4px solid #ff6b6b;">
+                <h3 style="color: #ff6b6b; margin: 0 0 10px 0;">💾 Data Information</h3>
+                <p><strong>Buffer Size:</strong> {buffer_samples:,} samples</p>
+                <p><strong>CH1 Length:</strong> {ch1_len:,} samples</p>
+                <p><strong>CH3 Length:</strong> {ch3_len:,} samples</p>
+            </div>
+        </div>
+        <div style="background: #f8f9fa; padding: 15px; border-radius: 8px; margin-top: 20px; border-left: 4px solid #17a2b8;">
+            <h3 style="color: #17a2b8; margin: 0 0 10px 0;">🔧 Configuration</h3>
+            <div style="display: grid; grid-template-columns: repeat(3, 1fr); gap: 15px;">
+                <p><strong>Window Function:</strong> {window_function}</p>
+                <p><strong>FFT Size:</strong> {fft_size:,}</p>
+                <p><strong>Auto Refresh:</strong> {auto_refresh}</p>
+            </div>
+        </div>
+    </div>
+</div>
+"""
+
+
+_ADVANCED_SUMMARY_TMPL = _compact_html("""
+<div style="background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); 
+            border-radius: 15px; padding: 25px; margin: 10px; 
+            box-shadow: 0 8px 32px rgba(0,0,0,0.1);">
+    <h2 style="color: white; text-align: center; font-family: 'Arial', sans-serif; 
+               margin-bottom: 20px; text-shadow: 2px 2px 4px rgba(0,0,0,0.3);">
+        🔬 Advanced Analysis Summary
+    </h2>
+    <div style="background: rgba(255,255,255,0.95); border-radius: 10px; padding: 20px;">
+        <div style="display: grid; grid-template-columns: 1fr 1fr; gap: 20px; font-family: 'Arial', sans-serif;">
+            <div style="background: #f0f8ff; padding: 15px; border-radius: 8px; border-left: 4px solid #4287f5;">
+                <h3 style="color: #4287f5; margin: 0 0 15px 0;">🔄 Cross-Channel Analysis</h3>
+                <p><strong>Channel Isolation:</strong> <span style="color: #28a745; font-weight: bold;">{isolation_db:.1f} dB</span></p>
+                <p><strong>Correlation Coefficient:</strong> <span style="color: #17a2b8; font-weight: bold;">{correlation:.3f}</span></p>
+                <p><strong>Phase Difference:</strong> <span style="color: #dc3545; font-weight: bold;">{phase_deg:.1f}°</span></p>
+                <p><strong>Dominant Frequency:</strong> <span style="color: #6f42c1; font-weight: bold;">{dominant_mhz:.3f} MHz</span></p>
+            </div>
+            <div style="background: #fff5f5; padding: 15px; border-radius: 8px; border-left: 4px solid #ff6b6b;">
+                <h3 style="color: #ff6b6b; margin: 0 0 15px 0;">⚡ Signal Detection</h3>
+                <p><strong>CH1 Pulses:</strong> <span style="color: #4287f5; font-weight: bold;">{n_pulses_ch1} detected</span></p>
+                <p><strong>CH3 Pulses:</strong> <span style="color: #ff6b6b; font-weight: bold;">{n_pulses_ch2} detected</span></p>
+                <p><strong>Cross-correlation Max:</strong> <span style="color: #28a745; font-weight: bold;">{corr_max:.3f}</span></p>
+            </div>
+        </div>
+        <div style="background: #f8f9fa; padding: 15px; border-radius: 8px; margin-top: 20px; border-left: 4px solid #17a2b8;">
+            <h3 style="color: #17a2b8; margin: 0 0 15px 0;">📊 Power Analysis</h3>
+            <div style="display: grid; grid-template-columns: repeat(3, 1fr); gap: 15px;">
+                <p><strong>CH1 Power:</strong> <span style="color: #4287f5; font-weight: bold;">{ch1_power_db:.1f} dB</span></p>
+                <p><strong>CH3 Power:</strong> <span style="color: #ff6b6b; font-weight: bold;">{ch2_power_db:.1f} dB</span></p>
+                <p><strong>Isolation:</strong> <span style="color: #28a745; font-weight: bold;">{isolation_db:.1f} dB</span></p>
+                <p><strong>CH1 Band Power:</strong> <span style="color: #4287f5; font-weight: bold;">{ch1_band_power_db:.1f} dB</span></p>
+                <p><strong>CH3 Band Power:</strong> <span style="color: #ff6b6b; font-weight: bold;">{ch2_band_power_db:.1f} dB</span></p>
+                <p><strong>Band:</strong> <span style="color: #17a2b8; font-weight: bold;">{band_low_mhz:.3f} – {band_high_mhz:.3f} MHz</span></p>
+            </div>
+        </div>
+    </div>
+</div>
+""")
+
+_HEADER_HTML = """
+<div style="background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); 
+            border-radius: 12px; padding: 20px; margin-bottom: 20px;
+            box-shadow: 0 4px 20px rgba(0,0,0,0.1);">
+    <h1 style="color: white; text-align: center; font-family: 'Arial Black', sans-serif; 
+               margin: 0; font-size: 18px; text-shadow: 2px 2px 4px rgba(0,0,0,0.3);">
+        📡 RF Analytics Dashboard
+    </h1>
+    <p style="color: rgba(255,255,255,0.9); text-align: center; margin: 5px 0 0 0; 
+              font-size: 12px; font-style: italic;">
+        PCI-9846H Real-time Analysis
+    </p>
+</div>
+"""
+
+_CONTROL_PANEL_HTML = (
+    '<div style="background: #f8f9fa; padding: 15px; border-radius: 8px; margin-bottom: 15px; '
+    'border-left: 4px solid #4287f5;"><h3 style="color: #4287f5; margin: 0 0 10px 0;">'
+    '⚙️ Control Panel</h3></div>'
+)
+
+
+@functools.lru_cache(maxsize=32)
+def _format_advanced_summary(**values: Any) -> str:
+    """Render the advanced analysis summary; callers round values to display precision.
+    
+    The template is a module constant compacted once at import and the
+    result is memoized, so steady-state refreshes do no formatting work.
+    """
+    return _ADVANCED_SUMMARY_TMPL.format(**values)
+
+
+def _decimate_for_plot(x: np.ndarray, y: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Reduce a trace to the min/max sample per plot bucket (no-op for short traces)."""
+    if len(y) <= 2 * PLOT_BUCKETS:
+        return x, y
+    idx = minmax_decimate(y, PLOT_BUCKETS)
+    return x[idx], y[idx]
+
 
 class RFAnalytics(param.Parameterized):
     """
@@ -72,23 +294,75 @@ class RFAnalytics(param.Parameterized):
         objects=['hann', 'hamming', 'blackman', 'bartlett', 'none'],
         doc="Window function untuk FFT"
     )
-    fft_size = param.Integer(default=8192, bounds=(1024, 32768), doc="FFT Size")
+    fft_size = param.Integer(default=8192, bounds=(1024, 32768), doc="FFT Size (dibulatkan ke next_fast_len)")
+    spectrum_estimator = param.Selector(
+        default='periodogram',
+        objects=['periodogram', 'welch'],
+        doc="Estimator spektrum: periodogram satu-shot atau Welch (median, overlap 50%)"
+    )
     freq_range_low = param.Number(default=0, bounds=(0, 10_000_000), doc="Freq Range Low (Hz)")
     freq_range_high = param.Number(default=10_000_000, bounds=(0, 10_000_000), doc="Freq Range High (Hz)")
     
     def __init__(self, **params):
         super().__init__(**params)
-        self.data_ch1 = np.array([])
-        self.data_ch2 = np.array([])
+        # SoA: satu array (channel, sample) contiguous untuk CH1 & CH3
+        self.data = np.empty((len(CHANNELS), 0), dtype=np.float32)
+        self._channel_rows = tuple(self.data)
         self.time_axis = np.array([])
         self.freq_axis = np.array([])
         self.last_update = datetime.datetime.now()
-        
+        # Hasil FFT per (data, window, fft_size);
+        # dikosongkan setiap update_data
+        self._fft_cache: dict = {}
+        # Refresh runs on a worker thread while Panel watchers run on the
+        # server thread: one lock serializes data swaps, _fft_cache and the
+        # shared pyFFTW plan buffers
+        self._compute_lock = threading.RLock()
+        self._window_buf = _empty_aligned((len(CHANNELS), BUFFER_SAMPLES))
+        # pyFFTW plans per (rows, fft_size, dtype), built once and reused
+        self._fft_plans: dict = {}
+        self._raw_buf = np.empty(len(CHANNELS) * BUFFER_SAMPLES, dtype='<u2')
+        self._data_buf = _empty_aligned((len(CHANNELS), BUFFER_SAMPLES))
+        # Persistent HoloViews plots, updated through Pipe streams
+        empty = (np.array([]), np.array([]), '')
+        self._time_pipes = [hv.streams.Pipe(data=empty) for _ in CHANNELS]
+        self._freq_pipes = [hv.streams.Pipe(data=empty) for _ in CHANNELS]
+        self._advanced_pipes = {
+            'correlation': hv.streams.Pipe(data=empty),
+            'phase': hv.streams.Pipe(data=empty),
+            'pulses': hv.streams.Pipe(data=(np.array([]),) * 4),
+            'power': hv.streams.Pipe(data=([], [])),
+            'spectrogram': hv.streams.Pipe(data=(np.array([]), np.array([]), np.zeros((0, 0)))),
+        }
+        self._time_pane = None
+        self._freq_pane = None
+        self._advanced_pane = None
+        self._summary_pane = None
+        self._advanced_pending = None
+        # Hasil plot terakhir per slot: {name: (key, result)}
+        self._plot_cache: dict = {}
+        # Producer/consumer: reader thread queues captures, update_data takes the newest
+        self._frames: deque = deque(maxlen=FRAME_QUEUE_DEPTH)
+        self._reader_stop = threading.Event()
+        self._reader_thread: Optional[threading.Thread] = None
+        self._snap_fft_size()
+        
+    @property
+    def data_ch1(self) -> np.ndarray:
+        """CH1 samples, a row view of ``self.data``."""
+        return self._channel_rows[0]
+    
+    @property
+    def data_ch2(self) -> np.ndarray:
+        """CH3 samples, a row view of ``self.data``."""
+        return self._channel_rows[1]
+    
     def load_binary_data(self, filepath: str) -> Tuple[np.ndarray, np.ndarray, bool]:
         """Load and parse binary data from acquisition file.
         
-        Uses shared data loading function from data_processing module.
-        Converts raw ADC values to voltage.
+        Reads the interleaved uint16 samples straight into a preallocated
+        raw buffer (no per-refresh allocation), removes the DC offset per
+        channel and converts raw ADC values to voltage.
         
         Args:
             filepath: Path to binary data file
@@ -96,16 +370,31 @@ class RFAnalytics(param.Parameterized):
         Returns:
             Tuple of (ch1_voltage, ch2_voltage, success)
         """
-        ch1_data, ch2_data, n_samples, _ = load_and_process_data(filepath, SAMPLE_RATE)
-        
-        if ch1_data is None or n_samples is None or n_samples <= 0:
+        try:
+            with open(filepath, "rb") as f:
+                size = os.fstat(f.fileno()).st_size
+                if size > self._raw_buf.nbytes:
+                    self._raw_buf = np.empty(size // 2 + 1, dtype='<u2')
+                n_bytes = f.readinto(self._raw_buf)
+        except OSError as e:
+            print(f"Error reading file {filepath}: {e}")
             return np.array([]), np.array([]), False
         
-        # Convert to voltage (PCI-9846H: ±10V range, 16-bit resolution)
-        # Note: data_processing already removes DC offset, so we add back the offset
-        # before voltage conversion for accurate representation
-        ch1_voltage = ch1_data.astype(np.float64) * (20.0 / 65536)
-        ch2_voltage = ch2_data.astype(np.float64) * (20.0 / 65536)
+        # Deinterleave as strided views: CH1 (even), CH3 (odd)
+        n_samples = n_bytes // 4
+        if n_samples <= 0:
+            return np.array([]), np.array([]), False
+        raw = self._raw_buf[:2 * n_samples]
+        
+        # Remove DC offset and convert to voltage (PCI-9846H: ±10V range,
+        # 16-bit resolution) straight into the buffers reused across refreshes
+        if self._data_buf.shape[1] != n_samples:
+            self._data_buf = _empty_aligned((len(CHANNELS), n_samples))
+        for i, out in enumerate(self._data_buf):
+            channel = raw[i::2]
+            np.subtract(channel, np.mean(channel), out=out, casting='same_kind')
+            np.multiply(out, VOLTS_PER_LSB, out=out)
+        ch1_voltage, ch2_voltage = self._data_buf
         
         return ch1_voltage, ch2_voltage, True
     
@@ -121,15 +410,18 @@ class RFAnalytics(param.Parameterized):
         if len(data) == 0:
             return {}
         
-        rms = np.sqrt(np.mean(data**2))
-        peak = np.max(np.abs(data))
+        # One pass over the buffer instead of five reductions
+        n = len(data)
+        total, sum_sq, lo, hi, peak = single_pass_stats(data)
+        mean = total / n
+        rms = np.sqrt(sum_sq / n)
         
         return {
             'rms': rms,
             'peak': peak,
-            'mean': np.mean(data),
-            'std': np.std(data),
-            'p2p': np.ptp(data),
+            'mean': mean,
+            'std': np.sqrt(max(sum_sq / n - mean * mean, 0.0)),
+            'p2p': hi - lo,
             'crest_factor': peak / rms if rms > 0 else 0
         }
     
@@ -150,29 +442,203 @@ class RFAnalytics(param.Parameterized):
         if len(data) == 0:
             return {}, np.array([]), np.array([])
         
-        # Use shared FFT computation (returns kHz, we need Hz)
-        freqs_khz, magnitude_db = compute_fft(
-            data.astype(np.float32),
-            SAMPLE_RATE,
-            window=window_func if window_func != 'none' else ''
+        # The cached entry keeps a reference to ``data`` so its id stays unique
+        cache_key = (id(data), window_func, self.fft_size, self.spectrum_estimator)
+        with self._compute_lock:
+            cached = self._fft_cache.get(cache_key)
+            if cached is None or cached[0] is not data:
+                result = self.compute_frequency_domain_batch(data[np.newaxis, :], window_func)[0]
+                cached = self._fft_cache[cache_key] = (data, result)
+        return cached[1]
+    
+    def compute_frequency_domain_batch(
+        self,
+        stacked: np.ndarray,
+        window_func: str = 'hann'
+    ) -> List[Tuple[Dict[str, float], np.ndarray, np.ndarray]]:
+        """Compute FFT and frequency domain metrics for stacked channels.
+        
+        All rows go through one 2-D rfft (pyFFTW plan or pocketfft) so
+        the transform is vectorized across channels.
+        
+        Args:
+            stacked: Signal array of shape (channels, samples)
+            window_func: Window function name
+            
+        Returns:
+            List of (metrics_dict, frequencies, magnitude_db), one per row
+        """
+        n_rows, n = stacked.shape
+        if n == 0:
+            return [({}, np.array([]), np.array([])) for _ in range(n_rows)]
+        
+        if self.spectrum_estimator == 'welch':
+            freqs, magnitudes, raw_db = self._welch_spectra(stacked, window_func)
+        else:
+            # Single FFT shared by the dB spectrum and the spectral centroid
+            n_fft = self.fft_size  # already 5-smooth, see _snap_fft_size
+            # Cut to the FFT length before windowing so the window spans the
+            # samples actually transformed, not just its rising start
+            n_in = min(n, n_fft)
+            window = get_fft_window(window_func, n_in) if window_func != 'none' else None
+            spectra = self._rfft_rows(stacked[:, :n_in], n_fft, window)
+            # Amplitude spectrum: divide by the window's coherent gain so a
+            # tone reads the same level whatever the FFT size
+            spectra *= 1.0 / (float(window.sum(dtype=np.float64)) if window is not None else n_in)
+            
+            # |X| and its raw dB in one fused pass over the spectra
+            magnitudes = np.empty(spectra.shape, dtype=np.float32)
+            raw_db = np.empty(spectra.shape, dtype=np.float32)
+            magnitude_db(spectra.ravel(), magnitudes.ravel(), raw_db.ravel())
+            freqs = _rfft_freqs(n_fft)
+        
+        return [
+            self._spectrum_metrics(freqs, magnitude, condition_db(row_db))
+            for magnitude, row_db in zip(magnitudes, raw_db)
+        ]
+    
+    def _welch_spectra(
+        self,
+        stacked: np.ndarray,
+        window_func: str
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Median-averaged Welch power spectrum of each row (50% overlapped segments).
+        
+        Segments are ``fft_size`` long but at most 1/WELCH_SEGMENTS of the
+        buffer, so a single capture always yields several averages. The
+        median is robust to narrowband interference in single segments.
+        
+        Args:
+            stacked: Signal array of shape (channels, samples)
+            window_func: Window function name
+            
+        Returns:
+            Tuple of (frequencies, sqrt(power), power in dB re 1 V^2), the
+            latter two of shape (channels, nperseg // 2 + 1)
+        """
+        nperseg = min(self.fft_size, max(stacked.shape[1] // WELCH_SEGMENTS, 1))
+        freqs, power = signal.welch(
+            stacked,
+            fs=SAMPLE_RATE,
+            window=window_func if window_func != 'none' else 'boxcar',
+            nperseg=nperseg,
+            noverlap=nperseg // 2,
+            scaling='spectrum',
+            average='median',
+            axis=-1
         )
-        freqs = freqs_khz * 1000  # Convert kHz to Hz
+        power = power.astype(np.float32, copy=False)
+        return freqs, np.sqrt(power), 10.0 * np.log10(power + 1e-24)
+    
+    def _rfft_rows(
+        self,
+        rows: np.ndarray,
+        n_fft: int,
+        window: Optional[np.ndarray] = None
+    ) -> np.ndarray:
+        """Real FFT of each row, optionally windowed, zero-padded/truncated to ``n_fft``.
+        
+        With ``RADAR_LPDP_GPU`` set and a CUDA device present the transform
+        runs on the GPU through CuPy. Otherwise, with pyFFTW, the plan for
+        (rows, n_fft, dtype) is planned once and its aligned input buffer
+        is filled in place on every call, under ``_compute_lock`` since
+        plans are shared between threads. The caller gets its own copy of
+        the spectra.
         
-        # Compute FFT for spectral centroid calculation
-        fft_data = rfft(data, n=self.fft_size)
+        Args:
+            rows: Signal array of shape (rows, samples)
+            n_fft: FFT length
+            window: Optional window of length ``samples``
+            
+        Returns:
+            Complex spectra of shape (rows, n_fft // 2 + 1)
+        """
+        n_rows, n = rows.shape
+        if GPU_FFT:
+            # Upload once, window and transform on the device, copy back
+            rows_gpu = cupy.asarray(rows)
+            if window is not None:
+                rows_gpu *= cupy.asarray(window)
+            return cupy.asnumpy(cupy_fft.rfft(rows_gpu, n=n_fft, axis=1))
+        
+        if pyfftw is None:
+            # Apply the window into a reusable float32 buffer
+            if window is None:
+                return rfft(rows, n=n_fft, axis=1, workers=FFT_WORKERS)
+            with self._compute_lock:
+                if self._window_buf.shape[1] != n or len(self._window_buf) < n_rows:
+                    self._window_buf = _empty_aligned((max(n_rows, len(CHANNELS)), n))
+                windowed = self._window_buf[:n_rows]
+                np.multiply(rows, window, out=windowed, casting='same_kind')
+                return rfft(windowed, n=n_fft, axis=1, workers=FFT_WORKERS)
+        
+        # Plan lookup, planning and execution all run under the lock: the
+        # refresh worker and the server thread share the plans and their buffers
+        plan_key = (n_rows, n_fft, rows.dtype.str)
+        n_in = min(n, n_fft)
+        with self._compute_lock:
+            plan = self._fft_plans.get(plan_key)
+            if plan is None:
+                buf = pyfftw.empty_aligned((n_rows, n_fft), dtype=rows.dtype)
+                plan = pyfftw.builders.rfft(
+                    buf,
+                    n=n_fft,
+                    axis=-1,
+                    threads=FFT_THREADS,
+                    planner_effort=FFT_PLANNER_EFFORT
+                )
+                self._fft_plans[plan_key] = plan
+            
+            # Copy (windowed) samples straight into the aligned plan input
+            buf = plan.input_array
+            if window is not None:
+                np.multiply(rows[:, :n_in], window[:n_in], out=buf[:, :n_in], casting='same_kind')
+            else:
+                buf[:, :n_in] = rows[:, :n_in]
+            buf[:, n_in:] = 0
+            return plan().copy()
+    
+    def compute_channel_spectra(self) -> List[Tuple[Dict[str, float], np.ndarray, np.ndarray]]:
+        """Batched frequency domain results for CH1 and CH3, cached per refresh."""
+        cache_key = ('channels', self.window_function, self.fft_size, self.spectrum_estimator)
+        with self._compute_lock:
+            # The entry keeps the samples it was computed from, so a result
+            # for data swapped out meanwhile is never served
+            data = self.data
+            cached = self._fft_cache.get(cache_key)
+            if cached is None or cached[0] is not data:
+                cached = (data, self.compute_frequency_domain_batch(data, self.window_function))
+                self._fft_cache[cache_key] = cached
+        return cached[1]
+    
+    def _spectrum_metrics(
+        self,
+        freqs: np.ndarray,
+        magnitude: np.ndarray,
+        magnitude_db: np.ndarray
+    ) -> Tuple[Dict[str, float], np.ndarray, np.ndarray]:
+        """Derive metrics from one spectrum in linear and (conditioned) dB form.
         
+        Args:
+            freqs: Frequency array in Hz
+            magnitude: Linear magnitude spectrum
+            magnitude_db: Smoothed and floored magnitude spectrum in dB
+            
+        Returns:
+            Tuple of (metrics_dict, frequencies, magnitude_db)
+        """
         # Find peaks
         peaks, _ = signal.find_peaks(magnitude_db, height=-60, distance=10)
         
         # Get peak frequency and magnitude
-        peak_freq, peak_mag = find_peak_metrics(freqs_khz, magnitude_db)
+        peak_freq, peak_mag = find_peak_metrics(freqs, magnitude_db)
         
         # Frequency domain metrics
         metrics = {
-            'peak_freq': peak_freq * 1000,  # Convert kHz to Hz
+            'peak_freq': peak_freq,
             'peak_magnitude': peak_mag,
             'bandwidth_3db': self._compute_3db_bandwidth(freqs, magnitude_db),
-            'spectral_centroid': np.sum(freqs * np.abs(fft_data)) / np.sum(np.abs(fft_data)),
+            'spectral_centroid': np.sum(freqs * magnitude) / np.sum(magnitude),
             'num_peaks': len(peaks),
             'snr_estimate': self._estimate_snr(magnitude_db)
         }
@@ -196,11 +662,14 @@ class RFAnalytics(param.Parameterized):
         if len(magnitude_db) == 0:
             return 0.0
             
-        max_mag = np.max(magnitude_db)
-        indices_3db = np.where(magnitude_db >= max_mag - 3)[0]
+        # Contiguous -3 dB region around the main peak, O(bandwidth)
+        peak_idx = int(np.argmax(magnitude_db))
+        left, right = level_crossing_bounds(
+            magnitude_db, peak_idx, magnitude_db[peak_idx] - 3
+        )
         
-        if len(indices_3db) > 1:
-            return float(freqs[indices_3db[-1]] - freqs[indices_3db[0]])
+        if right > left:
+            return float(freqs[right] - freqs[left])
         return 0.0
     
     def _estimate_snr(self, magnitude_db: np.ndarray) -> float:
@@ -219,7 +688,126 @@ class RFAnalytics(param.Parameterized):
         noise_floor = np.median(magnitude_db)
         return float(signal_power - noise_floor)
     
-    def create_time_domain_plot(self) -> pn.pane.Markdown | pn.pane.Matplotlib:
+    def _stream_plot(
+        self,
+        pipe: hv.streams.Pipe,
+        color: str,
+        title: str,
+        kdim: hv.Dimension,
+        vdim: hv.Dimension
+    ) -> hv.DynamicMap:
+        """Create a persistent curve + filled area plot fed by a Pipe stream.
+        
+        The pipe carries ``(x, y, label)``; sending new data only updates the
+        Bokeh data source instead of rebuilding the figure.
+        
+        Args:
+            pipe: Stream that receives the plot data
+            color: Line and fill color
+            title: Plot title
+            kdim: X axis dimension
+            vdim: Y axis dimension
+            
+        Returns:
+            DynamicMap rendering the latest pipe data
+        """
+        def render(data):
+            x, y, label = data
+            return self._area_curve(x, y, kdim, vdim, color, label, title)
+        
+        return hv.DynamicMap(render, streams=[pipe])
+    
+    def _area_curve(
+        self,
+        x: np.ndarray,
+        y: np.ndarray,
+        kdim: hv.Dimension,
+        vdim: hv.Dimension,
+        color: str,
+        label: str,
+        title: str
+    ) -> hv.Overlay:
+        """Curve with a translucent filled area down to zero (fill_between style)."""
+        return hv.Overlay([
+            hv.Area((x, y), kdim, vdim).opts(color=color, alpha=0.2, line_alpha=0),
+            hv.Curve((x, y), kdim, vdim, label=label).opts(
+                color=color, alpha=0.8, line_width=1.5, tools=['hover']
+            ),
+        ]).opts(title=title, **PLOT_OPTS)
+    
+    def _memo_plot(self, name: str, key: tuple, builder):
+        """Return the cached result of ``builder`` while ``key`` is unchanged.
+        
+        Args:
+            name: Plot slot in the cache
+            key: Everything the plot depends on
+            builder: Zero-argument callable that (re)builds the plot
+            
+        Returns:
+            Result of ``builder``, possibly from the cache
+        """
+        cached = self._plot_cache.get(name)
+        if cached is not None and cached[0] == key:
+            return cached[1]
+        result = builder()
+        self._plot_cache[name] = (key, result)
+        return result
+    
+    def _send_time_domain(self):
+        """Push the current time domain buffers into the plot streams."""
+        def send():
+            time_us = self.time_axis * 1e6  # Convert to microseconds
+            self._time_pipes[0].send((*_decimate_for_plot(time_us, self.data_ch1), 'CH1 Signal'))
+            self._time_pipes[1].send((*_decimate_for_plot(time_us, self.data_ch2), 'CH3 Signal'))
+        
+        self._memo_plot('time', (self.last_update,), send)
+    
+    def _send_frequency_domain(self):
+        """Push the current spectra (within the frequency range) into the plot streams."""
+        def send():
+            spectra = self.compute_channel_spectra()
+            for pipe, name, (_, freqs, mag) in zip(self._freq_pipes, ('CH1', 'CH3'), spectra):
+                # Apply frequency range filter as a slice of the ascending rfft axis
+                i0 = np.searchsorted(freqs, self.freq_range_low, side='left')
+                i1 = np.searchsorted(freqs, self.freq_range_high, side='right')
+                pipe.send((freqs[i0:i1] / 1e6, mag[i0:i1], f'{name} ({self.window_function} window)'))
+        
+        key = (self.last_update, self.window_function, self.fft_size, self.spectrum_estimator,
+               self.freq_range_low, self.freq_range_high)
+        self._memo_plot('frequency', key, send)
+    
+    @param.depends('fft_size', watch=True)
+    def _snap_fft_size(self):
+        """Snap fft_size to the next 5-smooth length so pocketfft stays on its fast radix paths.
+        
+        The rfft frequency axis for the snapped size is precomputed here too.
+        """
+        fast_size = int(next_fast_len(self.fft_size, real=True))
+        if fast_size != self.fft_size:
+            self.fft_size = fast_size
+            return  # Re-entered with the snapped size
+        # Build the frequency axis now, not on the first render with this size
+        _rfft_freqs(fast_size)
+    
+    @param.depends('window_function', 'fft_size', 'spectrum_estimator',
+                   'freq_range_low', 'freq_range_high', watch=True)
+    def _on_spectrum_params(self):
+        """Re-send the spectra when a frequency-domain control really changes."""
+        if len(self.data_ch1) > 0:
+            self._send_frequency_domain()
+            if self._advanced_pane is not None:
+                self._send_advanced_analysis()
+    
+    def refresh_streams(self):
+        """Push the current data into every persistent plot."""
+        if len(self.data_ch1) == 0:
+            return
+        self._send_time_domain()
+        self._send_frequency_domain()
+        if self._advanced_pane is not None:
+            self._send_advanced_analysis()
+    
+    def create_time_domain_plot(self) -> pn.pane.Markdown | pn.pane.HoloViews:
         """Create time domain visualization.
         
         Returns:
@@ -230,37 +818,22 @@ class RFAnalytics(param.Parameterized):
                 "## ⚠️ No data available",
                 styles={'text-align': 'center', 'color': '#ff6b6b'}
             )
-            
-        fig, (ax1, ax2) = plt.subplots(2, 1, figsize=(14, 10))
-        fig.patch.set_facecolor('#f8f9fa')
-        
-        time_us = self.time_axis * 1e6  # Convert to microseconds
-        
-        # CH1 plot with enhanced styling
-        ax1.plot(time_us, self.data_ch1, color='#4287f5', linewidth=1.5, 
-                label='CH1 Signal', alpha=0.8)
-        ax1.fill_between(time_us, self.data_ch1, alpha=0.2, color='#4287f5')
-        ax1.set_ylabel('Amplitude (V)', fontweight='bold')
-        ax1.set_title('Channel 1 - Time Domain Analysis', fontsize=14, fontweight='bold', pad=20)
-        ax1.grid(True, alpha=0.4, linestyle='--')
-        ax1.legend(loc='upper right', framealpha=0.9)
-        ax1.set_facecolor('#fafafa')
-        
-        # CH2 plot with enhanced styling
-        ax2.plot(time_us, self.data_ch2, color='#ff6b6b', linewidth=1.5, 
-                label='CH3 Signal', alpha=0.8)
-        ax2.fill_between(time_us, self.data_ch2, alpha=0.2, color='#ff6b6b')
-        ax2.set_xlabel('Time (μs)', fontweight='bold')
-        ax2.set_ylabel('Amplitude (V)', fontweight='bold')
-        ax2.set_title('Channel 3 - Time Domain Analysis', fontsize=14, fontweight='bold', pad=20)
-        ax2.grid(True, alpha=0.4, linestyle='--')
-        ax2.legend(loc='upper right', framealpha=0.9)
-        ax2.set_facecolor('#fafafa')
-        
-        plt.tight_layout(pad=3.0)
-        return pn.pane.Matplotlib(fig, sizing_mode='stretch_both')
-    
-    def create_frequency_domain_plot(self) -> pn.pane.Markdown | pn.pane.Matplotlib:
+        
+        if self._time_pane is None:
+            layout = (
+                self._stream_plot(self._time_pipes[0], '#4287f5',
+                                  'Channel 1 - Time Domain Analysis', TIME_DIM, AMPLITUDE_DIM)
+                + self._stream_plot(self._time_pipes[1], '#ff6b6b',
+                                    'Channel 3 - Time Domain Analysis', TIME_DIM, AMPLITUDE_DIM)
+            )
+            self._time_pane = pn.pane.HoloViews(
+                layout.cols(1).opts(shared_axes=False), sizing_mode='stretch_both'
+            )
+        
+        self._send_time_domain()
+        return self._time_pane
+    
+    def create_frequency_domain_plot(self) -> pn.pane.Markdown | pn.pane.HoloViews:
         """Create frequency domain visualization.
         
         Returns:
@@ -271,43 +844,20 @@ class RFAnalytics(param.Parameterized):
                 "## ⚠️ No data available",
                 styles={'text-align': 'center', 'color': '#ff6b6b'}
             )
-            
-        fig, (ax1, ax2) = plt.subplots(2, 1, figsize=(14, 10))
-        fig.patch.set_facecolor('#f8f9fa')
-        
-        # Compute FFT for both channels
-        _, freqs_ch1, mag_ch1 = self.compute_frequency_domain(self.data_ch1, self.window_function)
-        _, freqs_ch2, mag_ch2 = self.compute_frequency_domain(self.data_ch2, self.window_function)
-        
-        # Apply frequency range filter
-        freq_mask_ch1 = (freqs_ch1 >= self.freq_range_low) & (freqs_ch1 <= self.freq_range_high)
-        freq_mask_ch2 = (freqs_ch2 >= self.freq_range_low) & (freqs_ch2 <= self.freq_range_high)
-        
-        # CH1 FFT with gradient colors
-        ax1.plot(freqs_ch1[freq_mask_ch1]/1e6, mag_ch1[freq_mask_ch1], 
-                color='#4287f5', linewidth=2, alpha=0.9, label=f'CH1 ({self.window_function} window)')
-        ax1.fill_between(freqs_ch1[freq_mask_ch1]/1e6, mag_ch1[freq_mask_ch1], 
-                        alpha=0.3, color='#4287f5')
-        ax1.set_ylabel('Magnitude (dB)', fontweight='bold')
-        ax1.set_title('Channel 1 - Frequency Domain Analysis', fontsize=14, fontweight='bold', pad=20)
-        ax1.grid(True, alpha=0.4, linestyle='--')
-        ax1.legend(loc='upper right', framealpha=0.9)
-        ax1.set_facecolor('#fafafa')
-        
-        # CH2 FFT with gradient colors
-        ax2.plot(freqs_ch2[freq_mask_ch2]/1e6, mag_ch2[freq_mask_ch2], 
-                color='#ff6b6b', linewidth=2, alpha=0.9, label=f'CH3 ({self.window_function} window)')
-        ax2.fill_between(freqs_ch2[freq_mask_ch2]/1e6, mag_ch2[freq_mask_ch2], 
-                        alpha=0.3, color='#ff6b6b')
-        ax2.set_xlabel('Frequency (MHz)', fontweight='bold')
-        ax2.set_ylabel('Magnitude (dB)', fontweight='bold')
-        ax2.set_title('Channel 3 - Frequency Domain Analysis', fontsize=14, fontweight='bold', pad=20)
-        ax2.grid(True, alpha=0.4, linestyle='--')
-        ax2.legend(loc='upper right', framealpha=0.9)
-        ax2.set_facecolor('#fafafa')
-        
-        plt.tight_layout(pad=3.0)
-        return pn.pane.Matplotlib(fig, sizing_mode='stretch_both')
+        
+        if self._freq_pane is None:
+            layout = (
+                self._stream_plot(self._freq_pipes[0], '#4287f5',
+                                  'Channel 1 - Frequency Domain Analysis', FREQ_DIM, MAGNITUDE_DIM)
+                + self._stream_plot(self._freq_pipes[1], '#ff6b6b',
+                                    'Channel 3 - Frequency Domain Analysis', FREQ_DIM, MAGNITUDE_DIM)
+            )
+            self._freq_pane = pn.pane.HoloViews(
+                layout.cols(1).opts(shared_axes=False), sizing_mode='stretch_both'
+            )
+        
+        self._send_frequency_domain()
+        return self._freq_pane
     
     def create_metrics_table(self):
         """Create metrics summary table"""
@@ -319,10 +869,9 @@ class RFAnalytics(param.Parameterized):
         ch2_time_metrics = self.compute_time_domain_metrics(self.data_ch2)
         
         # Frequency domain metrics
-        ch1_freq_metrics, _, _ = self.compute_frequency_domain(self.data_ch1, self.window_function)
-        ch2_freq_metrics, _, _ = self.compute_frequency_domain(self.data_ch2, self.window_function)
+        (ch1_freq_metrics, _, _), (ch2_freq_metrics, _, _) = self.compute_channel_spectra()
         
-        # Create DataFrame
+        # Metric rows (pre-formatted strings)
         metrics_data = {
             'Metric': [
                 'RMS (V)', 'Peak (V)', 'Mean (V)', 'Std Dev (V)', 'Peak-to-Peak (V)', 'Crest Factor',
@@ -359,96 +908,112 @@ class RFAnalytics(param.Parameterized):
             ]
         }
         
-        df = pd.DataFrame(metrics_data)
-        
         # Create styled metrics display
-        metrics_html = """
-        <div style="background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); 
-                    border-radius: 15px; padding: 25px; margin: 10px; 
-                    box-shadow: 0 8px 32px rgba(0,0,0,0.1);">
-            <h2 style="color: white; text-align: center; font-family: 'Arial', sans-serif; 
-                       margin-bottom: 20px; text-shadow: 2px 2px 4px rgba(0,0,0,0.3);">
-                📊 Signal Analysis Metrics
-            </h2>
-            <div style="background: rgba(255,255,255,0.95); border-radius: 10px; padding: 20px;">
-                <table style="width: 100%; border-collapse: collapse; font-family: 'Arial', sans-serif;">
-                    <thead>
-                        <tr style="background: linear-gradient(90deg, #4287f5, #ff6b6b); color: white;">
-                            <th style="padding: 12px; text-align: left; border-radius: 8px 0 0 0;">Metric</th>
-                            <th style="padding: 12px; text-align: center; color: #4287f5; background: #f0f8ff;">🔵 CH1</th>
-                            <th style="padding: 12px; text-align: center; color: #ff6b6b; background: #fff5f5; border-radius: 0 8px 0 0;">🔴 CH3</th>
-                        </tr>
-                    </thead>
-                    <tbody>
-        """
-        
-        for i, (_, row) in enumerate(df.iterrows()):
-            bg_color = "#f8f9fa" if i % 2 == 0 else "#ffffff"
-            metrics_html += f"""
-                        <tr style="background: {bg_color};">
-                            <td style="padding: 10px; font-weight: bold; border-bottom: 1px solid #dee2e6;">{row['Metric']}</td>
-                            <td style="padding: 10px; text-align: center; border-bottom: 1px solid #dee2e6; color: #4287f5; font-weight: bold;">{row['CH1']}</td>
-                            <td style="padding: 10px; text-align: center; border-bottom: 1px solid #dee2e6; color: #ff6b6b; font-weight: bold;">{row['CH3']}</td>
-                        </tr>
-            """
-        
-        metrics_html += """
-                    </tbody>
-                </table>
-            </div>
-        </div>
-        """
+        rows = "".join(
+            _METRICS_ROW_TMPL.format(
+                bg="#f8f9fa" if i % 2 == 0 else "#ffffff",
+                metric=metric,
+                ch1=ch1,
+                ch3=ch3,
+            )
+            for i, (metric, ch1, ch3) in enumerate(
+                zip(metrics_data['Metric'], metrics_data['CH1'], metrics_data['CH3'])
+            )
+        )
+        metrics_html = _METRICS_HEADER_HTML + rows + _METRICS_FOOTER_HTML
         
         return pn.pane.HTML(metrics_html, sizing_mode='stretch_width')
     
     def update_data(self):
-        """Update data from live file"""
+        """Update data from live file.
+        
+        While the reader thread runs, takes the newest queued capture
+        without touching the file; otherwise reads the file directly.
+        """
+        if self.reader_running:
+            try:
+                frame = self._frames.pop()
+            except IndexError:
+                return False  # No new capture since the last update
+            self._frames.clear()  # Older captures are stale
+            self._set_data(frame)
+            return True
+        
         ch1, ch2, success = self.load_binary_data(LIVE_FILE)
         
         if success and len(ch1) > 0:
-            self.data_ch1 = ch1
-            self.data_ch2 = ch2  
-            self.time_axis = np.arange(len(ch1)) / SAMPLE_RATE
-            self.last_update = datetime.datetime.now()
+            # Hand the filled buffer over and load the next capture into a
+            # fresh one, so the live self.data is never rewritten in place
+            self._set_data(self._data_buf)
+            self._data_buf = _empty_aligned(self._data_buf.shape)
             return True
         return False
     
+    def _set_data(self, samples: np.ndarray):
+        """Make a (channels, samples) capture the current data."""
+        with self._compute_lock:
+            self._fft_cache.clear()
+            self.data = samples
+            self._channel_rows = tuple(samples)
+            self.time_axis = _time_axis(samples.shape[1])
+            self.last_update = datetime.datetime.now()
+    
+    @property
+    def reader_running(self) -> bool:
+        """Whether the background reader thread is active."""
+        return self._reader_thread is not None and self._reader_thread.is_alive()
+    
+    def start_reader(self):
+        """Start the background thread that polls LIVE_FILE for new captures."""
+        if self.reader_running:
+            return
+        self._reader_stop.clear()
+        self._reader_thread = threading.Thread(target=self._reader_loop, daemon=True)
+        self._reader_thread.start()
+    
+    def stop_reader(self):
+        """Signal the reader thread to stop; update_data reads the file again."""
+        self._reader_stop.set()
+        if self._reader_thread is not None:
+            self._reader_thread.join(timeout=1.0)
+        self._reader_thread = None
+    
+    def _reader_loop(self):
+        """Producer: queue every new capture of LIVE_FILE as its own (2, N) buffer.
+        
+        The thread owns the raw and sample buffers while it runs; each
+        queued capture gets a fresh buffer so the consumer never sees one
+        being overwritten.
+        """
+        last_modified_time = 0.0
+        while not self._reader_stop.is_set():
+            try:
+                modified_time = os.path.getmtime(LIVE_FILE)
+            except OSError:
+                modified_time = last_modified_time  # File not there (yet)
+            
+            if modified_time != last_modified_time:
+                last_modified_time = modified_time
+                ch1, _, success = self.load_binary_data(LIVE_FILE)
+                if success and len(ch1) > 0:
+                    self._frames.append(self._data_buf)
+                    self._data_buf = _empty_aligned(self._data_buf.shape)
+            
+            self._reader_stop.wait(self.refresh_rate)
+    
     def create_status_panel(self):
         """Create status information panel"""
-        status_html = f"""
-        <div style="background: linear-gradient(135deg, #11998e 0%, #38ef7d 100%); 
-                    border-radius: 15px; padding: 25px; margin: 10px; 
-                    box-shadow: 0 8px 32px rgba(0,0,0,0.1);">
-            <h2 style="color: white; text-align: center; font-family: 'Arial', sans-serif; 
-                       margin-bottom: 20px; text-shadow: 2px 2px 4px rgba(0,0,0,0.3);">
-                📡 System Status & Information
-            </h2>
-            <div style="background: rgba(255,255,255,0.95); border-radius: 10px; padding: 20px;">
-                <div style="display: grid; grid-template-columns: 1fr 1fr; gap: 20px; font-family: 'Arial', sans-serif;">
-                    <div style="background: #f0f8ff; padding: 15px; border-radius: 8px; border-left: 4px solid #4287f5;">
-                        <h3 style="color: #4287f5; margin: 0 0 10px 0;">⏰ Timing Information</h3>
-                        <p><strong>Last Update:</strong> {self.last_update.strftime('%Y-%m-%d %H:%M:%S')}</p>
-                        <p><strong>Sample Rate:</strong> {SAMPLE_RATE:,} Hz</p>
-                        <p><strong>Duration:</strong> {len(self.data_ch1)/SAMPLE_RATE*1000:.2f} ms</p>
-                    </div>
-                    <div style="background: #fff5f5; padding: 15px; border-radius: 8px; border-left: 4px solid #ff6b6b;">
-                        <h3 style="color: #ff6b6b; margin: 0 0 10px 0;">💾 Data Information</h3>
-                        <p><strong>Buffer Size:</strong> {BUFFER_SAMPLES:,} samples</p>
-                        <p><strong>CH1 Length:</strong> {len(self.data_ch1):,} samples</p>
-                        <p><strong>CH3 Length:</strong> {len(self.data_ch2):,} samples</p>
-                    </div>
-                </div>
-                <div style="background: #f8f9fa; padding: 15px; border-radius: 8px; margin-top: 20px; border-left: 4px solid #17a2b8;">
-                    <h3 style="color: #17a2b8; margin: 0 0 10px 0;">🔧 Configuration</h3>
-                    <div style="display: grid; grid-template-columns: repeat(3, 1fr); gap: 15px;">
-                        <p><strong>Window Function:</strong> {self.window_function}</p>
-                        <p><strong>FFT Size:</strong> {self.fft_size:,}</p>
-                        <p><strong>Auto Refresh:</strong> {'✅ Enabled' if self.auto_refresh else '❌ Disabled'}</p>
-                    </div>
-                </div>
-            </div>
-        </div>
-        """
+        status_html = _STATUS_TMPL.format(
+            last_update=self.last_update,
+            sample_rate=SAMPLE_RATE,
+            duration_ms=len(self.data_ch1) / SAMPLE_RATE * 1000,
+            buffer_samples=BUFFER_SAMPLES,
+            ch1_len=len(self.data_ch1),
+            ch3_len=len(self.data_ch2),
+            window_function=self.window_function,
+            fft_size=self.fft_size,
+            auto_refresh='✅ Enabled' if self.auto_refresh else '❌ Disabled',
+        )
         return pn.pane.HTML(status_html, sizing_mode='stretch_width')
     
     # === ADVANCED ANALYTICS METHODS ===
@@ -458,77 +1023,125 @@ class RFAnalytics(param.Parameterized):
         if len(ch1_data) != len(ch2_data) or len(ch1_data) == 0:
             return np.array([]), np.array([])
             
-        # Normalize data
-        ch1_norm = (ch1_data - np.mean(ch1_data)) / np.std(ch1_data)
-        ch2_norm = (ch2_data - np.mean(ch2_data)) / np.std(ch2_data)
-        
-        # Cross-correlation
-        correlation = signal.correlate(ch1_norm, ch2_norm, mode='full')
-        lags = signal.correlation_lags(len(ch1_data), len(ch2_data), mode='full')
+        # Remove mean; the std normalization is applied to the result
+        n = len(ch1_data)
+        ch1_centered = ch1_data - np.mean(ch1_data)
+        ch2_centered = ch2_data - np.mean(ch2_data)
+        
+        # Cross-correlation via zero-padded rfft (O(N log N)),
+        # rotated into 'full' lag order -(N-1) .. N-1
+        n_fft = next_fast_len(2 * n - 1, real=True)
+        spec_ch1, spec_ch2 = self._rfft_rows(np.stack((ch1_centered, ch2_centered)), n_fft)
+        circular = irfft(spec_ch1 * np.conj(spec_ch2), n=n_fft, workers=FFT_WORKERS)
+        correlation = np.concatenate((circular[n_fft - n + 1:], circular[:n]))
+        correlation /= np.std(ch1_data) * np.std(ch2_data)
+        lags = signal.correlation_lags(n, n, mode='full')
         
         return correlation, lags / SAMPLE_RATE  # Convert to time
     
     def detect_pulses(self, data, threshold_factor=3.0):
-        """Detect pulses in signal"""
+        """Detect pulses in signal.
+        
+        Returns:
+            Dict of parallel arrays: 'time' (s), 'amplitude' (V), 'index'
+        """
         if len(data) == 0:
-            return []
+            return {'time': np.array([]), 'amplitude': np.array([]), 'index': np.array([], dtype=np.int64)}
             
-        # Calculate adaptive threshold
-        noise_level = np.std(data)
+        # Calculate adaptive threshold (std from the single-pass stats kernel)
+        n = len(data)
+        total, sum_sq, _, _, _ = single_pass_stats(data)
+        mean = total / n
+        noise_level = np.sqrt(max(sum_sq / n - mean * mean, 0.0))
         threshold = threshold_factor * noise_level
         
-        # Find peaks above threshold
-        peaks, properties = signal.find_peaks(
-            np.abs(data), 
-            height=threshold,
-            distance=int(0.001 * SAMPLE_RATE)  # Minimum 1ms between pulses
+        # Find |data| peaks above threshold in one scan
+        peaks = detect_abs_peaks(
+            data,
+            threshold,
+            int(0.001 * SAMPLE_RATE)  # Minimum 1ms between pulses
         )
         
-        pulse_info = []
-        for peak in peaks:
-            pulse_info.append({
-                'time': peak / SAMPLE_RATE,
-                'amplitude': data[peak],
-                'index': peak
-            })
-            
-        return pulse_info
+        return {
+            'time': peaks / SAMPLE_RATE,
+            'amplitude': data[peaks],
+            'index': peaks
+        }
     
     def compute_phase_difference(self, ch1_data, ch2_data):
         """Compute phase difference between channels"""
         if len(ch1_data) != len(ch2_data) or len(ch1_data) == 0:
             return {}
             
-        # FFT both channels
-        fft_ch1 = fft(ch1_data)
-        fft_ch2 = fft(ch2_data)
+        # Real FFT of both channels in one batched call (non-negative bins only)
+        n_fft = next_fast_len(len(ch1_data), real=True)
+        fft_ch1, fft_ch2 = self._rfft_rows(np.stack((ch1_data, ch2_data)), n_fft)
         
-        # Compute phase difference
-        phase_diff = np.angle(fft_ch2) - np.angle(fft_ch1)
-        freqs = fftfreq(len(ch1_data), 1/SAMPLE_RATE)
+        # Phase difference from the cross spectrum, wrapped to (-pi, pi];
+        # keep the bins below Nyquist like the full-FFT version did
+        n_bins = n_fft // 2
+        phase_diff = np.angle(fft_ch2[:n_bins] * np.conj(fft_ch1[:n_bins]))
+        freqs = _rfft_freqs(n_fft)[:n_bins]
         
         # Find dominant frequency for phase analysis
-        magnitude_ch1 = np.abs(fft_ch1)
-        dominant_freq_idx = np.argmax(magnitude_ch1[1:len(magnitude_ch1)//2]) + 1
+        dominant_freq_idx = np.argmax(np.abs(fft_ch1[1:n_bins])) + 1
         
         return {
-            'phase_diff_spectrum': phase_diff[:len(phase_diff)//2],
-            'frequencies': freqs[:len(freqs)//2],
+            'phase_diff_spectrum': phase_diff,
+            'frequencies': freqs,
             'dominant_phase_diff': phase_diff[dominant_freq_idx],
             'dominant_frequency': freqs[dominant_freq_idx]
         }
     
+    def compute_spectrogram(self, data, nperseg=SPECTROGRAM_NPERSEG):
+        """Compute a short-time power spectrogram (50% overlapped frames).
+        
+        Frames are laid out as contiguous rows so all of them go through one
+        batched row-wise rfft instead of strided per-column transforms.
+        
+        Returns:
+            Dict with 'times' (s, frame centres), 'frequencies' (Hz) and
+            'power_db' of shape (frequencies, times)
+        """
+        if len(data) < nperseg:
+            return {}
+        
+        # (frames, nperseg) strided view; the windowed copy into the FFT
+        # input makes each frame a contiguous row
+        hop = nperseg // 2
+        frames = np.lib.stride_tricks.sliding_window_view(data, nperseg)[::hop]
+        window = get_fft_window(self.window_function, nperseg) if self.window_function != 'none' else None
+        spectra = self._rfft_rows(frames, nperseg, window)
+        
+        # One-sided power per bin in V^2 (same scaling as the Welch estimator)
+        power = np.empty(spectra.shape, dtype=np.float32)
+        power_spectrum(spectra.ravel(), power.ravel())
+        window_sum = float(np.sum(window)) if window is not None else float(nperseg)
+        power *= np.float32(2.0 / window_sum ** 2)
+        np.add(power, 1e-20, out=power)
+        np.log10(power, out=power)
+        power *= 10.0
+        
+        return {
+            'times': (np.arange(len(frames)) * hop + nperseg / 2) / SAMPLE_RATE,
+            'frequencies': _rfft_freqs(nperseg),
+            'power_db': power.T
+        }
+    
     def compute_channel_isolation(self, ch1_data, ch2_data):
         """Compute channel isolation metrics"""
         if len(ch1_data) != len(ch2_data) or len(ch1_data) == 0:
             return {}
             
-        # Cross-talk analysis
-        ch1_power = np.mean(ch1_data**2)
-        ch2_power = np.mean(ch2_data**2)
+        # Cross-talk analysis: row-wise power of the (2, N) channel stack
+        stacked = np.stack((ch1_data, ch2_data))
+        n = stacked.shape[1]
+        ch1_power, ch2_power = np.einsum('ij,ij->i', stacked, stacked) / n
         
         # Cross-correlation coefficient
-        correlation_coeff = np.corrcoef(ch1_data, ch2_data)[0, 1]
+        stacked -= stacked.mean(axis=1, keepdims=True)
+        var_ch1, var_ch2 = np.einsum('ij,ij->i', stacked, stacked)
+        correlation_coeff = np.dot(stacked[0], stacked[1]) / np.sqrt(var_ch1 * var_ch2)
         
         # Isolation in dB
         isolation_db = 10 * np.log10(max(ch1_power, ch2_power) / 
@@ -541,131 +1154,276 @@ class RFAnalytics(param.Parameterized):
             'ch2_power_db': 10 * np.log10(ch2_power + 1e-12)
         }
     
+    def compute_band_power(self, ch1_data, ch2_data, f_lo, f_hi):
+        """Compute the mean-square power of each channel within [f_lo, f_hi] Hz.
+        
+        Returns:
+            Dict with 'ch1_band_power_db' and 'ch2_band_power_db'
+        """
+        if len(ch1_data) != len(ch2_data) or len(ch1_data) == 0:
+            return {}
+        
+        # The power spectra only depend on the samples, so range-only changes
+        # re-sum the cached bins; the entry keeps its inputs so ids stay unique
+        cache_key = ('band_psd', id(ch1_data), id(ch2_data))
+        with self._compute_lock:
+            cached = self._fft_cache.get(cache_key)
+            if cached is None or cached[0] is not ch1_data or cached[1] is not ch2_data:
+                cached = self._fft_cache[cache_key] = (
+                    ch1_data, ch2_data, *self._channel_power_spectra(ch1_data, ch2_data)
+                )
+        freqs, power = cached[2:]
+        
+        return {
+            'ch1_band_power_db': band_power_db(power[0], freqs, f_lo, f_hi),
+            'ch2_band_power_db': band_power_db(power[1], freqs, f_lo, f_hi)
+        }
+    
+    def _channel_power_spectra(self, ch1_data, ch2_data) -> Tuple[np.ndarray, np.ndarray]:
+        """One-sided |X|^2 of both channels for the band power.
+        
+        Scaled so the full band matches the time-domain mean square
+        (Parseval, zero-padded to n_fft).
+        
+        Returns:
+            Tuple of (frequencies, power) with power of shape (2, n_fft // 2 + 1)
+        """
+        n = len(ch1_data)
+        n_fft = next_fast_len(n, real=True)
+        spectra = self._rfft_rows(np.stack((ch1_data, ch2_data)), n_fft)
+        power = np.empty(spectra.shape, dtype=np.float32)
+        power_spectrum(spectra.ravel(), power.ravel())  # |X|^2 without the sqrt of abs
+        power *= np.float32(2.0 / (n_fft * n))
+        return _rfft_freqs(n_fft), power
+    
     def create_advanced_analysis_tab(self):
         """Create advanced analysis visualization"""
         if len(self.data_ch1) == 0:
             return pn.pane.Markdown("## No data available for advanced analysis")
         
+        if self._advanced_pane is None:
+            self._advanced_pane = self._build_advanced_pane()
+        
+        self._send_advanced_analysis()
+        return self._advanced_pane
+    
+    def _build_advanced_pane(self) -> pn.Column:
+        """Build the persistent advanced analysis plots, fed by Pipe streams."""
+        pipes = self._advanced_pipes
+        
+        def pulse_plot(data):
+            time_us, signal_v, pulse_t, pulse_a = data
+            return (self._area_curve(
+                time_us, signal_v, TIME_DIM, AMPLITUDE_DIM,
+                '#4287f5', 'CH1 Signal', 'Pulse Detection Analysis'
+            ) * hv.Scatter(
+                (pulse_t, pulse_a), TIME_DIM, AMPLITUDE_DIM,
+                label=f'Detected Pulses ({len(pulse_t)})'
+            ).opts(color='#ffc107', line_color='#fd7e14', marker='star', size=14)
+            ).opts(title='Pulse Detection Analysis', **PLOT_OPTS)
+        
+        def power_plot(data):
+            names, powers = data
+            colors = {'CH1 Power': '#4287f5', 'CH3 Power': '#ff6b6b', 'Isolation': '#28a745'}
+            bars = hv.Bars(list(zip(names, powers)), 'quantity', POWER_DIM).opts(
+                color=hv.dim('quantity').categorize(colors), alpha=0.8, line_color='white', line_width=2
+            )
+            labels = hv.Labels(
+                [(name, power + 0.5, f'{power:.1f} dB') for name, power in zip(names, powers)],
+                ['quantity', POWER_DIM], 'text'
+            ).opts(text_baseline='bottom', text_font_style='bold', text_font_size='10pt')
+            return (bars * labels).opts(
+                title='Channel Power & Isolation', xlabel='', responsive=True, height=420,
+                bgcolor='#fafafa', show_grid=True
+            )
+        
+        def spectrogram_plot(data):
+            times_us, freqs_mhz, power_db = data
+            return hv.Image((times_us, freqs_mhz, power_db), [TIME_DIM, FREQ_DIM], POWER_DIM).opts(
+                cmap='viridis', colorbar=True, tools=['hover'],
+                title='CH1 Spectrogram', responsive=True, height=420
+            )
+        
+        layout = (
+            self._stream_plot(pipes['correlation'], '#28a745',
+                              'Cross-Correlation Analysis', LAG_DIM, CORRELATION_DIM)
+            + self._stream_plot(pipes['phase'], '#dc3545',
+                                'Phase Difference Spectrum', FREQ_DIM, PHASE_DIM)
+            + hv.DynamicMap(pulse_plot, streams=[pipes['pulses']])
+            + hv.DynamicMap(power_plot, streams=[pipes['power']])
+            + hv.DynamicMap(spectrogram_plot, streams=[pipes['spectrogram']])
+        )
+        plot_pane = pn.pane.HoloViews(
+            layout.cols(2).opts(shared_axes=False), sizing_mode='stretch_both'
+        )
+        self._summary_pane = pn.pane.HTML('', sizing_mode='stretch_width')
+        
+        return pn.Column(plot_pane, self._summary_pane)
+    
+    def _send_advanced_analysis(self):
+        """Push the current advanced analysis results into the plot streams and summary.
+        
+        In a server session the analysis runs in the process pool and the
+        plots update once it is done; otherwise it runs inline.
+        """
+        # Plots depend on the samples (and the spectrogram window) only; the
+        # frequency range just changes the band power in the summary
+        key = (self.last_update, self.window_function)
+        cached = self._plot_cache.get('advanced')
+        if cached is not None and cached[0] == key:
+            self._send_advanced_summary(key, cached[1])
+            return
+        
+        doc = pn.state.curdoc
+        if ANALYSIS_PROCESSES <= 0 or doc is None or doc.session_context is None:
+            self._on_advanced_results(key, self.compute_advanced_analysis())
+            return
+        
+        if self._advanced_pending == key:
+            return
+        self._advanced_pending = key
+        self._advanced_pane.loading = True
+        future = _analysis_pool().submit(
+            advanced_analysis_worker, np.array(self.data), self.window_function
+        )
+        future.add_done_callback(lambda f: doc.add_next_tick_callback(
+            functools.partial(self._on_advanced_done, key, f)
+        ))
+    
+    def _on_advanced_done(self, key: tuple, future):
+        """Apply a finished process-pool result, or re-run if the data moved on."""
+        self._advanced_pending = None
+        self._advanced_pane.loading = False
+        try:
+            results = future.result()
+        except Exception as e:
+            # Pool unusable (e.g. a worker died): run inline, rebuild the pool next time
+            print(f"Advanced analysis failed in process pool, running inline: {e}")
+            if isinstance(e, BrokenProcessPool):
+                _reset_analysis_pool()
+            results = None
+        if key != (self.last_update, self.window_function):
+            self._send_advanced_analysis()
+            return
+        if results is None:
+            results = self.compute_advanced_analysis()
+        self._on_advanced_results(key, results)
+    
+    def _on_advanced_results(self, key: tuple, results: Dict[str, Any]):
+        """Send advanced analysis results to the plots and cache their summary."""
+        pipes = self._advanced_pipes
+        for name in ('correlation', 'pulses', 'phase', 'spectrogram', 'power'):
+            if results[name] is not None:
+                pipes[name].send(results[name])
+        self._plot_cache['advanced'] = (key, results['summary'])
+        self._send_advanced_summary(key, results['summary'])
+    
+    def _send_advanced_summary(self, key: tuple, summary: Dict[str, Any]):
+        """Render the summary once per (analysis, frequency range)."""
+        summary_key = (key, self.freq_range_low, self.freq_range_high)
+        self._memo_plot('advanced_summary', summary_key, lambda: self._update_advanced_summary(summary))
+    
+    def compute_advanced_analysis(self) -> Dict[str, Any]:
+        """Compute the advanced analysis for the current data.
+        
+        Returns plain arrays and numbers only, so it can run in a worker
+        process and be pickled back.
+        
+        Returns:
+            Dict with the pipe payloads 'correlation', 'pulses', 'phase',
+            'spectrogram', 'power' (None when unavailable) and 'summary',
+            the summary values rounded to their display precision
+        """
         # Cross-correlation analysis
         corr, lags = self.compute_cross_correlation(self.data_ch1, self.data_ch2)
         
         # Pulse detection
         pulses_ch1 = self.detect_pulses(self.data_ch1)
         pulses_ch2 = self.detect_pulses(self.data_ch2)
+        time_us = self.time_axis * 1e6
         
-        # Phase difference
+        # Phase difference, skipping the DC bin (freqs is the ascending rfft axis)
         phase_analysis = self.compute_phase_difference(self.data_ch1, self.data_ch2)
+        phase = None
+        if phase_analysis:
+            freqs = phase_analysis['frequencies']
+            i0 = np.searchsorted(freqs, 0.0, side='right')
+            phase = (
+                *_decimate_for_plot(freqs[i0:] / 1e6, np.rad2deg(phase_analysis['phase_diff_spectrum'][i0:])),
+                'Phase Difference'
+            )
+        
+        # Short-time spectrum of CH1
+        spectrogram = self.compute_spectrogram(self.data_ch1)
         
         # Channel isolation
         isolation = self.compute_channel_isolation(self.data_ch1, self.data_ch2)
         
-        # Create plots with enhanced styling
-        fig, ((ax1, ax2), (ax3, ax4)) = plt.subplots(2, 2, figsize=(16, 12))
-        fig.patch.set_facecolor('#f8f9fa')
-        
-        # Cross-correlation plot with gradient
-        if len(corr) > 0:
-            ax1.plot(lags * 1e6, corr, color='#28a745', linewidth=2.5, alpha=0.9, label='Cross-correlation')
-            ax1.fill_between(lags * 1e6, corr, alpha=0.3, color='#28a745')
-            ax1.set_xlabel('Lag Time (μs)', fontweight='bold')
-            ax1.set_ylabel('Correlation Coefficient', fontweight='bold')
-            ax1.set_title('Cross-Correlation Analysis', fontsize=12, fontweight='bold', pad=15)
-            ax1.grid(True, alpha=0.4, linestyle='--')
-            ax1.legend(framealpha=0.9)
-            ax1.set_facecolor('#fafafa')
-        
-        # Phase difference plot with modern styling
-        if 'frequencies' in phase_analysis and len(phase_analysis['frequencies']) > 0:
-            freqs = phase_analysis['frequencies']
-            phase_diff = phase_analysis['phase_diff_spectrum']
-            pos_freqs = freqs[freqs > 0]
-            pos_phase = phase_diff[freqs > 0]
-            ax2.plot(pos_freqs/1e6, np.rad2deg(pos_phase), color='#dc3545', linewidth=2.5, alpha=0.9, label='Phase Difference')
-            ax2.fill_between(pos_freqs/1e6, np.rad2deg(pos_phase), alpha=0.3, color='#dc3545')
-            ax2.set_xlabel('Frequency (MHz)', fontweight='bold')
-            ax2.set_ylabel('Phase Difference (°)', fontweight='bold')
-            ax2.set_title('Phase Difference Spectrum', fontsize=12, fontweight='bold', pad=15)
-            ax2.grid(True, alpha=0.4, linestyle='--')
-            ax2.legend(framealpha=0.9)
-            ax2.set_facecolor('#fafafa')
-        
-        # Pulse detection with enhanced visualization
-        time_us = self.time_axis * 1e6
-        ax3.plot(time_us, self.data_ch1, color='#4287f5', alpha=0.8, linewidth=1.5, label='CH1 Signal')
-        ax3.fill_between(time_us, self.data_ch1, alpha=0.2, color='#4287f5')
-        if pulses_ch1:
-            pulse_times = [p['time'] * 1e6 for p in pulses_ch1]
-            pulse_amps = [p['amplitude'] for p in pulses_ch1]
-            ax3.scatter(pulse_times, pulse_amps, color='#ffc107', s=80, marker='*', 
-                       edgecolors='#fd7e14', linewidth=2, label=f'Detected Pulses ({len(pulses_ch1)})')
-        ax3.set_xlabel('Time (μs)', fontweight='bold')
-        ax3.set_ylabel('Amplitude (V)', fontweight='bold')
-        ax3.set_title('Pulse Detection Analysis', fontsize=12, fontweight='bold', pad=15)
-        ax3.legend(framealpha=0.9)
-        ax3.grid(True, alpha=0.4, linestyle='--')
-        ax3.set_facecolor('#fafafa')
-        
-        # Channel isolation with gradient bars
-        powers = [isolation.get('ch1_power_db', 0), isolation.get('ch2_power_db', 0), isolation.get('isolation_db', 0)]
-        colors = ['#4287f5', '#ff6b6b', '#28a745']
-        bars = ax4.bar(['CH1 Power', 'CH3 Power', 'Isolation'], powers, color=colors, alpha=0.8, 
-                      edgecolor='white', linewidth=2)
-        
-        # Add value labels on bars
-        for bar, power in zip(bars, powers):
-            height = bar.get_height()
-            ax4.text(bar.get_x() + bar.get_width()/2., height + 0.5,
-                    f'{power:.1f} dB', ha='center', va='bottom', fontweight='bold')
-        
-        ax4.set_ylabel('Power Level (dB)', fontweight='bold')
-        ax4.set_title('Channel Power & Isolation', fontsize=12, fontweight='bold', pad=15)
-        ax4.grid(True, alpha=0.4, linestyle='--', axis='y')
-        ax4.set_facecolor('#fafafa')
-        
-        plt.tight_layout(pad=3.0)
-        
-        # Create styled summary
-        summary_html = f"""
-        <div style="background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); 
-                    border-radius: 15px; padding: 25px; margin: 10px; 
-                    box-shadow: 0 8px 32px rgba(0,0,0,0.1);">
-            <h2 style="color: white; text-align: center; font-family: 'Arial', sans-serif; 
-                       margin-bottom: 20px; text-shadow: 2px 2px 4px rgba(0,0,0,0.3);">
-                🔬 Advanced Analysis Summary
-            </h2>
-            <div style="background: rgba(255,255,255,0.95); border-radius: 10px; padding: 20px;">
-                <div style="display: grid; grid-template-columns: 1fr 1fr; gap: 20px; font-family: 'Arial', sans-serif;">
-                    <div style="background: #f0f8ff; padding: 15px; border-radius: 8px; border-left: 4px solid #4287f5;">
-                        <h3 style="color: #4287f5; margin: 0 0 15px 0;">🔄 Cross-Channel Analysis</h3>
-                        <p><strong>Channel Isolation:</strong> <span style="color: #28a745; font-weight: bold;">{isolation.get('isolation_db', 0):.1f} dB</span></p>
-                        <p><strong>Correlation Coefficient:</strong> <span style="color: #17a2b8; font-weight: bold;">{isolation.get('correlation_coefficient', 0):.3f}</span></p>
-                        <p><strong>Phase Difference:</strong> <span style="color: #dc3545; font-weight: bold;">{np.rad2deg(phase_analysis.get('dominant_phase_diff', 0)):.1f}°</span></p>
-                        <p><strong>Dominant Frequency:</strong> <span style="color: #6f42c1; font-weight: bold;">{phase_analysis.get('dominant_frequency', 0)/1e6:.3f} MHz</span></p>
-                    </div>
-                    <div style="background: #fff5f5; padding: 15px; border-radius: 8px; border-left: 4px solid #ff6b6b;">
-                        <h3 style="color: #ff6b6b; margin: 0 0 15px 0;">⚡ Signal Detection</h3>
-                        <p><strong>CH1 Pulses:</strong> <span style="color: #4287f5; font-weight: bold;">{len(pulses_ch1)} detected</span></p>
-                        <p><strong>CH3 Pulses:</strong> <span style="color: #ff6b6b; font-weight: bold;">{len(pulses_ch2)} detected</span></p>
-                        <p><strong>Cross-correlation Max:</strong> <span style="color: #28a745; font-weight: bold;">{np.max(np.abs(corr)) if len(corr) > 0 else 0:.3f}</span></p>
-                    </div>
-                </div>
-                <div style="background: #f8f9fa; padding: 15px; border-radius: 8px; margin-top: 20px; border-left: 4px solid #17a2b8;">
-                    <h3 style="color: #17a2b8; margin: 0 0 15px 0;">📊 Power Analysis</h3>
-                    <div style="display: grid; grid-template-columns: repeat(3, 1fr); gap: 15px;">
-                        <p><strong>CH1 Power:</strong> <span style="color: #4287f5; font-weight: bold;">{isolation.get('ch1_power_db', 0):.1f} dB</span></p>
-                        <p><strong>CH3 Power:</strong> <span style="color: #ff6b6b; font-weight: bold;">{isolation.get('ch2_power_db', 0):.1f} dB</span></p>
-                        <p><strong>Isolation:</strong> <span style="color: #28a745; font-weight: bold;">{isolation.get('isolation_db', 0):.1f} dB</span></p>
-                    </div>
-                </div>
-            </div>
-        </div>
-        """
-        
-        # Combine plot and summary
-        plot_pane = pn.pane.Matplotlib(fig, sizing_mode='stretch_both')
-        summary_pane = pn.pane.HTML(summary_html, sizing_mode='stretch_width')
+        return {
+            'correlation': (*_decimate_for_plot(lags * 1e6, corr), 'Cross-correlation'),
+            'pulses': (
+                *_decimate_for_plot(time_us, self.data_ch1),
+                pulses_ch1['time'] * 1e6, pulses_ch1['amplitude']
+            ),
+            'phase': phase,
+            'spectrogram': (
+                spectrogram['times'] * 1e6, spectrogram['frequencies'] / 1e6, spectrogram['power_db']
+            ) if spectrogram else None,
+            'power': (
+                ['CH1 Power', 'CH3 Power', 'Isolation'],
+                [isolation.get('ch1_power_db', 0), isolation.get('ch2_power_db', 0), isolation.get('isolation_db', 0)]
+            ),
+            'summary': dict(
+                isolation_db=round(float(isolation.get('isolation_db', 0)), 1),
+                correlation=round(float(isolation.get('correlation_coefficient', 0)), 3),
+                phase_deg=round(float(np.rad2deg(phase_analysis.get('dominant_phase_diff', 0))), 1),
+                dominant_mhz=round(float(phase_analysis.get('dominant_frequency', 0)) / 1e6, 3),
+                n_pulses_ch1=len(pulses_ch1['index']),
+                n_pulses_ch2=len(pulses_ch2['index']),
+                corr_max=round(float(np.max(np.abs(corr))) if len(corr) > 0 else 0.0, 3),
+                ch1_power_db=round(float(isolation.get('ch1_power_db', 0)), 1),
+                ch2_power_db=round(float(isolation.get('ch2_power_db', 0)), 1),
+            ),
+        }
+    
+    def _update_advanced_summary(self, summary: Dict[str, Any]):
+        """Add the band power for the current frequency range and render the summary."""
+        band_power = self.compute_band_power(
+            self.data_ch1, self.data_ch2, self.freq_range_low, self.freq_range_high
+        )
         
-        return pn.Column(plot_pane, summary_pane)
+        # Styled summary, formatted once per distinct (rounded) set of values
+        self._summary_pane.object = _format_advanced_summary(
+            **summary,
+            ch1_band_power_db=round(float(band_power.get('ch1_band_power_db', 0)), 1),
+            ch2_band_power_db=round(float(band_power.get('ch2_band_power_db', 0)), 1),
+            band_low_mhz=round(self.freq_range_low / 1e6, 3),
+            band_high_mhz=round(self.freq_range_high / 1e6, 3),
+        )
+
+
+# === PROCESS POOL (advanced analysis) ===
+_ANALYSIS_POOL: Optional[ProcessPoolExecutor] = None
+
+
+def _analysis_pool() -> ProcessPoolExecutor:
+    """Return the shared process pool, created on first use."""
+    global _ANALYSIS_POOL
+    if _ANALYSIS_POOL is None:
+        # spawn: forking after Numba/FFTW threads have started can deadlock
+        _ANALYSIS_POOL = ProcessPoolExecutor(
+            max_workers=ANALYSIS_PROCESSES, mp_context=multiprocessing.get_context('spawn')
+        )
+    return _ANALYSIS_POOL
+
+
+def _reset_analysis_pool():
+    """Drop a broken process pool so the next submit starts a fresh one."""
+    global _ANALYSIS_POOL
+    if _ANALYSIS_POOL is not None:
+        _ANALYSIS_POOL.shutdown(wait=False, cancel_futures=True)
+        _ANALYSIS_POOL = None
+
 
 def create_dashboard():
     """Create the main dashboard application"""
@@ -673,36 +1431,67 @@ def create_dashboard():
     # Initialize analytics class
     analytics = RFAnalytics()
     
-    # Load initial data
+    # Load initial data, then keep polling the live file in the background
     analytics.update_data()
+    if analytics.auto_refresh:
+        analytics.start_reader()
     
     # Create interactive controls (safe approach)
     auto_refresh_toggle = pn.widgets.Toggle(name="Auto Refresh", value=analytics.auto_refresh, width=150)
     refresh_rate_slider = pn.widgets.FloatSlider(name="Refresh Rate (s)", start=0.1, end=10.0, step=0.1, value=analytics.refresh_rate, width=150)
     window_select = pn.widgets.Select(name="Window Function", options=['hann', 'hamming', 'blackman', 'bartlett', 'none'], value=analytics.window_function, width=150)
     fft_size_select = pn.widgets.Select(name="FFT Size", options=[1024, 2048, 4096, 8192, 16384], value=analytics.fft_size, width=150)
+    estimator_select = pn.widgets.Select(name="Spectrum Estimator", options=['periodogram', 'welch'], value=analytics.spectrum_estimator, width=150)
     freq_low_input = pn.widgets.FloatInput(name="Freq Low (MHz)", value=analytics.freq_range_low/1e6, width=150)
     freq_high_input = pn.widgets.FloatInput(name="Freq High (MHz)", value=analytics.freq_range_high/1e6, width=150)
     
     # Update callbacks
     def update_auto_refresh(event):
         analytics.auto_refresh = event.new
+        if event.new:
+            analytics.start_reader()
+        else:
+            analytics.stop_reader()
     def update_refresh_rate(event):
         analytics.refresh_rate = event.new
     def update_window(event):
         analytics.window_function = event.new
     def update_fft_size(event):
         analytics.fft_size = event.new
+    def update_estimator(event):
+        analytics.spectrum_estimator = event.new
+    # Freq range edits are coalesced: both bounds are applied in one
+    # param.update once the inputs have been idle for FREQ_RANGE_DEBOUNCE_MS
+    pending_range = {}
+    debounce = {'token': 0}
+    
+    def apply_freq_range(token):
+        if token != debounce['token']:
+            return  # Superseded by a newer edit
+        analytics.param.update(**pending_range)
+        pending_range.clear()
+    
+    def schedule_freq_range(name, value):
+        pending_range[name] = value
+        debounce['token'] += 1
+        token = debounce['token']
+        doc = pn.state.curdoc
+        if doc is not None and doc.session_context is not None:
+            doc.add_timeout_callback(functools.partial(apply_freq_range, token), FREQ_RANGE_DEBOUNCE_MS)
+        else:
+            apply_freq_range(token)
+    
     def update_freq_low(event):
-        analytics.freq_range_low = event.new * 1e6
+        schedule_freq_range('freq_range_low', event.new * 1e6)
     def update_freq_high(event):
-        analytics.freq_range_high = event.new * 1e6
+        schedule_freq_range('freq_range_high', event.new * 1e6)
     
     # Bind callbacks
     auto_refresh_toggle.param.watch(update_auto_refresh, 'value')
-    refresh_rate_slider.param.watch(update_refresh_rate, 'value')
+    refresh_rate_slider.param.watch(update_refresh_rate, 'value_throttled')  # only on release
     window_select.param.watch(update_window, 'value')
     fft_size_select.param.watch(update_fft_size, 'value')
+    estimator_select.param.watch(update_estimator, 'value')
     freq_low_input.param.watch(update_freq_low, 'value')
     freq_high_input.param.watch(update_freq_high, 'value')
     
@@ -711,6 +1500,7 @@ def create_dashboard():
         refresh_rate_slider,
         window_select,
         fft_size_select,
+        estimator_select,
         freq_low_input,
         freq_high_input,
         width=200
@@ -719,12 +1509,34 @@ def create_dashboard():
     # Refresh button
     refresh_button = pn.widgets.Button(name="🔄 Refresh Data", button_type="primary")
     
+    # Load + FFT run on a worker thread so the Bokeh server thread stays free;
+    # one worker keeps refreshes ordered and never overlapping
+    executor = ThreadPoolExecutor(max_workers=1)
+    
+    def load():
+        # Warm the spectrum cache off the server thread as well
+        if not analytics.update_data():
+            return False
+        analytics.compute_channel_spectra()
+        return True
+    
     def refresh_callback(event):
-        analytics.update_data()
+        doc = pn.state.curdoc
+        
+        def on_done(future):
+            if not future.result():
+                return
+            if doc is not None and doc.session_context is not None:
+                doc.add_next_tick_callback(analytics.refresh_streams)
+            else:
+                analytics.refresh_streams()
+        
+        executor.submit(load).add_done_callback(on_done)
         
     refresh_button.on_click(refresh_callback)
     
-    # Create simple static functions (will update via refresh button)
+    # Tab contents are built on first activation; the plots themselves
+    # persist and update through their Pipe streams (see refresh_streams)
     def time_plot():
         return analytics.create_time_domain_plot()
     
@@ -740,14 +1552,17 @@ def create_dashboard():
     def status_panel():
         return analytics.create_status_panel()
     
-    # Create styled tabs
+    def lazy(fn):
+        return pn.panel(fn, defer_load=True, loading_indicator=True)
+    
+    # Create styled tabs (dynamic: only the active tab is rendered)
     tabs = pn.Tabs(
-        ("📈 Time Domain", time_plot),
-        ("🎛️ Frequency Domain", freq_plot), 
-        ("📊 Metrics", metrics_table),
-        ("🔬 Advanced Analysis", advanced_analysis),
-        ("ℹ️ Status", status_panel),
-        dynamic=False,
+        ("📈 Time Domain", lazy(time_plot)),
+        ("🎛️ Frequency Domain", lazy(freq_plot)), 
+        ("📊 Metrics", lazy(metrics_table)),
+        ("🔬 Advanced Analysis", lazy(advanced_analysis)),
+        ("ℹ️ Status", lazy(status_panel)),
+        dynamic=True,
         styles={
             'background': '#ffffff',
             'border-radius': '10px',
@@ -757,24 +1572,10 @@ def create_dashboard():
     )
     
     # Create styled sidebar
-    header_html = """
-    <div style="background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); 
-                border-radius: 12px; padding: 20px; margin-bottom: 20px;
-                box-shadow: 0 4px 20px rgba(0,0,0,0.1);">
-        <h1 style="color: white; text-align: center; font-family: 'Arial Black', sans-serif; 
-                   margin: 0; font-size: 18px; text-shadow: 2px 2px 4px rgba(0,0,0,0.3);">
-            📡 RF Analytics Dashboard
-        </h1>
-        <p style="color: rgba(255,255,255,0.9); text-align: center; margin: 5px 0 0 0; 
-                  font-size: 12px; font-style: italic;">
-            PCI-9846H Real-time Analysis
-        </p>
-    </div>
-    """
     
     sidebar = pn.Column(
-        pn.pane.HTML(header_html),
-        pn.pane.HTML('<div style="background: #f8f9fa; padding: 15px; border-radius: 8px; margin-bottom: 15px; border-left: 4px solid #4287f5;"><h3 style="color: #4287f5; margin: 0 0 10px 0;">⚙️ Control Panel</h3></div>'),
+        pn.pane.HTML(_HEADER_HTML),
+        pn.pane.HTML(_CONTROL_PANEL_HTML),
         controls,
         pn.Spacer(height=15),
         refresh_button,
@@ -799,6 +1600,16 @@ def create_dashboard():
         }
     )
     
+    # Every served session gets its own reader thread and refresh worker;
+    # release both when the session closes so page loads don't pile up pollers
+    def on_session_destroyed(session_context):
+        analytics.stop_reader()
+        executor.shutdown(wait=False)
+    
+    doc = pn.state.curdoc
+    if doc is not None and doc.session_context is not None:
+        pn.state.on_session_destroyed(on_session_destroyed)
+    
     # Setup auto-refresh callback (will be handled by user interaction)
     def auto_refresh_callback():
         if analytics.auto_refresh:
@@ -4,11 +4,18 @@ Radar LPDP Group Comparison Analytics
 Analisis persamaan dalam group dan perbedaan antar group
 """
 
+import functools
+import os
 import sys
 from pathlib import Path
-from typing import Any, Dict, List, Tuple
-from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor
 import hashlib
+import json
+import math
+import statistics
+import threading
+import zlib
 from datetime import datetime
 import numpy as np
 import pandas as pd
@@ -20,21 +27,37 @@ sys.path.insert(0, str(parent_dir))
 
 from functions.data_processing import (
     load_and_process_data,
-    compute_fft,
-    compute_fft_linear,
-    find_top_extrema,
+    compute_fft_batch,
+    compute_fft_both_batch,
 )
+from functions.kernels import top_prominent_peaks
 from config import (
     SAMPLE_RATE,
     FFT_SMOOTHING_ENABLED,
+    FFT_SMOOTHING_METHOD,
     FFT_SMOOTHING_WINDOW,
+    FFT_SAVGOL_WINDOW,
+    FFT_SAVGOL_POLYORDER,
     FFT_MAGNITUDE_MODE,
+    FFT_MAGNITUDE_FLOOR_DB,
 )
 
 # Configuration
 SAMPLE_DIR = Path(__file__).parent / "sample"
 EXPORT_DIR = Path(__file__).parent / "exports"
+CACHE_DIR = SAMPLE_DIR / ".cache"  # spektrum + peak per file (.npz)
+DISCOVER_CACHE_FILE = CACHE_DIR / "groups.json"  # hasil discover_groups antar proses
 DEFAULT_LAYOUT_SPLIT = 70  # percent allocated to plot column
+OVERLAY_SERIES_SLOTS = 8  # line series per plot overlay yang dibuat di awal (ditambah jika kurang)
+TABLE_HEIGHT = 220  # tinggi stats_table / peak_detail_table (px)
+TABLE_CELL_PADDING = (4, 2)  # di-fix lewat theme agar tinggi row pasti
+TABLE_ROW_HEIGHT = 13 + 2 * TABLE_CELL_PADDING[1] + 1  # font default 13px + padding + border innerH
+LOAD_WORKERS = min(8, os.cpu_count() or 1)  # thread pembaca file .bin
+PARALLEL_STAT_MIN_DIRS = 256  # validasi cache discover dengan stat paralel mulai jumlah folder ini
+IDLE_FRAME_INTERVAL_S = 0.016  # jeda antar frame saat tidak ada callback (~60 fps)
+GROUP_SEARCH_DEBOUNCE_S = 0.1  # filter tree diterapkan setelah ketikan berhenti
+EXPORT_INPUT_DEBOUNCE_S = 0.2  # input rentang/jumlah peak eksport diterapkan setelah ketikan berhenti
+CACHED_PEAK_LIMIT = 500  # peak per channel yang disimpan di cache spektrum (di-slice ke peak count saat load)
 
 # Color palette untuk setiap group
 GROUP_COLORS = {
@@ -53,6 +76,188 @@ SAMPLE_COLORS = [
     (255, 150, 150),  # Light Red
 ]
 
+PEAK_PROMINENCE_DB = 3.0  # sama dengan default find_top_extrema
+
+# Satu record peak = 12 byte (SoA-friendly), bukan dict per peak
+PEAK_DTYPE = np.dtype([('index', 'i4'), ('freq_khz', 'f4'), ('mag_db', 'f4')])
+
+# Di bawah ukuran ini statistik ringkasan dihitung di Python (overhead dispatch NumPy > kerja)
+SMALL_STATS_SIZE = 64
+
+def _fast_median(x: np.ndarray) -> float:
+    """Median; statistics.median untuk array kecil, np.median untuk besar"""
+    if len(x) >= SMALL_STATS_SIZE:
+        return float(np.median(x))
+    return statistics.median(x.tolist()) if len(x) else 0.0
+
+def _fast_std(x: np.ndarray) -> float:
+    """Standar deviasi populasi (ddof=0); fsum untuk array kecil, np.std untuk besar"""
+    if len(x) >= SMALL_STATS_SIZE:
+        return float(np.std(x, dtype=np.float64))
+    if not len(x):
+        return 0.0
+    values = x.tolist()
+    mean = math.fsum(values) / len(values)
+    return math.sqrt(math.fsum((v - mean) ** 2 for v in values) / len(values))
+
+def _top_peaks_batch(freqs: np.ndarray, mags: np.ndarray, k: int) -> List[np.ndarray]:
+    """Top-k peak spectrum (tanpa valley) per baris mags sebagai array PEAK_DTYPE, highest first.
+    
+    Peak = titik di mana tanda selisih berurutan berubah dari naik ke turun,
+    disaring dengan prominence PEAK_PROMINENCE_DB. Semua baris di-scan sekali
+    oleh kernel top_prominent_peaks (Numba paralel per baris jika tersedia);
+    hanya kandidat peak yang diranking, bukan seluruh spektrum.
+    """
+    if k <= 0 or mags.shape[-1] < 3:
+        return [np.empty(0, dtype=PEAK_DTYPE) for _ in range(len(mags))]
+    
+    top_idx, counts = top_prominent_peaks(mags, PEAK_PROMINENCE_DB, k)
+    result = []
+    for mag, row_idx, count in zip(mags, top_idx, counts):
+        idx = row_idx[:count]
+        peaks = np.empty(count, dtype=PEAK_DTYPE)
+        peaks['index'] = idx
+        peaks['freq_khz'] = freqs[idx]
+        peaks['mag_db'] = mag[idx]
+        result.append(peaks)
+    return result
+
+def _scan_sample_dir(dir_path: str, groups: Dict[str, List[str]], dir_mtimes: Dict[str, int]):
+    """Walk os.scandir rekursif; .bin dikelompokkan per folder (relatif ke SAMPLE_DIR)"""
+    dir_mtimes[dir_path] = os.stat(dir_path).st_mtime_ns
+    group_name = None
+    with os.scandir(dir_path) as it:
+        for entry in it:
+            if entry.is_dir(follow_symlinks=False):
+                if entry.path != str(CACHE_DIR):
+                    _scan_sample_dir(entry.path, groups, dir_mtimes)
+            elif entry.name.endswith(".bin"):
+                # Gunakan parent folder sebagai group name
+                if group_name is None:
+                    group_name = os.path.relpath(dir_path, SAMPLE_DIR).replace("\\", "/")
+                groups.setdefault(group_name, []).append(entry.path)
+
+def _stat_mtime_ns(path: str) -> Optional[int]:
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+def _dir_mtimes_unchanged(dir_mtimes: Dict[str, int]) -> bool:
+    """True jika semua folder hasil scan masih ada dengan mtime yang sama"""
+    if len(dir_mtimes) < PARALLEL_STAT_MIN_DIRS:
+        return all(_stat_mtime_ns(path) == mtime for path, mtime in dir_mtimes.items())
+    # Banyak folder (mis. SAMPLE_DIR di network share): stat paralel, latency per
+    # syscall tumpang tindih alih-alih dijumlahkan (os.stat melepas GIL)
+    with ThreadPoolExecutor(max_workers=LOAD_WORKERS) as executor:
+        mtimes = executor.map(_stat_mtime_ns, dir_mtimes.keys())
+        return all(current == mtime for current, mtime in zip(mtimes, dir_mtimes.values()))
+
+def _read_discover_cache() -> Optional[Tuple[Dict[str, int], Dict[str, List[str]]]]:
+    """Load (mtime per folder, groups) dari DISCOVER_CACHE_FILE; None jika belum ada atau rusak"""
+    try:
+        with open(DISCOVER_CACHE_FILE, "r", encoding="utf-8") as f:
+            cached = json.load(f)
+        return cached["dir_mtimes"], cached["groups"]
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+def _write_discover_cache(dir_mtimes: Dict[str, int], groups: Dict[str, List[str]]):
+    """Simpan hasil scan ke DISCOVER_CACHE_FILE; gagal tulis diabaikan"""
+    try:
+        tmp_path = DISCOVER_CACHE_FILE.with_suffix(".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"dir_mtimes": dir_mtimes, "groups": groups}, f)
+        os.replace(tmp_path, DISCOVER_CACHE_FILE)
+    except OSError as e:
+        print(f"  ⚠️  Cache write failed for {DISCOVER_CACHE_FILE.name}: {e}")
+
+def _spectrum_cache_path(filename: str) -> Path:
+    """Path cache .npz untuk file: satu entry per file, ditimpa saat isinya basi"""
+    return CACHE_DIR / f"{hashlib.blake2b(filename.encode(), digest_size=16).hexdigest()}.npz"
+
+def _spectrum_cache_key(filepath: Path, filename: str) -> str:
+    """Key validitas cache (disimpan di dalam entry), berubah jika file atau setting FFT berubah"""
+    st = filepath.stat()
+    return (
+        f"{filename}:{st.st_mtime_ns}:{st.st_size}:{SAMPLE_RATE}:"
+        f"{FFT_SMOOTHING_ENABLED}:{FFT_SMOOTHING_METHOD}:{FFT_SMOOTHING_WINDOW}:"
+        f"{FFT_SAVGOL_WINDOW}:{FFT_SAVGOL_POLYORDER}:{FFT_MAGNITUDE_FLOOR_DB}:"
+        f"{FFT_MAGNITUDE_MODE}"
+    )
+
+def _prune_spectrum_cache(groups: Dict[str, List[str]]):
+    """Hapus entry cache spektrum milik file .bin yang sudah tidak ada (hapus/rename)"""
+    live = {
+        _spectrum_cache_path(os.path.relpath(path, SAMPLE_DIR).replace("\\", "/")).name
+        for files in groups.values()
+        for path in files
+    }
+    try:
+        with os.scandir(CACHE_DIR) as it:
+            stale = [entry.path for entry in it if entry.name.endswith(".npz") and entry.name not in live]
+        for path in stale:
+            os.remove(path)
+    except OSError as e:
+        print(f"  ⚠️  Cache prune failed for {CACHE_DIR}: {e}")
+
+def _read_spectrum_cache(
+    cache_path: Path,
+    cache_key: str,
+    peak_limit: int
+) -> Optional[Dict[str, np.ndarray]]:
+    """Load spektrum dari cache; None jika belum ada, rusak, basi, atau peak-nya kurang dari peak_limit"""
+    try:
+        with np.load(cache_path) as npz:
+            spectra = {key: npz[key] for key in npz.files}
+    except (OSError, ValueError):
+        return None
+    # Mode dB: spektrum display sama dengan spektrum dB, tidak disimpan dua kali
+    if 'n_samples' not in spectra or 'peak_limit' not in spectra:
+        return None
+    # File .bin atau setting FFT berubah: hitung ulang dan timpa entry yang sama
+    if 'cache_key' not in spectra or str(spectra['cache_key']) != cache_key:
+        return None
+    # Peak count di atas CACHED_PEAK_LIMIT: hitung ulang dan timpa entry yang sama
+    if int(spectra['peak_limit']) < peak_limit:
+        return None
+    spectra.setdefault('freqs', spectra['freqs_db'])
+    spectra.setdefault('mags', spectra['mags_db'])
+    return spectra
+
+def _write_spectrum_cache(cache_path: Path, spectra: Dict[str, np.ndarray]):
+    """Simpan spektrum ke cache; gagal tulis (mis. folder read-only) diabaikan"""
+    arrays = dict(spectra)
+    if arrays['mags'] is arrays['mags_db']:
+        del arrays['freqs'], arrays['mags']
+    try:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        tmp_path = cache_path.with_suffix(".tmp.npz")
+        np.savez(tmp_path, **arrays)
+        os.replace(tmp_path, cache_path)
+    except OSError as e:
+        print(f"  ⚠️  Cache write failed for {cache_path.name}: {e}")
+
+def _load_one_file(filepath: Path, peak_limit: int) -> Dict[str, Any]:
+    """Baca cache spektrum satu file di thread pool (.bin hanya saat cache miss); error dikembalikan, tidak di-raise"""
+    # Gunakan relative path dari SAMPLE_DIR sebagai identifier
+    filename = str(filepath.relative_to(SAMPLE_DIR)).replace("\\", "/")
+    record = {'filename': filename, 'ch1': None, 'ch2': None, 'n_samples': 0,
+              'cache_path': None, 'cache_key': None, 'spectra': None, 'error': None}
+    try:
+        record['cache_path'] = _spectrum_cache_path(filename)
+        record['cache_key'] = _spectrum_cache_key(filepath, filename)
+        record['spectra'] = _read_spectrum_cache(record['cache_path'], record['cache_key'], peak_limit)
+        if record['spectra'] is not None:
+            record['n_samples'] = int(record['spectra']['n_samples'])
+        else:
+            record['ch1'], record['ch2'], record['n_samples'], _ = load_and_process_data(
+                str(filepath), SAMPLE_RATE, mmap=True
+            )
+    except Exception as e:
+        record['error'] = e
+    return record
+
 class GroupAnalyzer:
     """Analyzer untuk membandingkan group sample data"""
     
@@ -73,25 +278,37 @@ class GroupAnalyzer:
             'ch2': True,
         }
         self.export_freq_range = (4000.0, 7000.0)
+        self._discover_cache = None  # (mtime per folder, groups) dari discover_groups
+        self._group_cache = {}  # {group_name: {n_freq: {'ch1': (n_files, n_freq) float32, 'ch2': ...}}}
     
     def discover_groups(self):
         """Discover semua group dari direktori sample (recursive)"""
-        groups = {}
-        
-        # Cari semua subfolder yang mengandung .bin files
-        for bin_file in SAMPLE_DIR.glob("**/*.bin"):
-            # Gunakan parent folder sebagai group name
-            group_dir = bin_file.parent
-            group_name = str(group_dir.relative_to(SAMPLE_DIR)).replace("\\", "/")
+        # Hasil scan dipakai ulang selama mtime semua folder tidak berubah
+        # (tambah/hapus/rename entry selalu mengubah mtime folder induknya);
+        # saat start, hasil scan proses sebelumnya dibaca dari DISCOVER_CACHE_FILE
+        if self._discover_cache is None:
+            self._discover_cache = _read_discover_cache()
+        if self._discover_cache is not None and _dir_mtimes_unchanged(self._discover_cache[0]):
+            groups = self._discover_cache[1]
+        else:
+            # Buat CACHE_DIR sebelum scan agar mtime SAMPLE_DIR yang tercatat tetap valid
+            try:
+                CACHE_DIR.mkdir(parents=True, exist_ok=True)
+            except OSError:
+                pass
+            groups: Dict[str, List[str]] = {}
+            dir_mtimes: Dict[str, int] = {}
+            _scan_sample_dir(str(SAMPLE_DIR), groups, dir_mtimes)
             
-            if group_name not in groups:
-                groups[group_name] = []
-            groups[group_name].append(bin_file)
+            # Sort files dalam setiap group
+            for files in groups.values():
+                files.sort()
+            self._discover_cache = (dir_mtimes, groups)
+            _write_discover_cache(dir_mtimes, groups)
+            _prune_spectrum_cache(groups)
         
-        # Sort files dalam setiap group
-        for group_name in groups:
-            groups[group_name] = sorted(groups[group_name])
-            print(f"📂 Found group: {group_name} ({len(groups[group_name])} files)")
+        for group_name, files in groups.items():
+            print(f"📂 Found group: {group_name} ({len(files)} files)")
         
         return groups
     
@@ -111,113 +328,214 @@ class GroupAnalyzer:
         
         print(f"📂 Loading group: {group_name}")
         self.groups[group_name] = {}
+        self._group_cache.pop(group_name, None)  # matriks load sebelumnya dilepas
+        
+        # Baca semua file (dan cache spektrum) paralel dulu (I/O melepas GIL);
+        # FFT hanya untuk file tanpa cache, sekaligus per panjang sample
+        peak_limit = self.export_peak_count
+        with ThreadPoolExecutor(max_workers=min(LOAD_WORKERS, len(bin_files))) as executor:
+            records = list(executor.map(functools.partial(_load_one_file, peak_limit=peak_limit), bin_files))
+        
+        uncached: Dict[int, List[Dict[str, Any]]] = {}
+        for record in records:
+            filename = record['filename']
+            if record['error'] is not None:
+                print(f"  ❌ Error loading {filename}: {record['error']}")
+                continue
+            
+            if record['spectra'] is not None:
+                self._store_file(group_name, record, record['spectra'], peak_limit, cached=True)
+            elif record['ch1'] is None:
+                print(f"  ⚠️  Failed to load {filename}")
+            else:
+                uncached.setdefault(record['n_samples'], []).append(record)
+        
+        use_linear_display = FFT_MAGNITUDE_MODE.lower() == "linear"
         
-        for filepath in bin_files:
-            # Gunakan relative path dari SAMPLE_DIR sebagai identifier
-            filename = str(filepath.relative_to(SAMPLE_DIR)).replace("\\", "/")
+        for n_samples, files in uncached.items():
+            # Stack channels as rows [f0 CH1, f0 CH2, f1 CH1, ...] for one batched rfft
+            signals = np.empty((2 * len(files), n_samples), dtype=np.float32)
+            for row, record in enumerate(files):
+                signals[2 * row] = record['ch1']
+                signals[2 * row + 1] = record['ch2']
+                # Sinyal mentah tidak disimpan; lepas memmap setelah disalin
+                record['ch1'] = record['ch2'] = None
             
             try:
-                # Load data
-                ch1, ch2, n_samples, sr = load_and_process_data(str(filepath), SAMPLE_RATE)
-                
-                if ch1 is None:
-                    print(f"  ⚠️  Failed to load {filename}")
-                    continue
-                
-                # Compute FFT (dB) for analysis/peaks
-                freqs_ch1_db, mag_ch1_db = compute_fft(
-                    ch1, SAMPLE_RATE,
-                    smooth=FFT_SMOOTHING_ENABLED,
-                    smooth_window=FFT_SMOOTHING_WINDOW
-                )
-                freqs_ch2_db, mag_ch2_db = compute_fft(
-                    ch2, SAMPLE_RATE,
-                    smooth=FFT_SMOOTHING_ENABLED,
-                    smooth_window=FFT_SMOOTHING_WINDOW
-                )
-
-                use_linear_display = FFT_MAGNITUDE_MODE.lower() == "linear"
-
-                display_freqs_ch1, display_mag_ch1 = freqs_ch1_db, mag_ch1_db
-                display_freqs_ch2, display_mag_ch2 = freqs_ch2_db, mag_ch2_db
-
+                # Compute FFT (dB) for analysis/peaks; linear display dari FFT yang sama
                 if use_linear_display:
-                    display_freqs_ch1, display_mag_ch1 = compute_fft_linear(ch1, SAMPLE_RATE)
-                    display_freqs_ch2, display_mag_ch2 = compute_fft_linear(ch2, SAMPLE_RATE)
-
-                # Find peaks
-                peak_limit = self.export_peak_count
-                ch1_peaks, _ = find_top_extrema(freqs_ch1_db, mag_ch1_db, n_extrema=peak_limit)
-                ch2_peaks, _ = find_top_extrema(freqs_ch2_db, mag_ch2_db, n_extrema=peak_limit)
-
-                # Store data
-                self.groups[group_name][filename] = {
-                    'ch1_data': ch1,
-                    'ch2_data': ch2,
-                    'freqs_ch1': display_freqs_ch1,
-                    'mag_ch1': display_mag_ch1,
-                    'freqs_ch2': display_freqs_ch2,
-                    'mag_ch2': display_mag_ch2,
-                    'freqs_ch1_db': freqs_ch1_db,
-                    'mag_ch1_db': mag_ch1_db,
-                    'freqs_ch2_db': freqs_ch2_db,
-                    'mag_ch2_db': mag_ch2_db,
-                    'ch1_peaks': ch1_peaks,
-                    'ch2_peaks': ch2_peaks,
-                    'n_samples': n_samples
-                }
-                
-                print(f"  ✅ {filename}: {n_samples} samples, {len(ch1_peaks)} CH1 peaks, {len(ch2_peaks)} CH2 peaks")
-            
+                    freqs_db, mags_db, display_mags = compute_fft_both_batch(
+                        signals, SAMPLE_RATE,
+                        smooth=FFT_SMOOTHING_ENABLED,
+                        smooth_window=FFT_SMOOTHING_WINDOW
+                    )
+                else:
+                    freqs_db, mags_db = compute_fft_batch(
+                        signals, SAMPLE_RATE,
+                        smooth=FFT_SMOOTHING_ENABLED,
+                        smooth_window=FFT_SMOOTHING_WINDOW
+                    )
+                    display_mags = mags_db
+                display_freqs = freqs_db
             except Exception as e:
-                print(f"  ❌ Error loading {filename}: {e}")
+                print(f"  ❌ Error computing FFT for {len(files)} files: {e}")
+                continue
+            
+            # Peak semua baris (2 per file) dalam satu panggilan kernel; cache
+            # menyimpan sampai CACHED_PEAK_LIMIT agar peak count tidak masuk key
+            cache_peak_limit = max(CACHED_PEAK_LIMIT, peak_limit)
+            all_peaks = _top_peaks_batch(freqs_db, mags_db, cache_peak_limit)
+            
+            for row, record in enumerate(files):
+                rows = slice(2 * row, 2 * row + 2)
+                try:
+                    # Find peaks
+                    spectra = {
+                        'freqs_db': freqs_db,
+                        'mags_db': mags_db[rows],
+                        'freqs': display_freqs,
+                        'mags': display_mags[rows],
+                        'ch1_peaks': all_peaks[2 * row],
+                        'ch2_peaks': all_peaks[2 * row + 1],
+                        'n_samples': np.int64(n_samples),
+                        'peak_limit': np.int64(cache_peak_limit),
+                        'cache_key': np.str_(record['cache_key']),
+                    }
+                    if display_mags is mags_db:
+                        spectra['mags'] = spectra['mags_db']
+                    self._store_file(group_name, record, spectra, peak_limit)
+                    _write_spectrum_cache(record['cache_path'], spectra)
+                
+                except Exception as e:
+                    print(f"  ❌ Error loading {record['filename']}: {e}")
         
         # Compute group statistics
         self._compute_group_stats(group_name)
         
         return True
     
+    def _store_file(
+        self,
+        group_name: str,
+        record: Dict[str, Any],
+        spectra: Dict[str, np.ndarray],
+        peak_limit: int,
+        cached: bool = False
+    ):
+        """Simpan data satu file ke group dari spektrum (hasil FFT atau cache)"""
+        filename, n_samples = record['filename'], record['n_samples']
+        ch1_peaks = spectra['ch1_peaks'][:peak_limit]
+        ch2_peaks = spectra['ch2_peaks'][:peak_limit]
+        
+        # Store data
+        self.groups[group_name][filename] = {
+            'freqs_ch1': spectra['freqs'],
+            'mag_ch1': spectra['mags'][0],
+            'freqs_ch2': spectra['freqs'],
+            'mag_ch2': spectra['mags'][1],
+            'freqs_ch1_db': spectra['freqs_db'],
+            'mag_ch1_db': spectra['mags_db'][0],
+            'freqs_ch2_db': spectra['freqs_db'],
+            'mag_ch2_db': spectra['mags_db'][1],
+            'ch1_peaks': ch1_peaks,
+            'ch2_peaks': ch2_peaks,
+            'n_samples': n_samples
+        }
+        
+        source = " (cached)" if cached else ""
+        print(f"  ✅ {filename}: {n_samples} samples, {len(ch1_peaks)} CH1 peaks, {len(ch2_peaks)} CH2 peaks{source}")
+    
     def _compute_group_stats(self, group_name: str):
         """Compute statistik untuk group"""
+        self._compute_magnitude_stats(group_name)
+        self._compute_peak_stats(group_name, self.export_peak_count)
+    
+    def _compute_magnitude_stats(self, group_name: str):
+        """Statistik magnitude & frekuensi peak; hanya berubah saat group di-load ulang"""
         if group_name not in self.groups or not self.groups[group_name]:
             return
         
         group_data = self.groups[group_name]
         
-        # Collect magnitudes dan peaks dari semua file
-        all_ch1_mags, all_ch2_mags = [], []
-        all_ch1_peaks, all_ch2_peaks = [], []
+        files = list(group_data.values())
         
-        for data in group_data.values():
-            all_ch1_mags.extend(data['mag_ch1'])
-            all_ch2_mags.extend(data['mag_ch2'])
-            all_ch1_peaks.extend(data['ch1_peaks'])
-            all_ch2_peaks.extend(data['ch2_peaks'])
+        # Spektrum ditumpuk per panjang spektrum jadi matriks float32
+        # (n_files, n_freq) per channel. Matriks ini satu-satunya penyimpan
+        # magnitude display: mag_ch1/mag_ch2 tiap file diganti view baris
+        # matriks, dan matriks dilepas saat group di-load ulang
+        stacked: Dict[int, Dict[str, np.ndarray]] = {}
+        by_length: Dict[int, List[Dict[str, Any]]] = {}
+        for data in files:
+            by_length.setdefault(data['mag_ch1'].size, []).append(data)
+        for n_freq, same_length in by_length.items():
+            stacked[n_freq] = {}
+            for ch in ('ch1', 'ch2'):
+                matrix = np.stack([data[f'mag_{ch}'] for data in same_length]).astype(np.float32, copy=False)
+                for row, data in enumerate(same_length):
+                    # Mode dB: spektrum display & dB adalah baris yang sama
+                    if np.may_share_memory(data[f'mag_{ch}'], data[f'mag_{ch}_db']):
+                        data[f'mag_{ch}_db'] = matrix[row]
+                    data[f'mag_{ch}'] = matrix[row]
+                stacked[n_freq][ch] = matrix
+        self._group_cache[group_name] = stacked
         
-        # Helper untuk compute channel stats
-        export_limit = max(1, self.export_peak_count)
-
-        def compute_channel_stats(mags, peaks):
-            peak_freqs = [p['freq_khz'] for p in peaks]
-            sorted_peaks = sorted(peaks, key=lambda p: p['mag_db'], reverse=True)
-            export_peaks = sorted_peaks[:export_limit]
-            ui_peaks = export_peaks[:5]
+        # Overlay memakai sumbu frekuensi file pertama
+        first = files[0]
+        
+        # Helper untuk compute channel stats: satu reduksi NumPy per matriks,
+        # momen antar panjang spektrum digabung ala Chan
+        def compute_channel_stats(ch):
+            n, mean, m2, mn, mx = 0, 0.0, 0.0, np.inf, -np.inf
+            for by_channel in stacked.values():
+                mags = by_channel[ch]
+                k = mags.size
+                if k == 0:
+                    continue
+                block_mean = float(mags.mean(dtype=np.float64))
+                block_m2 = float(mags.var(dtype=np.float64)) * k
+                delta = block_mean - mean
+                total = n + k
+                mean += delta * k / total
+                m2 += block_m2 + delta * delta * n * k / total
+                n = total
+                mn = min(mn, float(mags.min()))
+                mx = max(mx, float(mags.max()))
+            if n == 0:
+                mean = mn = mx = np.nan
+            # Peak semua file diurutkan sekali (mag desc, stabil) di sini, sehingga
+            # perubahan peak count cukup slice di _compute_peak_stats
+            peaks = np.concatenate([data[f'{ch}_peaks'] for data in files])
+            peak_freqs = peaks['freq_khz']
+            sorted_peaks = peaks[np.argsort(-peaks['mag_db'], kind='stable')]
+            # Rata-rata overlay dari file yang sepanjang sumbu frekuensi file pertama
             return {
-                'mean_mag': np.mean(mags),
-                'std_mag': np.std(mags),
-                'min_mag': np.min(mags),
-                'max_mag': np.max(mags),
-                'median_peak_freq': np.median(peak_freqs) if peak_freqs else 0,
-                'std_peak_freq': np.std(peak_freqs) if peak_freqs else 0,
-                'top_peaks': ui_peaks,
-                'export_peaks': export_peaks,
+                'mean_mag': mean,
+                'std_mag': math.sqrt(m2 / n) if n else np.nan,
+                'min_mag': mn,
+                'max_mag': mx,
+                'median_peak_freq': _fast_median(peak_freqs),
+                'std_peak_freq': _fast_std(peak_freqs),
+                'sorted_peaks': sorted_peaks,
+                'avg_freqs': first[f'freqs_{ch}'],
+                'avg_mag': stacked[first['mag_ch1'].size][ch].mean(axis=0),
             }
         
         self.group_stats[group_name] = {
-            'ch1': compute_channel_stats(all_ch1_mags, all_ch1_peaks),
-            'ch2': compute_channel_stats(all_ch2_mags, all_ch2_peaks),
-            'n_samples': len(group_data)
+            ch: compute_channel_stats(ch) for ch in ('ch1', 'ch2')
         }
+        self.group_stats[group_name]['n_samples'] = len(group_data)
+    
+    def _compute_peak_stats(self, group_name: str, limit: int):
+        """Top peaks untuk export dan UI: slice dari peak yang sudah diurutkan"""
+        stats = self.group_stats.get(group_name)
+        if not stats:
+            return
+        
+        export_limit = max(1, limit)
+        for ch in ('ch1', 'ch2'):
+            export_peaks = stats[ch]['sorted_peaks'][:export_limit]
+            stats[ch]['export_peaks'] = export_peaks
+            stats[ch]['top_peaks'] = export_peaks[:5]
 
     def export_selected_to_excel(self, filepath: Path):
         """Export statistik dan peak detail dari group terpilih ke Excel"""
@@ -225,8 +543,10 @@ class GroupAnalyzer:
             raise ValueError("Tidak ada group yang dipilih")
 
         stats_rows: List[Dict] = []
-        peak_columns: "OrderedDict[Tuple[str, str], Dict[str, List[str]]]" = OrderedDict()
+        # (group, channel, metric) -> string kolom; diisi ke satu matrix saat export
+        peak_columns: List[Tuple[Tuple[str, str, str], np.ndarray]] = []
         max_peak_rank = 0
+        chosen_metrics = [k for k in ('index', 'freq', 'mag') if self.export_peak_fields.get(k)]
 
         sorted_groups = sorted(self.selected_groups)
 
@@ -264,27 +584,24 @@ class GroupAnalyzer:
                 })
 
                 # Format peak data untuk export matrix (sesuai contoh)
-                peaks = ch_stats.get('export_peaks') or ch_stats.get('top_peaks', [])
+                peaks = ch_stats.get('export_peaks')
+                if peaks is None:
+                    peaks = ch_stats.get('top_peaks', np.empty(0, dtype=PEAK_DTYPE))
                 freq_min, freq_max = self.export_freq_range
-                peaks = [p for p in peaks if freq_min <= (p.get('freq_khz') or 0) <= freq_max]
+                peak_freqs = peaks['freq_khz']
+                peaks = peaks[(peak_freqs >= freq_min) & (peak_freqs <= freq_max)]
                 peaks = peaks[:self.export_peak_count]
                 max_peak_rank = max(max_peak_rank, len(peaks))
 
-                column_key = (group_name, ch_label)
-                chosen_metrics = [k for k, v in self.export_peak_fields.items() if v]
-                column_data = {metric: [] for metric in chosen_metrics}
-
-                for peak in peaks:
-                    if 'index' in column_data:
-                        column_data['index'].append(str(peak.get('index', '-')))
-                    if 'freq' in column_data:
-                        freq = peak.get('freq_khz')
-                        column_data['freq'].append(f"{freq:.2f}" if freq is not None else "-")
-                    if 'mag' in column_data:
-                        mag = peak.get('mag_db')
-                        column_data['mag'].append(f"{mag:.2f}" if mag is not None else "-")
-
-                peak_columns[column_key] = column_data
+                # Format satu kolom sekaligus di NumPy, bukan per peak
+                for metric in chosen_metrics:
+                    if metric == 'index':
+                        values = peaks['index'].astype(str)
+                    elif metric == 'freq':
+                        values = np.char.mod("%.2f", peaks['freq_khz'])
+                    else:
+                        values = np.char.mod("%.2f", peaks['mag_db'])
+                    peak_columns.append(((group_name, ch_label, metric), values))
 
         if not stats_rows:
             raise ValueError("Data statistik tidak tersedia untuk group terpilih")
@@ -294,39 +611,40 @@ class GroupAnalyzer:
         with pd.ExcelWriter(filepath, engine='xlsxwriter') as writer:
             pd.DataFrame(stats_rows).to_excel(writer, sheet_name="Group Statistics", index=False)
 
-            chosen_metrics = [k for k, v in self.export_peak_fields.items() if v]
-            if max_peak_rank > 0 and peak_columns and chosen_metrics:
-                # Pastikan semua kolom memiliki panjang yang sama dengan max_peak_rank
-                peak_matrix = OrderedDict()
-                peak_column_order: List[Tuple[str, str, str]] = []
-                for column_key, value_dict in peak_columns.items():
-                    for sub_key in ['index', 'freq', 'mag']:
-                        if sub_key not in chosen_metrics:
-                            continue
-                        values = value_dict.get(sub_key, [])
-                        if len(values) < max_peak_rank:
-                            values = values + [""] * (max_peak_rank - len(values))
-                        key = (column_key[0], column_key[1], sub_key)
-                        peak_matrix[key] = values
-                        peak_column_order.append(key)
-
-                peak_df = pd.DataFrame(peak_matrix, index=range(1, max_peak_rank + 1))
-                peak_df.index.name = "Peak Rank"
-                peak_df.columns = pd.MultiIndex.from_tuples(peak_df.columns, names=["Group", "Channel", "Metric"])
+            if max_peak_rank > 0 and peak_columns:
+                # Satu matrix (rank x kolom); kolom yang lebih pendek tetap "" di bawah
+                peak_column_order = [key for key, _ in peak_columns]
+                peak_matrix = np.full((max_peak_rank, len(peak_columns)), "", dtype=object)
+                for col_idx, (_, values) in enumerate(peak_columns):
+                    peak_matrix[:values.size, col_idx] = values
+
+                peak_df = pd.DataFrame(
+                    peak_matrix,
+                    index=pd.RangeIndex(1, max_peak_rank + 1, name="Peak Rank"),
+                    columns=pd.MultiIndex.from_tuples(peak_column_order, names=["Group", "Channel", "Metric"]),
+                )
                 peak_df.to_excel(writer, sheet_name="Peak Details")
 
                 workbook = writer.book
                 worksheet = writer.sheets["Peak Details"]
 
+                # Format xlsxwriter tidak di-dedup otomatis: satu Format per style unik
+                format_cache: Dict[frozenset, Any] = {}
+
+                def get_format(**spec):
+                    key = frozenset(spec.items())
+                    fmt = format_cache.get(key)
+                    if fmt is None:
+                        fmt = format_cache[key] = workbook.add_format(spec)
+                    return fmt
+
+                def header_format(color: Tuple[int, int, int]):
+                    return get_format(bold=True, bg_color=_rgb_to_hex(color),
+                                      align='center', valign='vcenter', border=1)
+
                 # Formats untuk header dan data
-                index_header_fmt = workbook.add_format({
-                    'bold': True,
-                    'bg_color': '#303030',
-                    'align': 'center',
-                    'valign': 'vcenter',
-                    'border': 1
-                })
-                data_fmt = workbook.add_format({'align': 'center'})
+                index_header_fmt = header_format((0x30, 0x30, 0x30))
+                data_fmt = get_format(align='center')
 
                 worksheet.write(0, 0, "", index_header_fmt)
                 worksheet.write(1, 0, "", index_header_fmt)
@@ -348,39 +666,21 @@ class GroupAnalyzer:
                     base_color = export_colors.get(group, (200, 200, 200))
 
                     if group not in group_header_formats:
-                        group_header_formats[group] = workbook.add_format({
-                            'bold': True,
-                            'bg_color': _rgb_to_hex(base_color),
-                            'align': 'center',
-                            'valign': 'vcenter',
-                            'border': 1
-                        })
+                        group_header_formats[group] = header_format(base_color)
 
                     style_factors = channel_style_factors.get(channel, channel_style_factors['CH1'])
 
                     if (group, channel) not in channel_header_formats:
-                        channel_color = _lighten_color(base_color, style_factors['channel'])
-                        channel_header_formats[(group, channel)] = workbook.add_format({
-                            'bold': True,
-                            'bg_color': _rgb_to_hex(channel_color),
-                            'align': 'center',
-                            'valign': 'vcenter',
-                            'border': 1
-                        })
-                        metric_color = _lighten_color(base_color, style_factors['metric'])
-                        metric_header_formats[(group, channel)] = workbook.add_format({
-                            'bold': True,
-                            'bg_color': _rgb_to_hex(metric_color),
-                            'align': 'center',
-                            'valign': 'vcenter',
-                            'border': 1
-                        })
+                        channel_header_formats[(group, channel)] = header_format(
+                            _lighten_color(base_color, style_factors['channel'])
+                        )
+                        metric_header_formats[(group, channel)] = header_format(
+                            _lighten_color(base_color, style_factors['metric'])
+                        )
                         data_color = _lighten_color(base_color, style_factors['data'])
-                        channel_data_formats[(group, channel)] = workbook.add_format({
-                            'align': 'center',
-                            'bg_color': _rgb_to_hex(data_color),
-                            'border': 1
-                        })
+                        channel_data_formats[(group, channel)] = get_format(
+                            align='center', bg_color=_rgb_to_hex(data_color), border=1
+                        )
 
                     worksheet.write(0, excel_col, group, group_header_formats[group])
                     worksheet.write(1, excel_col, channel, channel_header_formats[(group, channel)])
@@ -409,6 +709,16 @@ def _lighten_color(color: Tuple[int, int, int], factor: float) -> Tuple[int, int
     """Lighten warna dengan faktor 0..1"""
     return tuple(min(255, int(c + (255 - c) * factor)) for c in color)
 
+# Tag checkbox DPG per group (CRC32 cukup untuk identifier, bukan keamanan)
+_group_tag_cache: Dict[str, str] = {}
+
+def _group_checkbox_tag(group_name: str) -> str:
+    """Tag checkbox group, dihitung sekali per nama group"""
+    tag = _group_tag_cache.get(group_name)
+    if tag is None:
+        tag = _group_tag_cache[group_name] = f"group_chk_{zlib.crc32(group_name.encode()):08x}"
+    return tag
+
 def get_group_color(group_name: str, color_idx: int = None) -> Tuple[int, int, int]:
     """Get warna untuk group dengan caching untuk konsistensi"""
     if group_name in _group_color_cache:
@@ -421,12 +731,58 @@ def get_group_color(group_name: str, color_idx: int = None) -> Tuple[int, int, i
         # Gunakan SAMPLE_COLORS dengan index
         if color_idx is None:
             color_idx = len(_group_color_cache) % len(SAMPLE_COLORS)
-        color = SAMPLE_COLORS[color_idx]
+        color = SAMPLE_COLORS[color_idx % len(SAMPLE_COLORS)]
     
     _group_color_cache[group_name] = color
     return color
 
+# Di-set oleh setiap callback UI; render loop tidur selama flag ini tidak di-set
+_ui_dirty = threading.Event()
+
+def _marks_ui_dirty(func):
+    """Decorator callback DPG: set _ui_dirty setelah body dijalankan.
+    
+    Signature wrapper tetap (sender, app_data, user_data) karena DPG memilih
+    jumlah argumen dari co_argcount callback.
+    """
+    n_args = func.__code__.co_argcount
+    
+    @functools.wraps(func)
+    def wrapper(sender=None, app_data=None, user_data=None):
+        try:
+            return func(*(sender, app_data, user_data)[:n_args])
+        finally:
+            _ui_dirty.set()
+    return wrapper
+
+def _debounce(delay_s: float):
+    """Decorator trailing-edge debounce: hanya panggilan terakhir dalam delay_s yang
+    dijalankan (di thread Timer), lalu set _ui_dirty.
+    """
+    def decorator(func):
+        lock = threading.Lock()
+        pending: List[threading.Timer] = []
+        
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            def fire():
+                try:
+                    func(*args, **kwargs)
+                finally:
+                    _ui_dirty.set()
+            
+            timer = threading.Timer(delay_s, fire)
+            timer.daemon = True
+            with lock:
+                if pending:
+                    pending.pop().cancel()
+                pending.append(timer)
+            timer.start()
+        return wrapper
+    return decorator
+
 # Callbacks
+@_marks_ui_dirty
 def toggle_group_callback(sender, app_data, user_data):
     """Callback untuk toggle group button"""
     group_name = user_data
@@ -443,122 +799,241 @@ def toggle_group_callback(sender, app_data, user_data):
 
 def update_all_visualizations():
     """Update semua visualisasi dengan warna konsisten"""
-    # Clear semua elemen
-    for axis in ["ch1_overlay_yaxis", "ch2_overlay_yaxis"]:
-        clear_plot_series(axis)
+    # Clear tabel; axis & series plot tetap, hanya datanya yang diganti
     for table in ["stats_table", "peak_detail_table"]:
         clear_table(table)
     
     if not analyzer.selected_groups:
+        _hide_unused_series(0)
         return
     
     # Clear color cache untuk reset
     _group_color_cache.clear()
     
+    # (group, warna, stats) dikumpulkan sekali untuk tabel, urut nama group
+    render_list: List[Tuple[str, Tuple[int, int, int], Dict[str, Any]]] = []
+    
     # Plot overlay untuk setiap group dengan color index tracking
     for color_idx, group_name in enumerate(sorted(analyzer.selected_groups)):
         if group_name not in analyzer.groups:
             continue
         
-        group_data = analyzer.groups[group_name]
         # Gunakan get_group_color dengan color_idx untuk konsistensi
         group_color = get_group_color(group_name, color_idx)
-        
-        # Collect magnitudes dan frequencies
-        mags_ch1, mags_ch2 = [], []
-        freqs_ch1 = freqs_ch2 = None
-        
-        for data in group_data.values():
-            mags_ch1.append(data['mag_ch1'])
-            mags_ch2.append(data['mag_ch2'])
-            if freqs_ch1 is None:
-                freqs_ch1, freqs_ch2 = data['freqs_ch1'], data['freqs_ch2']
-        
-        # Plot average magnitudes dengan warna yang di-cache
-        _plot_channel_series(freqs_ch1, np.mean(mags_ch1, axis=0), group_name, 
-                            "ch1_overlay_yaxis", group_color)
-        _plot_channel_series(freqs_ch2, np.mean(mags_ch2, axis=0), group_name, 
-                            "ch2_overlay_yaxis", group_color)
+        stats = analyzer.group_stats.get(group_name)
+        if not stats:
+            continue
+        render_list.append((group_name, group_color, stats))
+    
+    # Group dengan warna sama digabung jadi satu series (segmen dipisah NaN),
+    # jadi jumlah series = jumlah warna, bukan jumlah group
+    groups_by_color: Dict[Tuple[int, int, int], List[Tuple[str, Dict[str, Any]]]] = {}
+    for group_name, group_color, stats in render_list:
+        groups_by_color.setdefault(group_color, []).append((group_name, stats))
+    
+    # Plot average magnitudes (precomputed saat load) ke slot series yang sudah ada
+    _ensure_series_slots(len(groups_by_color))
+    for slot, (group_color, members) in enumerate(groups_by_color.items()):
+        label = ", ".join(group_name for group_name, _ in members)
+        for ch in ('ch1', 'ch2'):
+            freqs = _join_segments([stats[ch]['avg_freqs'] for _, stats in members])
+            mags = _join_segments([stats[ch]['avg_mag'] for _, stats in members])
+            _set_channel_series(slot, ch, freqs, mags, label, group_color)
+    _hide_unused_series(len(groups_by_color))
     
     # Auto-fit axes
     for axis in ["ch1_overlay_xaxis", "ch1_overlay_yaxis", "ch2_overlay_xaxis", "ch2_overlay_yaxis"]:
         dpg.fit_axis_data(axis)
     
     # Update tables dengan warna yang sudah di-cache
-    update_stats_table()
-    update_peak_detail_table()
-
-def _plot_channel_series(freqs, mags, label, parent_axis, color):
-    """Helper untuk plot series dengan theme"""
-    series = dpg.add_line_series(freqs, mags, label=f"{label} (avg)", parent=parent_axis)
-    dpg.bind_item_theme(series, create_line_theme(color))
-
-def clear_plot_series(axis_tag):
-    """Clear all series dari axis"""
-    children = dpg.get_item_children(axis_tag, slot=1)
-    if children:
-        for child in children:
-            dpg.delete_item(child)
+    update_stats_table(render_list)
+    update_peak_detail_table(render_list)
+
+# Line series overlay dibuat sekali per slot (ch1_series_i / ch2_series_i); update
+# hanya set_value + configure, tanpa delete/create widget
+_series_slot_count = 0
+_line_theme_cache: Dict[Tuple[int, int, int], int] = {}
+
+_NAN_BREAK = np.array([np.nan], dtype=np.float32)
+
+def _join_segments(arrays: List[np.ndarray]) -> np.ndarray:
+    """Gabung array jadi satu dengan NaN di antaranya (ImPlot memutus garis di NaN)"""
+    if len(arrays) == 1:
+        return arrays[0]
+    parts = []
+    for arr in arrays:
+        parts.extend((arr, _NAN_BREAK))
+    return np.concatenate(parts[:-1])
+
+def _series_tag(channel: str, slot: int) -> str:
+    return f"{channel}_series_{slot}"
+
+def _ensure_series_slots(count: int):
+    """Pastikan minimal count slot series (kosong, hidden) ada di kedua plot overlay"""
+    global _series_slot_count
+    for slot in range(_series_slot_count, count):
+        for ch in ('ch1', 'ch2'):
+            dpg.add_line_series([], [], parent=f"{ch}_overlay_yaxis", tag=_series_tag(ch, slot), show=False)
+    _series_slot_count = max(_series_slot_count, count)
+
+def _set_channel_series(slot, channel, freqs, mags, label, color):
+    """Isi satu slot series dengan data, label, dan theme warna group"""
+    tag = _series_tag(channel, slot)
+    dpg.set_value(tag, [freqs, mags])
+    dpg.configure_item(tag, label=f"{label} (avg)", show=True)
+    dpg.bind_item_theme(tag, create_line_theme(color))
+
+def _hide_unused_series(used: int):
+    """Sembunyikan (dan kosongkan) slot series mulai dari index used"""
+    for slot in range(used, _series_slot_count):
+        for ch in ('ch1', 'ch2'):
+            tag = _series_tag(ch, slot)
+            dpg.set_value(tag, [[], []])
+            dpg.configure_item(tag, show=False)
+
+# Row tabel kanan disimpan di sini; hanya jendela yang terlihat yang di-submit ke DPG
+# {table_tag: [(warna, label kolom pertama, cells)]}
+_table_rows: Dict[str, List[Tuple[Tuple[int, int, int], str, Tuple[str, ...]]]] = {}
+_table_windows: Dict[str, Tuple[int, int]] = {}  # {table_tag: (first, last)} terakhir di-render
 
 def clear_table(table_tag):
-    """Clear rows dari table"""
+    """Clear rows dari table (satu panggilan DPG, kolom di slot 0 tetap)"""
+    _table_rows.pop(table_tag, None)
+    _table_windows.pop(table_tag, None)
     if dpg.does_item_exist(table_tag):
-        children = dpg.get_item_children(table_tag, slot=1)
-        if children:
-            for child in children:
-                dpg.delete_item(child)
+        dpg.delete_item(table_tag, children_only=True, slot=1)
+
+def _add_spacer_row(table_tag: str, n_rows: int):
+    """Satu row kosong setinggi n_rows row (pengganti row di luar jendela)"""
+    if n_rows <= 0:
+        return
+    with dpg.table_row(parent=table_tag):
+        dpg.add_spacer(height=n_rows * TABLE_ROW_HEIGHT - 2 * TABLE_CELL_PADDING[1] - 1)
 
-def update_stats_table():
-    """Update tabel statistik group dengan warna dari cache"""
+def _render_table_window(table_tag: str, force: bool = False):
+    """Submit hanya row yang terlihat dari posisi scroll (clipper ala ImGuiListClipper)"""
+    rows = _table_rows.get(table_tag)
+    if rows is None or not dpg.does_item_exist(table_tag):
+        return
+    
+    visible = TABLE_HEIGHT // TABLE_ROW_HEIGHT + 2
+    first = int(dpg.get_y_scroll(table_tag)) // TABLE_ROW_HEIGHT
+    first = max(0, min(first, len(rows) - visible))
+    last = min(first + visible, len(rows))
+    if not force and _table_windows.get(table_tag) == (first, last):
+        return
+    _table_windows[table_tag] = (first, last)
+    
+    # Semua row ditambahkan di bawah satu mutex agar layout DPG di-batch
+    with dpg.mutex():
+        dpg.delete_item(table_tag, children_only=True, slot=1)
+        _add_spacer_row(table_tag, first)
+        for color, label, cells in rows[first:last]:
+            with dpg.table_row(parent=table_tag):
+                dpg.add_text(label, color=color)
+                for cell in cells:
+                    dpg.add_text(cell)
+        _add_spacer_row(table_tag, len(rows) - last)
+
+def refresh_visible_table_rows():
+    """Dipanggil tiap frame: render ulang tabel hanya jika jendela row berubah karena scroll"""
+    for table_tag in list(_table_rows):
+        _render_table_window(table_tag)
+
+def update_stats_table(render_list):
+    """Update tabel statistik group; render_list = [(group, warna plot, stats)]"""
     if not dpg.does_item_exist("stats_table"):
         return
     
-    for group_name in sorted(analyzer.selected_groups):
-        if group_name not in analyzer.group_stats:
-            continue
-        
-        stats = analyzer.group_stats[group_name]
-        # Gunakan cached color untuk konsistensi dengan plot
-        group_color = _group_color_cache.get(group_name, (200, 200, 200))
-        
+    rows = []
+    for group_name, group_color, stats in render_list:
+        n_samples = str(stats['n_samples'])
         # Add rows untuk CH1 dan CH2
         for ch, label in [('ch1', 'CH1'), ('ch2', 'CH2')]:
-            with dpg.table_row(parent="stats_table"):
-                dpg.add_text(f"{group_name} - {label}", color=group_color)
-                dpg.add_text(f"{stats[ch]['mean_mag']:.2f}")
-                dpg.add_text(f"{stats[ch]['std_mag']:.2f}")
-                dpg.add_text(f"{stats[ch]['median_peak_freq']:.2f}")
-                dpg.add_text(f"{stats['n_samples']}")
-
-def update_peak_detail_table():
-    """Update tabel detail peak dengan index dan warna konsisten"""
+            ch_stats = stats[ch]
+            cells = (
+                f"{ch_stats['mean_mag']:.2f}",
+                f"{ch_stats['std_mag']:.2f}",
+                f"{ch_stats['median_peak_freq']:.2f}",
+                n_samples,
+            )
+            rows.append((group_color, f"{group_name} - {label}", cells))
+    _table_rows["stats_table"] = rows
+    _render_table_window("stats_table", force=True)
+
+def update_peak_detail_table(render_list):
+    """Update tabel detail peak; render_list = [(group, warna plot, stats)]"""
     if not dpg.does_item_exist("peak_detail_table"):
         return
     
-    for group_name in sorted(analyzer.selected_groups):
-        stats = analyzer.group_stats.get(group_name)
-        if not stats:
-            continue
-        
-        # Gunakan cached color untuk konsistensi dengan plot
-        group_color = _group_color_cache.get(group_name, (200, 200, 200))
+    rows = []
+    for group_name, group_color, stats in render_list:
         for ch, label in [('ch1', 'CH1'), ('ch2', 'CH2')]:
-            for idx, peak in enumerate(stats[ch].get('top_peaks', []), start=1):
-                with dpg.table_row(parent="peak_detail_table"):
-                    dpg.add_text(group_name, color=group_color)
-                    dpg.add_text(label)
-                    dpg.add_text(f"#{idx}")
-                    dpg.add_text(str(peak.get('index', '-')))
-                    dpg.add_text(f"{peak.get('freq_khz', 0):.2f}")
-                    dpg.add_text(f"{peak.get('mag_db', 0):.2f}")
+            top_peaks = stats[ch].get('top_peaks', np.empty(0, dtype=PEAK_DTYPE))
+            for idx, (index, freq, mag) in enumerate(top_peaks.tolist(), start=1):
+                cells = (label, f"#{idx}", str(index), f"{freq:.2f}", f"{mag:.2f}")
+                rows.append((group_color, group_name, cells))
+    _table_rows["peak_detail_table"] = rows
+    _render_table_window("peak_detail_table", force=True)
+
+# Warna/style theme global (konstan), dipasang ke satu theme oleh _build_theme
+_GLOBAL_THEME_COLORS = (
+    (dpg.mvThemeCol_WindowBg, (15, 15, 15)),
+    (dpg.mvThemeCol_FrameBg, (30, 30, 30)),
+    (dpg.mvThemeCol_Button, (50, 50, 70)),
+    (dpg.mvThemeCol_ButtonHovered, (70, 70, 100)),
+    (dpg.mvThemeCol_ButtonActive, (80, 120, 180)),
+)
+_GLOBAL_THEME_STYLES = (
+    (dpg.mvStyleVar_FrameRounding, (5,)),
+    (dpg.mvStyleVar_WindowPadding, (10, 10)),
+    (dpg.mvStyleVar_ItemSpacing, (5, 5)),
+)
+
+@functools.lru_cache(maxsize=None)
+def _build_theme():
+    """Theme global panel (dibuat sekali per context DPG)"""
+    with dpg.theme() as theme_id:
+        with dpg.theme_component(dpg.mvAll):
+            for target, color in _GLOBAL_THEME_COLORS:
+                dpg.add_theme_color(target, color)
+            for target, values in _GLOBAL_THEME_STYLES:
+                dpg.add_theme_style(target, *values)
+    return theme_id
+
+@functools.lru_cache(maxsize=None)
+def _build_table_theme():
+    """Cell padding tetap untuk tabel virtual agar TABLE_ROW_HEIGHT akurat"""
+    with dpg.theme() as theme_id:
+        with dpg.theme_component(dpg.mvTable):
+            dpg.add_theme_style(dpg.mvStyleVar_CellPadding, *TABLE_CELL_PADDING)
+    return theme_id
+
+def _reset_ui_caches():
+    """Lupakan id item DPG yang di-cache; hanya valid dalam context tempat dibuat"""
+    global _series_slot_count, _tree_group_names
+    _build_theme.cache_clear()
+    _build_table_theme.cache_clear()
+    _line_theme_cache.clear()
+    _series_slot_count = 0
+    _tree_group_names = None
+    _tree_dir_nodes.clear()
+    _tree_visible.clear()
+    _table_rows.clear()
+    _table_windows.clear()
 
 def create_line_theme(color):
-    """Create theme untuk line series"""
+    """Create theme untuk line series (sekali per warna, lalu dipakai ulang)"""
+    theme_id = _line_theme_cache.get(color)
+    if theme_id is not None:
+        return theme_id
     with dpg.theme() as theme_id:
         with dpg.theme_component(dpg.mvLineSeries):
             dpg.add_theme_color(dpg.mvPlotCol_Line, color, category=dpg.mvThemeCat_Plots)
+    _line_theme_cache[color] = theme_id
     return theme_id
 
+@_marks_ui_dirty
 def clear_all_callback():
     """Clear semua selected groups"""
     analyzer.selected_groups.clear()
@@ -566,7 +1041,7 @@ def clear_all_callback():
     analyzer.suppress_group_checkbox = True
     try:
         for rel_path in analyzer.groups.keys():
-            tag = f"group_chk_{hashlib.md5(rel_path.encode()).hexdigest()}"
+            tag = _group_checkbox_tag(rel_path)
             if dpg.does_item_exist(tag):
                 dpg.set_value(tag, False)
     finally:
@@ -574,6 +1049,7 @@ def clear_all_callback():
     
     update_all_visualizations()
 
+@_marks_ui_dirty
 def export_to_excel_callback():
     """Export data statistik dan peak ke file Excel"""
     timestamp = datetime.now().strftime("%Y%m%d-%H%M%S")
@@ -586,6 +1062,7 @@ def export_to_excel_callback():
     except Exception as exc:
         dpg.set_value("export_status_text", f"❌ Export failed: {exc}")
 
+@_marks_ui_dirty
 def toggle_export_metric_callback(sender, app_data, user_data):
     """Toggle metric yang diexport untuk peak details"""
     analyzer.export_peak_fields[user_data] = bool(app_data)
@@ -595,6 +1072,7 @@ def toggle_export_metric_callback(sender, app_data, user_data):
     else:
         dpg.set_value("export_status_text", "")
 
+@_marks_ui_dirty
 def toggle_export_channel_callback(sender, app_data, user_data):
     """Toggle channel yang diikutkan pada ekspor"""
     analyzer.export_channels[user_data] = bool(app_data)
@@ -604,41 +1082,63 @@ def toggle_export_channel_callback(sender, app_data, user_data):
     else:
         dpg.set_value("export_status_text", "")
 
-def update_export_freq_range_callback(sender, app_data, user_data):
-    """Update rentang frekuensi untuk filter peak eksport"""
-    current_min, current_max = analyzer.export_freq_range
-    try:
-        value = float(app_data)
-    except (TypeError, ValueError):
-        value = current_min if user_data == "min" else current_max
-
-    if user_data == "min":
-        new_min, new_max = value, current_max
-    else:
-        new_min, new_max = current_min, value
+def _apply_export_freq_range(app_data, user_data):
+    """Terapkan nilai input Min/Max ke rentang frekuensi peak eksport"""
+    # Debouncer Min dan Max bisa jalan bersamaan di thread Timer berbeda
+    with dpg.mutex():
+        current_min, current_max = analyzer.export_freq_range
+        try:
+            value = float(app_data)
+        except (TypeError, ValueError):
+            value = current_min if user_data == "min" else current_max
+
+        if user_data == "min":
+            new_min, new_max = value, current_max
+        else:
+            new_min, new_max = current_min, value
 
-    if new_min > new_max:
-        new_min, new_max = new_max, new_min
+        if new_min > new_max:
+            new_min, new_max = new_max, new_min
 
-    analyzer.export_freq_range = (new_min, new_max)
+        analyzer.export_freq_range = (new_min, new_max)
     dpg.set_value("export_status_text", f"ℹ️ Peak diekspor untuk frekuensi {new_min:.0f}-{new_max:.0f} kHz.")
 
-def update_export_peak_count_callback(sender, app_data):
-    """Update jumlah peak yang akan diexport"""
+# Satu debouncer per input, agar nilai Min tidak tertimpa ketikan di Max
+_export_freq_range_appliers = {
+    field: _debounce(EXPORT_INPUT_DEBOUNCE_S)(_apply_export_freq_range) for field in ("min", "max")
+}
+
+@_marks_ui_dirty
+def update_export_freq_range_callback(sender, app_data, user_data):
+    """Update rentang frekuensi untuk filter peak eksport (diterapkan setelah ketikan berhenti)"""
+    dpg.set_value("export_status_text", "⏳ Menghitung ulang...")
+    _export_freq_range_appliers[user_data](app_data, user_data)
+
+@_debounce(EXPORT_INPUT_DEBOUNCE_S)
+def _apply_export_peak_count(app_data):
+    """Terapkan peak count: slice ulang peak semua group lalu refresh UI"""
     try:
         value = int(app_data)
     except (TypeError, ValueError):
         value = analyzer.export_peak_count
     if value <= 0:
         value = 100
-    analyzer.export_peak_count = value
-    # Recompute stats untuk group yang sudah dimuat agar list export_peaks tersinkron
-    for group_name in list(analyzer.groups.keys()):
-        if analyzer.groups[group_name]:
-            analyzer._compute_group_stats(group_name)
-    update_all_visualizations()
+    # Berjalan di thread Timer: tahan frame DPG selama state & tabel di-update
+    with dpg.mutex():
+        analyzer.export_peak_count = value
+        # Slice ulang export_peaks untuk group yang sudah dimuat; magnitude stats tetap
+        for group_name in list(analyzer.groups.keys()):
+            if analyzer.groups[group_name]:
+                analyzer._compute_peak_stats(group_name, value)
+        update_all_visualizations()
     dpg.set_value("export_status_text", f"ℹ️ Peak export count diset ke {value}. Reload group jika ingin data > {value}.")
 
+@_marks_ui_dirty
+def update_export_peak_count_callback(sender, app_data):
+    """Update jumlah peak yang akan diexport (diterapkan setelah ketikan berhenti)"""
+    dpg.set_value("export_status_text", "⏳ Menghitung ulang...")
+    _apply_export_peak_count(app_data)
+
 def update_layout_split():
     """Update layout split ratio berdasarkan slider value"""
     viewport_width = dpg.get_viewport_client_width()
@@ -652,6 +1152,7 @@ def update_layout_split():
         dpg.configure_item("right_column", width=right_width, height=-1)
 
 
+@_marks_ui_dirty
 def viewport_resize_callback(sender, app_data):
     update_layout_split()
 
@@ -670,7 +1171,13 @@ def _build_group_tree(filter_text: str):
             leaf_list.append(group_name)
     return tree
 
-def _render_group_tree(tree, parent, depth=0):
+# Widget tree dibuat sekali untuk semua group; filter hanya show/hide item yang
+# berubah (selisih himpunan), tanpa delete/create widget
+_tree_dir_nodes: Dict[str, int] = {}  # {path folder: id tree node}
+_tree_group_names: Optional[Tuple[str, ...]] = None  # group saat widget dibuat
+_tree_visible: set = set()  # tag checkbox + tree node yang sedang tampil
+
+def _render_group_tree(tree, parent, depth=0, prefix=""):
     directories = sorted(k for k in tree.keys() if k != "__groups__")
     for directory in directories:
         node_id = dpg.add_tree_node(
@@ -678,10 +1185,11 @@ def _render_group_tree(tree, parent, depth=0):
             parent=parent,
             default_open=(depth == 0)
         )
-        _render_group_tree(tree[directory], node_id, depth + 1)
+        _tree_dir_nodes[prefix + directory] = node_id
+        _render_group_tree(tree[directory], node_id, depth + 1, f"{prefix}{directory}/")
     leaf_groups = sorted(tree.get("__groups__", []))
     for group_name in leaf_groups:
-        tag = f"group_chk_{hashlib.md5(group_name.encode()).hexdigest()}"
+        tag = _group_checkbox_tag(group_name)
         checkbox_id = dpg.add_checkbox(
             label=group_name.split("/")[-1],
             parent=parent,
@@ -693,26 +1201,58 @@ def _render_group_tree(tree, parent, depth=0):
         with dpg.tooltip(checkbox_id):
             dpg.add_text(group_name)
 
+def _visible_tree_items(filter_text: str) -> set:
+    """Tag checkbox group yang lolos filter beserta tree node semua folder induknya"""
+    normalized_filter = filter_text.lower()
+    visible = set()
+    for group_name in analyzer.groups.keys():
+        if normalized_filter and normalized_filter not in group_name.lower():
+            continue
+        visible.add(_group_checkbox_tag(group_name))
+        parts = group_name.split("/")
+        for depth in range(1, len(parts)):
+            visible.add(_tree_dir_nodes["/".join(parts[:depth])])
+    return visible
+
 def update_group_tree_ui():
+    global _tree_group_names, _tree_visible
     if not dpg.does_item_exist("group_tree_container"):
         return
-    dpg.delete_item("group_tree_container", children_only=True)
-    tree = _build_group_tree(analyzer.group_filter)
-    if not tree:
-        dpg.add_text("No groups found", parent="group_tree_container", color=(200, 100, 100))
-        return
-    _render_group_tree(tree, "group_tree_container")
+    
+    with dpg.mutex():
+        group_names = tuple(analyzer.groups.keys())
+        if group_names != _tree_group_names:
+            # Daftar group berubah: bangun ulang widget untuk semua group (tanpa filter)
+            dpg.delete_item("group_tree_container", children_only=True)
+            _tree_dir_nodes.clear()
+            _render_group_tree(_build_group_tree(""), "group_tree_container")
+            dpg.add_text("No groups found", parent="group_tree_container", color=(200, 100, 100),
+                         tag="group_tree_empty_text", show=not group_names)
+            _tree_group_names = group_names
+            _tree_visible = _visible_tree_items("")
+        
+        visible = _visible_tree_items(analyzer.group_filter)
+        for tag in visible ^ _tree_visible:
+            dpg.configure_item(tag, show=tag in visible)
+        dpg.configure_item("group_tree_empty_text", show=not visible)
+        _tree_visible = visible
+
+_update_group_tree_debounced = _debounce(GROUP_SEARCH_DEBOUNCE_S)(update_group_tree_ui)
 
+@_marks_ui_dirty
 def group_search_callback(sender, app_data, user_data):
     analyzer.group_filter = app_data.strip()
-    update_group_tree_ui()
+    # Ketikan beruntun digabung; tree di-update sekali setelah jeda
+    _update_group_tree_debounced()
 
+@_marks_ui_dirty
 def clear_group_filter_callback():
     analyzer.group_filter = ""
     if dpg.does_item_exist("group_search_input"):
         dpg.set_value("group_search_input", "")
     update_group_tree_ui()
 
+@_marks_ui_dirty
 def group_checkbox_callback(sender, app_data, user_data):
     if analyzer.suppress_group_checkbox:
         return
@@ -730,24 +1270,15 @@ def create_group_comparison_panel():
     """Buat panel group comparison dengan DearPyGUI"""
     
     dpg.create_context()
+    _reset_ui_caches()
     
     # Discover groups
     available_groups = analyzer.discover_groups()
     analyzer.groups = {name: {} for name in available_groups.keys()}
     
-    # Setup theme
-    with dpg.theme() as global_theme:
-        with dpg.theme_component(dpg.mvAll):
-            dpg.add_theme_color(dpg.mvThemeCol_WindowBg, (15, 15, 15))
-            dpg.add_theme_color(dpg.mvThemeCol_FrameBg, (30, 30, 30))
-            dpg.add_theme_color(dpg.mvThemeCol_Button, (50, 50, 70))
-            dpg.add_theme_color(dpg.mvThemeCol_ButtonHovered, (70, 70, 100))
-            dpg.add_theme_color(dpg.mvThemeCol_ButtonActive, (80, 120, 180))
-            dpg.add_theme_style(dpg.mvStyleVar_FrameRounding, 5)
-            dpg.add_theme_style(dpg.mvStyleVar_WindowPadding, 10, 10)
-            dpg.add_theme_style(dpg.mvStyleVar_ItemSpacing, 5, 5)
-    
-    dpg.bind_theme(global_theme)
+    # Theme dibuat sekali per context lalu dipakai ulang
+    dpg.bind_theme(_build_theme())
+    table_theme = _build_table_theme()
     
     # Main window
     with dpg.window(label="Radar LPDP Group Comparison", tag="main_window", no_close=False):
@@ -802,6 +1333,8 @@ def create_group_comparison_panel():
                     dpg.add_plot_legend(location=dpg.mvPlot_Location_NorthEast)
                     dpg.add_plot_axis(dpg.mvXAxis, label="Frequency (kHz)", tag="ch2_overlay_xaxis")
                     dpg.add_plot_axis(dpg.mvYAxis, label="Magnitude (dB)", tag="ch2_overlay_yaxis")
+                
+                _ensure_series_slots(OVERLAY_SERIES_SLOTS)
             
             # Right column: Statistics & Peaks
             with dpg.child_window(tag="right_column", border=False):
@@ -820,14 +1353,16 @@ def create_group_comparison_panel():
                     resizable=True,
                     policy=dpg.mvTable_SizingFixedFit,
                     tag="stats_table",
-                    height=220,
-                    scrollY=True
+                    height=TABLE_HEIGHT,
+                    scrollY=True,
+                    freeze_rows=1
                 ):
                     dpg.add_table_column(label="Group-CH", width_fixed=True, init_width_or_weight=120)
                     dpg.add_table_column(label="Mean Mag", width_fixed=True, init_width_or_weight=90)
                     dpg.add_table_column(label="Std Mag", width_fixed=True, init_width_or_weight=90)
                     dpg.add_table_column(label="Med Freq", width_fixed=True, init_width_or_weight=75)
                     dpg.add_table_column(label="N Samples", width_fixed=True, init_width_or_weight=65)
+                dpg.bind_item_theme("stats_table", table_theme)
                 
                 dpg.add_spacer(height=8)
                 dpg.add_text("📌 Peak Details", color=(200, 200, 100))
@@ -840,8 +1375,9 @@ def create_group_comparison_panel():
                     resizable=True,
                     policy=dpg.mvTable_SizingFixedFit,
                     tag="peak_detail_table",
-                    height=220,
-                    scrollY=True
+                    height=TABLE_HEIGHT,
+                    scrollY=True,
+                    freeze_rows=1
                 ):
                     dpg.add_table_column(label="Group", width_fixed=True, init_width_or_weight=120)
                     dpg.add_table_column(label="Channel", width_fixed=True, init_width_or_weight=60)
@@ -849,6 +1385,7 @@ def create_group_comparison_panel():
                     dpg.add_table_column(label="Index", width_fixed=True, init_width_or_weight=60)
                     dpg.add_table_column(label="Freq (kHz)", width_fixed=True, init_width_or_weight=80)
                     dpg.add_table_column(label="Mag (dB)", width_fixed=True, init_width_or_weight=80)
+                dpg.bind_item_theme("peak_detail_table", table_theme)
         
         dpg.add_separator()
         with dpg.group(horizontal=True):
@@ -891,8 +1428,14 @@ def create_group_comparison_panel():
     print("🚀 Use the group explorer to load and compare")
     
     # Render loop
+    # Render loop: langsung render jika ada callback, selain itu tidur sampai
+    # IDLE_FRAME_INTERVAL_S (burst callback digabung jadi satu frame)
     while dpg.is_dearpygui_running():
+        refresh_visible_table_rows()
         dpg.render_dearpygui_frame()
+        if not _ui_dirty.is_set():
+            _ui_dirty.wait(timeout=IDLE_FRAME_INTERVAL_S)
+        _ui_dirty.clear()
     print("👋 Group comparison panel closed")
 
 if __name__ == "__main__":
@@ -0,0 +1,35 @@
+"""Process-pool entry point for the dashboard's advanced analysis.
+
+Pool workers are started with ``spawn``, so the submitted function has to be
+importable by module name in the child process. ``analytics.py`` itself is
+not when it runs under ``panel serve`` (the script gets a generated module
+name), so the entry point lives here and imports the analytics module lazily.
+"""
+
+from typing import Any, Dict, Optional
+
+import numpy as np
+import param
+
+_WORKER_ANALYTICS: Optional[Any] = None
+
+
+def advanced_analysis_worker(samples: np.ndarray, window_function: str) -> Dict[str, Any]:
+    """Run the advanced analysis of a (channels, samples) capture in a pool worker.
+
+    Args:
+        samples: Capture of shape (channels, samples)
+        window_function: Window used for the spectrogram
+
+    Returns:
+        Result dict of ``RFAnalytics.compute_advanced_analysis``
+    """
+    global _WORKER_ANALYTICS
+    if _WORKER_ANALYTICS is None:
+        from analytics import RFAnalytics  # Lazy: analytics imports this module
+
+        _WORKER_ANALYTICS = RFAnalytics()  # Keeps FFT plans warm per worker
+    with param.parameterized.discard_events(_WORKER_ANALYTICS):
+        _WORKER_ANALYTICS.window_function = window_function
+    _WORKER_ANALYTICS._set_data(samples)
+    return _WORKER_ANALYTICS.compute_advanced_analysis()
@@ -4,10 +4,11 @@ This module provides functions for loading, processing, and analyzing RF data
 from the ADC, including FFT computation, peak detection, and statistical analysis.
 """
 
+import functools
 import math
+import mmap as mmap_module
 import os
 import queue
-import struct
 import threading
 import time
 from typing import Any, Dict, List, Optional, Tuple
@@ -17,8 +18,10 @@ import serial
 from numpy.typing import NDArray
 from scipy import stats as sp_stats
 from scipy.fft import rfft, rfftfreq
+from scipy.ndimage import convolve1d
 from scipy.signal import find_peaks, get_window, savgol_filter
 
+from functions.kernels import magnitude_db
 from config import (
     FILENAME,
     SAMPLE_RATE,
@@ -68,13 +71,16 @@ def polar_to_cartesian(
 
 def load_and_process_data(
     filepath: str,
-    sample_rate: int
+    sample_rate: int,
+    mmap: bool = False
 ) -> Tuple[Optional[NDArray[np.float32]], Optional[NDArray[np.float32]], Optional[int], int]:
     """Load binary data file, separate channels, and remove DC offset.
     
     Args:
         filepath: Path to the binary data file
         sample_rate: Sample rate in Hz
+        mmap: Map the file read-only instead of reading it into a bytes
+            buffer; the only copy made is the float32 channel array
         
     Returns:
         Tuple of (ch1_data, ch2_data, n_samples, sample_rate)
@@ -84,28 +90,43 @@ def load_and_process_data(
         if not os.path.exists(filepath):
             return None, None, None, sample_rate
 
-        with open(filepath, "rb") as f:
-            data = f.read()
-        
-        if not data:
-            return np.array([], dtype=np.float32), np.array([], dtype=np.float32), 0, sample_rate
+        if mmap:
+            # Page cache backs the raw samples; odd trailing byte is left unmapped
+            n_values = os.path.getsize(filepath) // 2
+            if n_values == 0:
+                return np.array([], dtype=np.float32), np.array([], dtype=np.float32), 0, sample_rate
+            with open(filepath, "rb") as f:
+                # One sequential pass over the file: ask the kernel to read ahead
+                # aggressively and drop pages behind us (POSIX only)
+                if hasattr(os, "posix_fadvise"):
+                    os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+                mapping = mmap_module.mmap(f.fileno(), 0, access=mmap_module.ACCESS_READ)
+            if hasattr(mapping, "madvise") and hasattr(mmap_module, "MADV_SEQUENTIAL"):
+                mapping.madvise(mmap_module.MADV_SEQUENTIAL)
+            # The array keeps the mapping alive; it is unmapped once values is released
+            values = np.frombuffer(mapping, dtype="<u2", count=n_values)
+        else:
+            with open(filepath, "rb") as f:
+                data = f.read()
+            
+            if not data:
+                return np.array([], dtype=np.float32), np.array([], dtype=np.float32), 0, sample_rate
 
-        # Ensure even byte length for uint16 unpacking
-        if len(data) % 2 != 0:
-            data = data[:-1]
+            # Ensure even byte length for uint16 unpacking
+            if len(data) % 2 != 0:
+                data = data[:-1]
 
-        values = np.array(
-            struct.unpack(f"<{len(data)//2}H", data),
-            dtype=np.float32
-        )
+            values = np.frombuffer(data, dtype="<u2")
 
         # Ensure even number of samples for 2-channel deinterleaving
         if len(values) % 2 != 0:
             values = values[:-1]
             
         # Deinterleave channels: CH1 (even indices), CH2 (odd indices)
-        ch1 = values[::2]
-        ch2 = values[1::2]
+        # in one contiguous uint16 -> float32 copy of shape (2, n)
+        channels = np.ascontiguousarray(values.reshape(-1, 2).T, dtype=np.float32)
+        ch1 = channels[0]
+        ch2 = channels[1]
         
         # Remove DC offset
         ch1 -= np.mean(ch1)
@@ -119,6 +140,10 @@ def load_and_process_data(
 
 # --- FFT and Spectral Analysis Functions ---
 
+# 10*log10(x) == _DB_PER_LOG2 * log2(x); log2 is the cheaper ufunc
+_DB_PER_LOG2 = 10.0 / math.log2(10.0)
+
+
 def smooth_spectrum(
     magnitudes: NDArray[np.float64],
     window_size: int = 5,
@@ -129,7 +154,8 @@ def smooth_spectrum(
     """Apply smoothing filter to reduce noise grass in spectrum.
     
     Args:
-        magnitudes: Magnitude array to smooth
+        magnitudes: Magnitude array to smooth, or a 2-D array of spectra
+            (smoothed along the last axis)
         window_size: Moving average window size
         method: Smoothing method ('moving_average' or 'savgol')
         savgol_window: Window length for Savitzky-Golay filter (must be odd)
@@ -138,7 +164,7 @@ def smooth_spectrum(
     Returns:
         Smoothed magnitude array
     """
-    n = len(magnitudes)
+    n = magnitudes.shape[-1]
     if n == 0:
         return magnitudes
 
@@ -174,9 +200,91 @@ def smooth_spectrum(
     if window_size <= 1 or n < window_size:
         return magnitudes
 
-    kernel = np.ones(window_size, dtype=np.float64) / window_size
-    smoothed = np.convolve(magnitudes, kernel, mode="same")
-    return smoothed
+    # Kernel follows the input precision (float32 spectra stay float32)
+    kernel = np.full(window_size, 1.0 / window_size, dtype=np.result_type(magnitudes, np.float32))
+    if magnitudes.ndim == 1:
+        return np.convolve(magnitudes, kernel, mode="same")
+
+    # Row-wise equivalent of np.convolve(mode="same"); even kernels sit one bin left
+    return convolve1d(magnitudes, kernel, axis=-1, mode="constant", origin=window_size % 2 - 1)
+
+
+def magnitude_to_db(
+    magnitudes: NDArray[np.float64],
+    smooth: bool = True,
+    smooth_window: int = 5
+) -> NDArray[np.float64]:
+    """Convert linear FFT magnitudes to dB, then smooth and floor them.
+    
+    Args:
+        magnitudes: Linear magnitude spectrum (``abs`` of the FFT)
+        smooth: Apply smoothing to reduce noise (default: True)
+        smooth_window: Smoothing window size (default: 5)
+        
+    Returns:
+        Magnitude array in dB
+    """
+    # Convert to dB scale, avoiding log(0); one temporary, log2 in place
+    magnitudes_db = np.add(magnitudes, 1e-12)
+    np.log2(magnitudes_db, out=magnitudes_db)
+    magnitudes_db *= 2.0 * _DB_PER_LOG2
+    
+    return condition_db(magnitudes_db, smooth=smooth, smooth_window=smooth_window)
+
+
+def condition_db(
+    magnitudes_db: NDArray[np.float64],
+    smooth: bool = True,
+    smooth_window: int = 5
+) -> NDArray[np.float64]:
+    """Smooth and floor a dB spectrum (the tail of ``magnitude_to_db``).
+    
+    Args:
+        magnitudes_db: Magnitude spectrum already in dB
+        smooth: Apply smoothing to reduce noise (default: True)
+        smooth_window: Smoothing window size (default: 5)
+        
+    Returns:
+        Conditioned magnitude array in dB
+    """
+    # Apply smoothing to reduce noise spikes
+    if smooth:
+        magnitudes_db = smooth_spectrum(
+            magnitudes_db,
+            window_size=smooth_window,
+            method=FFT_SMOOTHING_METHOD,
+            savgol_window=FFT_SAVGOL_WINDOW,
+            savgol_polyorder=FFT_SAVGOL_POLYORDER,
+        )
+
+    if FFT_MAGNITUDE_FLOOR_DB is not None:
+        magnitudes_db = np.maximum(magnitudes_db, FFT_MAGNITUDE_FLOOR_DB)
+
+    return magnitudes_db
+
+
+@functools.lru_cache(maxsize=32)
+def get_fft_window(
+    name: str,
+    n: int,
+    dtype: str = "float32"
+) -> Optional[NDArray[np.floating]]:
+    """Return a cached, read-only FFT window.
+    
+    Args:
+        name: Window function name (scipy.signal.get_window)
+        n: Window length in samples
+        dtype: Output dtype (default: 'float32')
+        
+    Returns:
+        Window array, or None if the name is invalid
+    """
+    try:
+        window = get_window(name, n, fftbins=True).astype(dtype)
+    except ValueError:
+        return None
+    window.setflags(write=False)
+    return window
 
 
 def compute_fft(
@@ -206,31 +314,15 @@ def compute_fft(
     
     # Apply window function to reduce spectral leakage
     if window:
-        try:
-            w = get_window(window, n, fftbins=True)
+        w = get_fft_window(window, n, "float64")
+        if w is not None:  # Fallback without window if invalid
             x = x * w
-        except Exception:
-            pass  # Fallback without window if invalid
 
     # Compute real FFT (positive frequencies only)
     fft_result = rfft(x)
     magnitudes = np.abs(fft_result)
 
-    # Convert to dB scale, avoiding log(0)
-    magnitudes_db = 20.0 * np.log10(magnitudes + 1e-12)
-    
-    # Apply smoothing to reduce noise spikes
-    if smooth:
-        magnitudes_db = smooth_spectrum(
-            magnitudes_db,
-            window_size=smooth_window,
-            method=FFT_SMOOTHING_METHOD,
-            savgol_window=FFT_SAVGOL_WINDOW,
-            savgol_polyorder=FFT_SAVGOL_POLYORDER,
-        )
-
-    if FFT_MAGNITUDE_FLOOR_DB is not None:
-        magnitudes_db = np.maximum(magnitudes_db, FFT_MAGNITUDE_FLOOR_DB)
+    magnitudes_db = magnitude_to_db(magnitudes, smooth=smooth, smooth_window=smooth_window)
 
     # Frequencies in kHz
     frequencies_khz = rfftfreq(n, d=1.0 / sample_rate) / 1000.0
@@ -265,6 +357,106 @@ def compute_fft_linear(
         np.ascontiguousarray(magnitudes, dtype=np.float64),
     )
 
+
+def compute_fft_batch(
+    channels: NDArray[np.float32],
+    sample_rate: int,
+    window: str = "hann",
+    smooth: bool = True,
+    smooth_window: int = 5
+) -> Tuple[NDArray[np.float64], NDArray[np.float64]]:
+    """Compute the dB spectra of many equal-length signals in one FFT call.
+    
+    Row-for-row equivalent to ``compute_fft``, but the window, the rfft,
+    the dB conversion and the smoothing each run once over the whole
+    (rows, samples) matrix instead of once per signal.
+    
+    Args:
+        channels: Signal array of shape (rows, samples)
+        sample_rate: Sample rate in Hz
+        window: Window function name (default: 'hann')
+        smooth: Apply smoothing to reduce noise (default: True)
+        smooth_window: Smoothing window size (default: 5)
+        
+    Returns:
+        Tuple of (frequencies_khz, magnitudes_db) where magnitudes_db has
+        shape (rows, samples // 2 + 1)
+    """
+    n_rows, n = channels.shape
+    if n_rows == 0 or n == 0:
+        return np.array([], dtype=np.float64), np.empty((n_rows, 0), dtype=np.float64)
+
+    x = np.asarray(channels, dtype=np.float64)
+
+    if window:
+        w = get_fft_window(window, n, "float64")
+        if w is not None:  # Fallback without window if invalid
+            x = x * w
+
+    # One multi-threaded FFT over all rows
+    spectra = rfft(x, axis=1, workers=-1)
+
+    # |X| and its raw dB in one fused pass, then smooth and floor
+    magnitudes = np.empty(spectra.shape, dtype=np.float64)
+    magnitudes_db = np.empty(spectra.shape, dtype=np.float64)
+    magnitude_db(spectra.ravel(), magnitudes.ravel(), magnitudes_db.ravel())
+    magnitudes_db = condition_db(magnitudes_db, smooth=smooth, smooth_window=smooth_window)
+
+    frequencies_khz = rfftfreq(n, d=1.0 / sample_rate) / 1000.0
+
+    return frequencies_khz, magnitudes_db
+
+
+def compute_fft_both_batch(
+    channels: NDArray[np.float32],
+    sample_rate: int,
+    smooth: bool = True,
+    smooth_window: int = 5
+) -> Tuple[NDArray[np.float64], NDArray[np.float64], NDArray[np.float64]]:
+    """Hann dB spectra and unwindowed linear spectra of many signals from one FFT.
+    
+    Row-for-row equivalent to ``compute_fft_batch`` (Hann window) plus
+    ``compute_fft_linear``. Only the unwindowed rfft is computed; the
+    periodic Hann window is applied in the frequency domain as the 3-tap
+    kernel ``0.5*X[k] - 0.25*(X[k-1] + X[k+1])``, using the conjugate
+    symmetry of a real signal for the bins beyond either end.
+    
+    Args:
+        channels: Signal array of shape (rows, samples)
+        sample_rate: Sample rate in Hz
+        smooth: Apply smoothing to the dB spectra (default: True)
+        smooth_window: Smoothing window size (default: 5)
+        
+    Returns:
+        Tuple of (frequencies_khz, magnitudes_db, magnitudes_linear) where
+        both magnitude arrays have shape (rows, samples // 2 + 1)
+    """
+    n_rows, n = channels.shape
+    if n_rows == 0 or n < 2:
+        empty = np.empty((n_rows, 0), dtype=np.float64)
+        return np.array([], dtype=np.float64), empty, empty
+
+    spectra = rfft(np.asarray(channels, dtype=np.float64), axis=1, workers=-1)
+    magnitudes_linear = np.abs(spectra)
+
+    # X[-1] = conj(X[1]) and X[m] = conj(X[n - m]) for the last rfft bin m - 1
+    m = spectra.shape[1]
+    padded = np.empty((n_rows, m + 2), dtype=spectra.dtype)
+    padded[:, 1:-1] = spectra
+    padded[:, 0] = np.conj(spectra[:, 1])
+    padded[:, -1] = np.conj(spectra[:, n - m])
+    windowed = 0.5 * spectra
+    windowed -= 0.25 * (padded[:, :-2] + padded[:, 2:])
+
+    magnitudes = np.empty(windowed.shape, dtype=np.float64)
+    magnitudes_db = np.empty(windowed.shape, dtype=np.float64)
+    magnitude_db(windowed.ravel(), magnitudes.ravel(), magnitudes_db.ravel())
+    magnitudes_db = condition_db(magnitudes_db, smooth=smooth, smooth_window=smooth_window)
+
+    frequencies_khz = rfftfreq(n, d=1.0 / sample_rate) / 1000.0
+
+    return frequencies_khz, magnitudes_db, magnitudes_linear
+
 def find_peak_metrics(
     frequencies: NDArray[np.float64],
     magnitudes: NDArray[np.float64]
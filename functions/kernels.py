@@ -0,0 +1,503 @@
+"""Numerical kernels for the hot loops of the RF analytics code.
+
+Each kernel is compiled with Numba when it is installed. Otherwise a NumPy
+implementation with the same signature and return values is used, so Numba
+stays an optional dependency.
+"""
+
+from typing import Tuple
+
+import numpy as np
+from numpy.typing import NDArray
+from scipy.signal import find_peaks, peak_prominences
+
+try:
+    from numba import njit, prange
+except ImportError:  # Numba opsional, fallback ke NumPy
+    njit = None
+    prange = range
+
+NUMBA_AVAILABLE = njit is not None
+
+# --- Statistics Kernels ---
+
+if NUMBA_AVAILABLE:
+
+    @njit(cache=True, fastmath=True)
+    def single_pass_stats(x: NDArray) -> Tuple[float, float, float, float, float]:
+        """Compute sum, sum of squares, min, max and abs-max in one sweep.
+
+        Args:
+            x: Non-empty 1-D signal array
+
+        Returns:
+            Tuple of (sum, sum_sq, min, max, abs_max)
+        """
+        total = 0.0
+        sum_sq = 0.0
+        lo = x[0]
+        hi = x[0]
+        for i in range(x.shape[0]):
+            v = x[i]
+            total += v
+            sum_sq += v * v
+            if v < lo:
+                lo = v
+            if v > hi:
+                hi = v
+        return total, sum_sq, float(lo), float(hi), float(max(hi, -lo))
+
+else:
+
+    def single_pass_stats(x: NDArray) -> Tuple[float, float, float, float, float]:
+        """Compute sum, sum of squares, min, max and abs-max of ``x``.
+
+        Args:
+            x: Non-empty 1-D signal array
+
+        Returns:
+            Tuple of (sum, sum_sq, min, max, abs_max)
+        """
+        lo = float(np.min(x))
+        hi = float(np.max(x))
+        return (
+            float(np.sum(x, dtype=np.float64)),
+            float(np.dot(x, x)),
+            lo,
+            hi,
+            max(hi, -lo),
+        )
+
+# --- Plot Decimation Kernels ---
+
+if NUMBA_AVAILABLE:
+
+    @njit(cache=True)
+    def minmax_decimate(x: NDArray, n_buckets: int) -> NDArray[np.int64]:
+        """Pick the min and max sample of each bucket (oscilloscope style).
+
+        Buckets are ``len(x) // n_buckets`` samples wide; the last bucket also
+        takes the remainder. Caller must ensure ``len(x) >= 2 * n_buckets``.
+
+        Args:
+            x: 1-D signal array
+            n_buckets: Number of buckets (roughly the plot width in pixels)
+
+        Returns:
+            Sample indices of shape (2 * n_buckets,), ascending within each bucket
+        """
+        n = x.shape[0]
+        width = n // n_buckets
+        out = np.empty(2 * n_buckets, dtype=np.int64)
+        for b in range(n_buckets):
+            start = b * width
+            stop = n if b == n_buckets - 1 else start + width
+            i_min = start
+            i_max = start
+            for i in range(start + 1, stop):
+                if x[i] < x[i_min]:
+                    i_min = i
+                elif x[i] > x[i_max]:
+                    i_max = i
+            out[2 * b] = min(i_min, i_max)
+            out[2 * b + 1] = max(i_min, i_max)
+        return out
+
+else:
+
+    def minmax_decimate(x: NDArray, n_buckets: int) -> NDArray[np.int64]:
+        """Pick the min and max sample of each bucket (oscilloscope style).
+
+        Buckets are ``len(x) // n_buckets`` samples wide; the last bucket also
+        takes the remainder. Caller must ensure ``len(x) >= 2 * n_buckets``.
+
+        Args:
+            x: 1-D signal array
+            n_buckets: Number of buckets (roughly the plot width in pixels)
+
+        Returns:
+            Sample indices of shape (2 * n_buckets,), ascending within each bucket
+        """
+        width = len(x) // n_buckets
+        tail = width * (n_buckets - 1)
+        head = x[:tail].reshape(n_buckets - 1, width)
+        offsets = np.arange(n_buckets - 1) * width
+        i_min = np.append(np.argmin(head, axis=1) + offsets, tail + np.argmin(x[tail:]))
+        i_max = np.append(np.argmax(head, axis=1) + offsets, tail + np.argmax(x[tail:]))
+        out = np.empty(2 * n_buckets, dtype=np.int64)
+        out[0::2] = np.minimum(i_min, i_max)
+        out[1::2] = np.maximum(i_min, i_max)
+        return out
+
+# --- Spectrum Kernels ---
+
+if NUMBA_AVAILABLE:
+
+    @njit(cache=True)
+    def level_crossing_bounds(x: NDArray, peak_idx: int, level: float) -> Tuple[int, int]:
+        """Walk outward from a peak to the last samples still at or above ``level``.
+
+        Args:
+            x: 1-D spectrum (e.g. magnitude in dB)
+            peak_idx: Index of the peak to start from
+            level: Threshold level (e.g. peak - 3 dB)
+
+        Returns:
+            Tuple of (left, right) inclusive indices of the contiguous region
+        """
+        left = peak_idx
+        while left > 0 and x[left - 1] >= level:
+            left -= 1
+        right = peak_idx
+        n = x.shape[0]
+        while right < n - 1 and x[right + 1] >= level:
+            right += 1
+        return left, right
+
+else:
+
+    def level_crossing_bounds(x: NDArray, peak_idx: int, level: float) -> Tuple[int, int]:
+        """Walk outward from a peak to the last samples still at or above ``level``.
+
+        Args:
+            x: 1-D spectrum (e.g. magnitude in dB)
+            peak_idx: Index of the peak to start from
+            level: Threshold level (e.g. peak - 3 dB)
+
+        Returns:
+            Tuple of (left, right) inclusive indices of the contiguous region
+        """
+        below_left = np.flatnonzero(x[:peak_idx] < level)
+        below_right = np.flatnonzero(x[peak_idx + 1:] < level)
+        left = int(below_left[-1]) + 1 if len(below_left) else 0
+        right = peak_idx + int(below_right[0]) if len(below_right) else len(x) - 1
+        return left, right
+
+if NUMBA_AVAILABLE:
+
+    @njit(cache=True, fastmath=True, parallel=True)
+    def power_spectrum(x: NDArray, out: NDArray) -> NDArray:
+        """Write ``x.real**2 + x.imag**2`` into ``out`` in one fused pass.
+
+        Args:
+            x: 1-D complex spectrum
+            out: Preallocated real output of the same length
+
+        Returns:
+            ``out``
+        """
+        for i in prange(x.shape[0]):
+            v = x[i]
+            out[i] = v.real * v.real + v.imag * v.imag
+        return out
+
+else:
+
+    def power_spectrum(x: NDArray, out: NDArray) -> NDArray:
+        """Write ``x.real**2 + x.imag**2`` into ``out`` without the sqrt of ``abs``.
+
+        Args:
+            x: 1-D complex spectrum
+            out: Preallocated real output of the same length
+
+        Returns:
+            ``out``
+        """
+        np.square(x.real, out=out)
+        out += np.square(x.imag)
+        return out
+
+if NUMBA_AVAILABLE:
+
+    @njit(cache=True, fastmath=True, parallel=True)
+    def band_power_db(power: NDArray, freqs: NDArray, f_lo: float, f_hi: float) -> float:
+        """Sum the power bins with ``f_lo <= freq <= f_hi`` and convert to dB.
+
+        Args:
+            power: Linear power spectrum (e.g. ``|X|**2``)
+            freqs: Ascending bin frequencies, same length as ``power``
+            f_lo: Lower band edge (inclusive)
+            f_hi: Upper band edge (inclusive)
+
+        Returns:
+            Band power in dB (``10*log10``)
+        """
+        acc = 0.0
+        for i in prange(freqs.shape[0]):
+            if f_lo <= freqs[i] <= f_hi:
+                acc += power[i]
+        return 10.0 * np.log10(acc + 1e-20)
+
+else:
+
+    def band_power_db(power: NDArray, freqs: NDArray, f_lo: float, f_hi: float) -> float:
+        """Sum the power bins with ``f_lo <= freq <= f_hi`` and convert to dB.
+
+        Args:
+            power: Linear power spectrum (e.g. ``|X|**2``)
+            freqs: Ascending bin frequencies, same length as ``power``
+            f_lo: Lower band edge (inclusive)
+            f_hi: Upper band edge (inclusive)
+
+        Returns:
+            Band power in dB (``10*log10``)
+        """
+        lo = np.searchsorted(freqs, f_lo, side='left')
+        hi = np.searchsorted(freqs, f_hi, side='right')
+        return float(10.0 * np.log10(np.sum(power[lo:hi], dtype=np.float64) + 1e-20))
+
+if NUMBA_AVAILABLE:
+
+    @njit(cache=True, fastmath=True, parallel=True)
+    def magnitude_db(x: NDArray, mag_out: NDArray, db_out: NDArray) -> None:
+        """Write ``|x|`` and ``20*log10(|x| + 1e-12)`` in one pass over ``x``.
+
+        Args:
+            x: 1-D complex spectrum
+            mag_out: Preallocated linear magnitude output, same length
+            db_out: Preallocated dB output, same length
+        """
+        for i in prange(x.shape[0]):
+            v = x[i]
+            m = np.sqrt(v.real * v.real + v.imag * v.imag)
+            mag_out[i] = m
+            db_out[i] = 20.0 * np.log10(m + 1e-12)
+
+else:
+
+    def magnitude_db(x: NDArray, mag_out: NDArray, db_out: NDArray) -> None:
+        """Write ``|x|`` and ``20*log10(|x| + 1e-12)`` without temporaries.
+
+        Args:
+            x: 1-D complex spectrum
+            mag_out: Preallocated linear magnitude output, same length
+            db_out: Preallocated dB output, same length
+        """
+        np.abs(x, out=mag_out)
+        np.add(mag_out, 1e-12, out=db_out)
+        np.log10(db_out, out=db_out)
+        db_out *= 20.0
+
+if NUMBA_AVAILABLE:
+
+    @njit(cache=True)
+    def prominent_local_maxima(x: NDArray, min_prominence: float) -> NDArray[np.int64]:
+        """Find local maxima of ``x`` whose prominence is at least ``min_prominence``.
+
+        A local maximum is where the sign of consecutive differences drops
+        (``diff(sign(diff(x))) < 0``). Prominence follows
+        ``scipy.signal.peak_prominences`` with an unlimited window.
+
+        Args:
+            x: 1-D spectrum (e.g. magnitude in dB)
+            min_prominence: Minimum prominence of a kept maximum
+
+        Returns:
+            Indices of the kept maxima in ascending order
+        """
+        n = x.shape[0]
+        idx = np.empty(max(n - 2, 0), dtype=np.int64)
+        count = 0
+        for i in range(1, n - 1):
+            d_left = np.sign(x[i] - x[i - 1])
+            d_right = np.sign(x[i + 1] - x[i])
+            if d_right - d_left >= 0:
+                continue
+            peak = x[i]
+            # Lowest point before a higher sample on each side
+            left_min = peak
+            j = i
+            while j >= 0 and x[j] <= peak:
+                if x[j] < left_min:
+                    left_min = x[j]
+                j -= 1
+            right_min = peak
+            j = i
+            while j < n and x[j] <= peak:
+                if x[j] < right_min:
+                    right_min = x[j]
+                j += 1
+            if peak - max(left_min, right_min) >= min_prominence:
+                idx[count] = i
+                count += 1
+        return idx[:count]
+
+else:
+
+    def prominent_local_maxima(x: NDArray, min_prominence: float) -> NDArray[np.int64]:
+        """Find local maxima of ``x`` whose prominence is at least ``min_prominence``.
+
+        Args:
+            x: 1-D spectrum (e.g. magnitude in dB)
+            min_prominence: Minimum prominence of a kept maximum
+
+        Returns:
+            Indices of the kept maxima in ascending order
+        """
+        idx = np.flatnonzero(np.diff(np.sign(np.diff(x))) < 0) + 1
+        if idx.size:
+            idx = idx[peak_prominences(x, idx)[0] >= min_prominence]
+        return idx.astype(np.int64)
+
+if NUMBA_AVAILABLE:
+
+    @njit(cache=True, parallel=True)
+    def top_prominent_peaks(
+        x: NDArray, min_prominence: float, k: int
+    ) -> Tuple[NDArray[np.int64], NDArray[np.int64]]:
+        """Top-``k`` prominent local maxima of every row of ``x``, highest first.
+
+        Rows are scanned in parallel. Each row keeps a sorted buffer of at
+        most ``k`` maxima (magnitude descending, ties by ascending index), so
+        only the candidates are ranked, never the whole row.
+
+        Args:
+            x: 2-D array of spectra, one per row (e.g. magnitude in dB)
+            min_prominence: Minimum prominence of a kept maximum
+            k: Maximum number of peaks per row
+
+        Returns:
+            Tuple of (indices, counts): indices has shape (n_rows, k) with
+            the first ``counts[r]`` entries of row ``r`` valid
+        """
+        n_rows = x.shape[0]
+        out = np.full((n_rows, k), -1, dtype=np.int64)
+        counts = np.zeros(n_rows, dtype=np.int64)
+        if k <= 0:
+            return out, counts
+        for r in prange(n_rows):
+            row = x[r]
+            candidates = prominent_local_maxima(row, min_prominence)
+            count = 0
+            for c in range(candidates.shape[0]):
+                i = candidates[c]
+                v = row[i]
+                if count == k and v <= row[out[r, k - 1]]:
+                    continue
+                # Insert after equal values so earlier indices win ties
+                pos = min(count, k - 1)
+                while pos > 0 and row[out[r, pos - 1]] < v:
+                    out[r, pos] = out[r, pos - 1]
+                    pos -= 1
+                out[r, pos] = i
+                if count < k:
+                    count += 1
+            counts[r] = count
+        return out, counts
+
+else:
+
+    def top_prominent_peaks(
+        x: NDArray, min_prominence: float, k: int
+    ) -> Tuple[NDArray[np.int64], NDArray[np.int64]]:
+        """Top-``k`` prominent local maxima of every row of ``x``, highest first.
+
+        Args:
+            x: 2-D array of spectra, one per row (e.g. magnitude in dB)
+            min_prominence: Minimum prominence of a kept maximum
+            k: Maximum number of peaks per row
+
+        Returns:
+            Tuple of (indices, counts): indices has shape (n_rows, k) with
+            the first ``counts[r]`` entries of row ``r`` valid
+        """
+        out = np.full((x.shape[0], k), -1, dtype=np.int64)
+        counts = np.zeros(x.shape[0], dtype=np.int64)
+        for r, row in enumerate(x):
+            candidates = prominent_local_maxima(row, min_prominence)
+            top = candidates[np.argsort(-row[candidates], kind='stable')[:k]]
+            out[r, :top.size] = top
+            counts[r] = top.size
+        return out, counts
+
+# --- Pulse Detection Kernels ---
+
+if NUMBA_AVAILABLE:
+
+    @njit(cache=True)
+    def detect_abs_peaks(x: NDArray, threshold: float, min_distance: int) -> NDArray[np.int64]:
+        """Find local maxima of ``|x|`` at or above ``threshold``.
+
+        Follows ``scipy.signal.find_peaks(|x|, height=threshold,
+        distance=min_distance)``: flat peaks report their middle sample, and
+        within ``min_distance`` samples of a higher peak lower ones are
+        dropped, highest first (equal heights: the later peak wins).
+
+        Args:
+            x: 1-D signal array
+            threshold: Minimum absolute amplitude of a peak
+            min_distance: Minimum spacing between peaks in samples
+
+        Returns:
+            Peak indices in ascending order
+        """
+        n = x.shape[0]
+        idx = np.empty(n // 2 + 1, dtype=np.int64)
+        count = 0
+        i = 1
+        while i < n - 1:
+            a = abs(x[i])
+            if abs(x[i - 1]) < a:
+                ahead = i + 1
+                while ahead < n - 1 and abs(x[ahead]) == a:
+                    ahead += 1
+                if abs(x[ahead]) < a:
+                    if a >= threshold:
+                        idx[count] = (i + ahead - 1) // 2
+                        count += 1
+                    i = ahead
+            i += 1
+        peaks = idx[:count]
+        if min_distance <= 1 or count < 2:
+            return peaks
+
+        heights = np.empty(count, dtype=np.float64)
+        for j in range(count):
+            heights[j] = abs(x[peaks[j]])
+        order = np.argsort(heights, kind='mergesort')
+        keep = np.ones(count, dtype=np.bool_)
+        for r in range(count - 1, -1, -1):
+            j = order[r]
+            if not keep[j]:
+                continue
+            k = j - 1
+            while k >= 0 and peaks[j] - peaks[k] < min_distance:
+                keep[k] = False
+                k -= 1
+            k = j + 1
+            while k < count and peaks[k] - peaks[j] < min_distance:
+                keep[k] = False
+                k += 1
+        return peaks[keep]
+
+else:
+
+    def detect_abs_peaks(x: NDArray, threshold: float, min_distance: int) -> NDArray[np.int64]:
+        """Find local maxima of ``|x|`` at or above ``threshold``.
+
+        Same rules as ``scipy.signal.find_peaks(|x|, height=threshold,
+        distance=min_distance)``, with a stable priority order so equal
+        heights resolve like the Numba variant (the later peak wins).
+
+        Args:
+            x: 1-D signal array
+            threshold: Minimum absolute amplitude of a peak
+            min_distance: Minimum spacing between peaks in samples
+
+        Returns:
+            Peak indices in ascending order
+        """
+        mag = np.abs(x)
+        peaks, _ = find_peaks(mag, height=threshold)
+        peaks = peaks.astype(np.int64)
+        if min_distance <= 1 or peaks.size < 2:
+            return peaks
+        keep = np.ones(peaks.size, dtype=bool)
+        for j in np.argsort(mag[peaks], kind='stable')[::-1]:
+            if not keep[j]:
+                continue
+            lo = np.searchsorted(peaks, peaks[j] - min_distance, side='right')
+            hi = np.searchsorted(peaks, peaks[j] + min_distance, side='left')
+            keep[lo:hi] = False
+            keep[j] = True
+        return peaks[keep]
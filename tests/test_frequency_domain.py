@@ -0,0 +1,28 @@
+"""Frequency-domain checks for RFAnalytics."""
+
+import numpy as np
+
+import analytics
+from config import SAMPLE_RATE
+
+
+def test_tone_peak_level_independent_of_fft_size(monkeypatch):
+    # Compare raw spectra: smoothing spreads a single-bin tone differently per resolution
+    monkeypatch.setattr(analytics, "condition_db", lambda magnitudes_db: magnitudes_db)
+    n = 8192
+    t = np.arange(n) / SAMPLE_RATE
+    rng = np.random.default_rng(0)
+    tone = np.sin(2 * np.pi * (SAMPLE_RATE / 8) * t) + 0.01 * rng.standard_normal(n)
+    tone = tone.astype(np.float32)
+
+    rf = analytics.RFAnalytics()
+    peaks = {}
+    for fft_size in (8192, 1024):
+        rf.fft_size = fft_size
+        metrics, freqs, magnitude_db = rf.compute_frequency_domain(tone, "hann")
+        assert freqs[np.argmax(magnitude_db)] == SAMPLE_RATE / 8
+        peaks[fft_size] = float(magnitude_db.max())
+
+    assert abs(peaks[1024] - peaks[8192]) < 0.1
+    # Unit-amplitude sine: A / 2 in a one-sided amplitude spectrum
+    assert abs(peaks[8192] - 20 * np.log10(0.5)) < 0.1
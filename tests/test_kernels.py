@@ -0,0 +1,118 @@
+"""The Numba and NumPy variants of functions.kernels must return the same results."""
+
+import importlib.util
+import sys
+from pathlib import Path
+from unittest import mock
+
+import numpy as np
+import pytest
+from scipy.signal import find_peaks
+
+pytest.importorskip("numba")
+
+from functions import kernels as numba_kernels  # noqa: E402
+
+KERNELS_PATH = Path(numba_kernels.__file__)
+
+
+def _load_numpy_kernels():
+    """Import a second copy of the module with Numba hidden, i.e. the fallbacks."""
+    with mock.patch.dict(sys.modules, {"numba": None}):
+        spec = importlib.util.spec_from_file_location("_kernels_numpy", KERNELS_PATH)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+    assert not module.NUMBA_AVAILABLE
+    return module
+
+
+numpy_kernels = _load_numpy_kernels()
+assert numba_kernels.NUMBA_AVAILABLE
+
+
+@pytest.fixture
+def rng():
+    return np.random.default_rng(0)
+
+
+def _signals(rng, count=50):
+    """Random float32 signals; every other one quantized so plateaus and ties occur."""
+    for n in rng.integers(8, 800, size=count):
+        x = rng.standard_normal(n).astype(np.float32)
+        yield x
+        yield np.round(x * 2) / 2
+
+
+def test_single_pass_stats(rng):
+    for x in _signals(rng):
+        np.testing.assert_allclose(
+            numba_kernels.single_pass_stats(x), numpy_kernels.single_pass_stats(x), rtol=1e-4, atol=1e-3
+        )
+
+
+def test_minmax_decimate(rng):
+    for x in _signals(rng):
+        n_buckets = max(1, len(x) // int(rng.integers(2, 10)))
+        np.testing.assert_array_equal(
+            numba_kernels.minmax_decimate(x, n_buckets), numpy_kernels.minmax_decimate(x, n_buckets)
+        )
+
+
+def test_level_crossing_bounds(rng):
+    for x in _signals(rng):
+        peak_idx = int(np.argmax(x))
+        level = float(x[peak_idx]) - 1.0
+        assert numba_kernels.level_crossing_bounds(x, peak_idx, level) == numpy_kernels.level_crossing_bounds(
+            x, peak_idx, level
+        )
+
+
+def test_power_spectrum_and_magnitude_db(rng):
+    for x in _signals(rng):
+        spectrum = np.fft.rfft(x).astype(np.complex64)
+        np.testing.assert_allclose(
+            numba_kernels.power_spectrum(spectrum, np.empty(spectrum.size, np.float32)),
+            numpy_kernels.power_spectrum(spectrum, np.empty(spectrum.size, np.float32)),
+            rtol=1e-5,
+        )
+        outputs = []
+        for kernels in (numba_kernels, numpy_kernels):
+            mag, db = np.empty(spectrum.size, np.float32), np.empty(spectrum.size, np.float32)
+            kernels.magnitude_db(spectrum, mag, db)
+            outputs.append((mag, db))
+        np.testing.assert_allclose(outputs[0][0], outputs[1][0], rtol=1e-5)
+        np.testing.assert_allclose(outputs[0][1], outputs[1][1], atol=1e-3)
+
+
+def test_band_power_db(rng):
+    for x in _signals(rng):
+        power = (x * x).astype(np.float64)
+        freqs = np.arange(len(x), dtype=np.float64)
+        f_lo, f_hi = sorted(rng.uniform(0, len(x), size=2))
+        assert numba_kernels.band_power_db(power, freqs, f_lo, f_hi) == pytest.approx(
+            numpy_kernels.band_power_db(power, freqs, f_lo, f_hi), abs=1e-6
+        )
+
+
+def test_prominent_peaks(rng):
+    for x in _signals(rng):
+        np.testing.assert_array_equal(
+            numba_kernels.prominent_local_maxima(x, 0.5), numpy_kernels.prominent_local_maxima(x, 0.5)
+        )
+        rows = np.stack([x, x[::-1]])
+        for got, expected in zip(
+            numba_kernels.top_prominent_peaks(rows, 0.5, 7), numpy_kernels.top_prominent_peaks(rows, 0.5, 7)
+        ):
+            np.testing.assert_array_equal(got, expected)
+
+
+def test_detect_abs_peaks(rng):
+    for x in _signals(rng):
+        for min_distance in (0, 1, 7, 25):
+            threshold = float(rng.uniform(0.0, 1.5))
+            got = numba_kernels.detect_abs_peaks(x, threshold, min_distance)
+            np.testing.assert_array_equal(got, numpy_kernels.detect_abs_peaks(x, threshold, min_distance))
+            # Without tied heights both follow scipy.signal.find_peaks exactly
+            if len(np.unique(np.abs(x))) == len(x):
+                expected, _ = find_peaks(np.abs(x), height=threshold, distance=max(min_distance, 1))
+                np.testing.assert_array_equal(got, expected)